@@ -1,4 +1,12 @@
+import io
 import os
+import re
+import hashlib
+import functools
+import time
+import queue
+import atexit
+import threading
 import smtplib
 import ssl
 import getpass
@@ -7,58 +15,142 @@ import urllib.parse
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
+from email import encoders
 from datetime import datetime
 from rich.console import Console
 from rich.markdown import Markdown
-from collections import defaultdict
+from collections import defaultdict, Counter, deque, namedtuple
+from dataclasses import dataclass
 
 # --- Global State ---
-SMTP_CONFIG_CHECKED = False
-SMTP_IS_CONFIGURED = False
-FAILED_EMAIL_ATTEMPTS = []
+Alert = namedtuple("Alert", "grouping_key subject body severity") # One buffered notification
+_CFG = None # _EnvConfig, populated at import by reload_smtp_config()
+_SMTP_READY = False # True when all required SMTP settings are present
+_TERMINATION_RECIPIENTS = None # Cached on first read
 MAX_FAILED_EMAIL_RECORDS = 5
+FAILED_EMAIL_ATTEMPTS = deque(maxlen=MAX_FAILED_EMAIL_RECORDS) # Oldest failures are evicted first
 ALERT_LOG_FILE_PATH = "./alerts.log"
 ONGOING_ISSUES_LOG_FILE_PATH = "./ongoing_issues.log"
+_ALERT_LOG_FH = None # Lazily opened append handle for ALERT_LOG_FILE_PATH
+EMAIL_TEMPLATE_PATH = "src/email_template.html"
+LOGO_PATH = "logo.jpeg"
+_HTML_TEMPLATE = None # Email template contents, read on first use
+_LOGO_BYTES = None # Logo image bytes, read on first use (b"" if no logo exists)
+_LOGO_B64 = None # Base64 transfer encoding of the logo, computed once
+_MARKDOWN_CONSOLE = None # Shared recording Console used to render alert bodies to HTML
+_NEWLINE_INDENT = '\n   - ' # Indents continuation lines of an alert body inside a grouped summary
+_TEMPLATE_PLACEHOLDER_RE = re.compile(r"\{\{(HEADER_COLOR|SHARE_IN_TEAMS_BUTTON|BODY_CONTENT|TIMESTAMP)\}\}")
+
+# Persistent SMTP sessions keyed by (host, port, user), reused across alerts.
+# Format: {(host, port, user): {'conn': smtplib.SMTP, 'last_used': ts, 'msgs_sent': n}}
+_SMTP_POOL = {}
+SMTP_IDLE_TIMEOUT_SECONDS = 60
+SMTP_MAX_MSGS_PER_CONNECTION = 100
+_SMTP_LOCK = threading.Lock() # Serializes use of pooled connections between the worker and blocking sends
+_FAILED_LOCK = threading.Lock() # Guards FAILED_EMAIL_ATTEMPTS
+
+# Background email dispatch: callers enqueue serialized messages and return immediately
+_EMAIL_QUEUE = queue.Queue(maxsize=1024)
+_EMAIL_WORKER = None
+EMAIL_QUEUE_DRAIN_TIMEOUT_SECONDS = 30
 
 # --- Configuration and Logging ---
 
-def _check_smtp_configuration():
-    global SMTP_CONFIG_CHECKED, SMTP_IS_CONFIGURED
-    if SMTP_CONFIG_CHECKED: return SMTP_IS_CONFIGURED
-    
+@dataclass(frozen=True)
+class _EnvConfig:
+    """SMTP/environment settings read once from the environment."""
+    host: str
+    port: int
+    user: str
+    password: str
+    sender: str
+    default_recipients: tuple
+    env_name: str
+
+def _parse_recipients(recipient_str):
+    """Splits a comma-separated address list into a tuple of stripped addresses."""
+    if not recipient_str: return ()
+    return tuple(addr.strip() for addr in recipient_str.split(',') if addr.strip())
+
+def _get_termination_recipients():
+    global _TERMINATION_RECIPIENTS
+    if _TERMINATION_RECIPIENTS is None:
+        _TERMINATION_RECIPIENTS = os.getenv('TERMINATION_EMAIL_RECIPIENT') or ""
+    return _TERMINATION_RECIPIENTS
+
+def _load_smtp_config():
+    """Reads the SMTP settings from the environment. Returns an _EnvConfig, or None if incomplete."""
     smtp_vars = ["SMTP_HOST", "SMTP_PORT", "SMTP_USER", "SMTP_PASSWORD", "EMAIL_SENDER", "EMAIL_RECIPIENT"]
     missing_vars = [var for var in smtp_vars if not os.getenv(var)]
 
     if missing_vars:
         print(f"Warning: SMTP not configured. Missing: {', '.join(missing_vars)}. Email alerts disabled.")
-        SMTP_IS_CONFIGURED = False
-    else:
-        SMTP_IS_CONFIGURED = True
-    
-    SMTP_CONFIG_CHECKED = True
-    return SMTP_IS_CONFIGURED
+        return None
+    try:
+        return _EnvConfig(
+            host=os.environ["SMTP_HOST"],
+            port=int(os.environ["SMTP_PORT"]),
+            user=os.environ["SMTP_USER"],
+            password=os.environ["SMTP_PASSWORD"],
+            sender=os.environ["EMAIL_SENDER"],
+            default_recipients=_parse_recipients(os.environ["EMAIL_RECIPIENT"]),
+            env_name=os.getenv('ENVIRONMENT_NAME', 'Default'),
+        )
+    except ValueError:
+        print(f"Warning: SMTP_PORT must be an integer, got '{os.getenv('SMTP_PORT')}'. Email alerts disabled.")
+        return None
 
-def log_alert_to_file(subject, body):
+def reload_smtp_config():
+    """Re-reads the SMTP/environment settings (e.g. after the environment has changed)."""
+    global _CFG, _SMTP_READY, _TERMINATION_RECIPIENTS
+    _CFG = _load_smtp_config()
+    _SMTP_READY = _CFG is not None
+    _TERMINATION_RECIPIENTS = None
+    return _SMTP_READY
+
+reload_smtp_config()
+
+def _get_alert_fh():
+    """Returns the shared append handle for the alert log, opening it on first use."""
+    global _ALERT_LOG_FH
+    if _ALERT_LOG_FH is None or _ALERT_LOG_FH.closed:
+        _ALERT_LOG_FH = open(ALERT_LOG_FILE_PATH, 'a', buffering=1 << 16)
+        atexit.register(_ALERT_LOG_FH.close)
+    return _ALERT_LOG_FH
+
+def _format_alert(subject, body, timestamp):
+    return f"[{timestamp}] Subject: {subject}\nBody:\n{body}\n" + "-"*80 + "\n"
+
+def log_alerts_to_file(alerts):
+    """Appends a batch of Alerts to the alert log in a single write."""
     try:
-        with open(ALERT_LOG_FILE_PATH, 'a') as f:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            f.write(f"[{timestamp}] Subject: {subject}\nBody:\n{body}\n" + "-"*80 + "\n")
-        if "Program Started" not in subject and "Program Terminated" not in subject:
-            print(f"Alert logged to {ALERT_LOG_FILE_PATH}")
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        entries = "".join(_format_alert(alert.subject, alert.body, timestamp) for alert in alerts)
+        if not entries: return True
+        fh = _get_alert_fh()
+        fh.write(entries)
+        fh.flush()
         return True
     except Exception as e:
         print(f"Error logging alert to file: {e}")
         return False
 
+def log_alert_to_file(subject, body):
+    if not log_alerts_to_file([Alert(None, subject, body, None)]):
+        return False
+    if "Program Started" not in subject and "Program Terminated" not in subject:
+        print(f"Alert logged to {ALERT_LOG_FILE_PATH}")
+    return True
+
 def log_program_start():
     subject = "Program Started"
     body = f"Unified Monitor started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}."
     log_alert_to_file(subject, body)
     
     # Send email notification for start-up
-    termination_recipients = os.getenv('TERMINATION_EMAIL_RECIPIENT')
+    termination_recipients = _get_termination_recipients()
     if termination_recipients:
-        _send_email_internal(subject, body, recipient_override=termination_recipients)
+        _send_email_blocking(subject, body, recipient_override=termination_recipients)
 
 def log_program_termination():
     try: user = getpass.getuser()
@@ -82,44 +174,128 @@ def log_program_termination():
     log_alert_to_file(subject, body)
     
     # Send email notification for termination
-    termination_recipients = os.getenv('TERMINATION_EMAIL_RECIPIENT')
+    termination_recipients = _get_termination_recipients()
     if termination_recipients:
-        _send_email_internal(subject, body, recipient_override=termination_recipients)
+        _send_email_blocking(subject, body, recipient_override=termination_recipients)
     print("\nProgram termination logged.")
 
+# --- SMTP Connection Pool ---
+
+def _close_smtp_connection(conn):
+    try: conn.quit()
+    except Exception:
+        try: conn.close()
+        except Exception: pass
+
+def _open_smtp_connection(cfg):
+    context = ssl.create_default_context()
+    conn = smtplib.SMTP(cfg.host, cfg.port)
+    try:
+        conn.starttls(context=context)
+        conn.login(cfg.user, cfg.password)
+    except Exception:
+        _close_smtp_connection(conn)
+        raise
+    return conn
+
+def _get_smtp_connection(force_new=False):
+    """Returns a live, authenticated SMTP connection from the pool, reconnecting when stale."""
+    key = (_CFG.host, _CFG.port, _CFG.user)
+    entry = _SMTP_POOL.get(key)
+    now = time.monotonic()
+
+    if entry:
+        is_stale = (force_new
+                    or now - entry['last_used'] > SMTP_IDLE_TIMEOUT_SECONDS
+                    or entry['msgs_sent'] >= SMTP_MAX_MSGS_PER_CONNECTION)
+        if not is_stale:
+            try:
+                entry['conn'].noop()
+                entry['last_used'] = now
+                return entry['conn']
+            except (smtplib.SMTPException, OSError):
+                pass # Connection is dead, fall through and rebuild
+        _close_smtp_connection(entry['conn'])
+        del _SMTP_POOL[key]
+
+    conn = _open_smtp_connection(_CFG)
+    _SMTP_POOL[key] = {'conn': conn, 'last_used': now, 'msgs_sent': 0}
+    return conn
+
+def _mark_smtp_used(conn):
+    """Records a sent message on the pooled connection and returns its running message count."""
+    for entry in _SMTP_POOL.values():
+        if entry['conn'] is conn:
+            entry['last_used'] = time.monotonic()
+            entry['msgs_sent'] += 1
+            return entry['msgs_sent']
+    return 0
+
+def _close_smtp_pool():
+    for entry in _SMTP_POOL.values():
+        _close_smtp_connection(entry['conn'])
+    _SMTP_POOL.clear()
+
+atexit.register(_close_smtp_pool)
+
 # --- Email Sending Logic ---
 
-def _send_email_internal(subject, body, recipient_override=None):
-    global FAILED_EMAIL_ATTEMPTS
-    if not _check_smtp_configuration(): return False
+def _get_html_template():
+    global _HTML_TEMPLATE
+    if _HTML_TEMPLATE is None:
+        with open(EMAIL_TEMPLATE_PATH, "r") as f: _HTML_TEMPLATE = f.read()
+    return _HTML_TEMPLATE
 
-    if FAILED_EMAIL_ATTEMPTS:
-        body += "\n\n--- Previous Email Sending Failures ---\n" + "\n".join(
-            f"[{i+1}] Failed to send '{f['subject']}' at {f['timestamp']}. Error: {f['error']}"
-            for i, f in enumerate(FAILED_EMAIL_ATTEMPTS)
-        )
-        FAILED_EMAIL_ATTEMPTS = []
+def _get_logo_bytes():
+    global _LOGO_BYTES
+    if _LOGO_BYTES is None:
+        try:
+            with open(LOGO_PATH, 'rb') as f: _LOGO_BYTES = f.read()
+        except FileNotFoundError:
+            _LOGO_BYTES = b"" # Silently skip the logo if there is none
+    return _LOGO_BYTES
 
-    # --- Determine Recipients ---
-    if recipient_override:
-        recipient_emails = [addr.strip() for addr in recipient_override.split(',') if addr.strip()]
-    else:
-        recipient_email_str = os.getenv("EMAIL_RECIPIENT")
-        if not recipient_email_str:
-            print("Error: EMAIL_RECIPIENT environment variable is not set.")
-            return False
-        recipient_emails = [addr.strip() for addr in recipient_email_str.split(',') if addr.strip()]
+def _make_logo_part():
+    """Returns a fresh inline logo part reusing the cached base64 payload, or None if there is no logo."""
+    global _LOGO_B64
+    if _LOGO_B64 is None:
+        logo_bytes = _get_logo_bytes()
+        _LOGO_B64 = MIMEImage(logo_bytes, 'jpeg').get_payload() if logo_bytes else ""
+    if not _LOGO_B64:
+        return None
+    img = MIMEImage(b"", 'jpeg', _encoder=encoders.encode_noop)
+    img.set_payload(_LOGO_B64)
+    img['Content-Transfer-Encoding'] = 'base64'
+    img.add_header('Content-ID', '<logo_image>')
+    return img
 
-    if not recipient_emails:
-        print("Error: No valid recipient email addresses found.")
-        return False
+def _get_markdown_console():
+    global _MARKDOWN_CONSOLE
+    if _MARKDOWN_CONSOLE is None:
+        _MARKDOWN_CONSOLE = Console(record=True, width=100, file=io.StringIO())
+    return _MARKDOWN_CONSOLE
+
+@functools.lru_cache(maxsize=256)
+def _render_markdown_to_html(body):
+    """Renders an alert body to HTML. Identical bodies (e.g. flapping alerts) are served from cache."""
+    console = _get_markdown_console()
+    console.file.seek(0)
+    console.file.truncate()
+    console.print(Markdown(body))
+    return console.export_html(inline_styles=True, clear=True)
 
+def _render_template(template, values):
+    """Fills all {{PLACEHOLDER}} markers in a single pass over the template."""
+    return _TEMPLATE_PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], template)
+
+def _build_message(subject, body, recipient_emails):
+    """Builds the full MIME message for an alert and returns it serialized as bytes."""
     # --- Create Email Structure ---
     message = MIMEMultipart('related')
-    env_name = os.getenv('ENVIRONMENT_NAME', 'Default')
+    env_name = _CFG.env_name
     final_subject = f"[{env_name}] {subject}"
     message["Subject"] = final_subject
-    message["From"] = os.getenv("EMAIL_SENDER")
+    message["From"] = _CFG.sender
     message["To"] = ", ".join(recipient_emails) # Use the determined recipients
     
     msg_alternative = MIMEMultipart('alternative')
@@ -132,12 +308,10 @@ def _send_email_internal(subject, body, recipient_override=None):
     elif subject.strip().startswith("ONGOING"): header_color = "#f39c12" # Orange
 
     # --- Generate HTML Body ---
+    html_part = None
     try:
-        with open("src/email_template.html", "r") as f: html_template = f.read()
-        
-        console = Console(record=True, width=100)
-        console.print(Markdown(body))
-        body_html = console.export_html(inline_styles=True)
+        html_template = _get_html_template()
+        body_html = _render_markdown_to_html(body)
 
         teams_share_text = f"**Environment: {env_name}**\n**Alert: {subject}**\n\n---\n\n{body}"
         teams_url = f"https://teams.microsoft.com/share?msgText={urllib.parse.quote(teams_share_text)}"
@@ -147,10 +321,12 @@ def _send_email_internal(subject, body, recipient_override=None):
             </a>
         '''
 
-        html_part = html_template.replace("{{HEADER_COLOR}}", header_color)
-        html_part = html_part.replace("{{SHARE_IN_TEAMS_BUTTON}}", teams_button_html)
-        html_part = html_part.replace("{{BODY_CONTENT}}", body_html)
-        html_part = html_part.replace("{{TIMESTAMP}}", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        html_part = _render_template(html_template, {
+            "HEADER_COLOR": header_color,
+            "SHARE_IN_TEAMS_BUTTON": teams_button_html,
+            "BODY_CONTENT": body_html,
+            "TIMESTAMP": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        })
         
         msg_alternative.attach(MIMEText(body, "plain"))
         msg_alternative.attach(MIMEText(html_part, "html"))
@@ -158,53 +334,169 @@ def _send_email_internal(subject, body, recipient_override=None):
         print(f"Warning: Could not generate HTML email content: {e}")
         msg_alternative.attach(MIMEText(body, "plain"))
 
-    # --- Embed Logo ---
-    try:
-        with open('logo.jpeg', 'rb') as f:
-            img = MIMEImage(f.read(), 'jpeg')
-            img.add_header('Content-ID', '<logo_image>')
-            message.attach(img)
-    except FileNotFoundError: pass # Silently fail if no logo
-    except Exception as e: print(f"Warning: Could not embed logo: {e}")
-
-    # --- Send Email ---
+    # --- Embed Logo (only when the rendered HTML references it) ---
+    if html_part and 'cid:logo_image' in html_part:
+        try:
+            img = _make_logo_part()
+            if img: message.attach(img)
+        except Exception as e: print(f"Warning: Could not embed logo: {e}")
+
+    return message.as_bytes()
+
+def _prepare_email(subject, body, recipient_override=None):
+    """
+    Resolves recipients and builds the message for one email.
+    Returns a (subject, recipient_emails, msg_bytes) tuple, or None if it cannot be sent.
+    """
+    with _FAILED_LOCK:
+        if FAILED_EMAIL_ATTEMPTS:
+            body += "\n\n--- Previous Email Sending Failures ---\n" + "\n".join(
+                f"[{i+1}] Failed to send '{f['subject']}' at {f['timestamp']}. Error: {f['error']}"
+                for i, f in enumerate(FAILED_EMAIL_ATTEMPTS)
+            )
+            FAILED_EMAIL_ATTEMPTS.clear()
+
+    # --- Determine Recipients ---
+    if recipient_override:
+        recipient_emails = _parse_recipients(recipient_override)
+    else:
+        recipient_emails = _CFG.default_recipients
+
+    if not recipient_emails:
+        print("Error: No valid recipient email addresses found.")
+        return None
+
+    return subject, recipient_emails, _build_message(subject, body, recipient_emails)
+
+def _record_failed_email(subject, error):
+    with _FAILED_LOCK:
+        FAILED_EMAIL_ATTEMPTS.append({"subject": subject, "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "error": str(error)})
+
+def _dispatch(outgoing):
+    """
+    Sends pre-built (subject, recipient_emails, msg_bytes) emails back-to-back over one pooled
+    SMTP session, reconnecting if the server drops it. Returns the number of emails sent.
+    """
+    with _SMTP_LOCK:
+        return _dispatch_locked(outgoing)
+
+def _dispatch_locked(outgoing):
+    sent_count = 0
+    server = None
+    for subject, recipient_emails, msg_bytes in outgoing:
+        try:
+            if server is None:
+                server = _get_smtp_connection()
+            try:
+                server.sendmail(_CFG.sender, recipient_emails, msg_bytes) # Use determined recipients
+            except smtplib.SMTPServerDisconnected:
+                # Pooled session was dropped by the server; rebuild once and retry
+                server = _get_smtp_connection(force_new=True)
+                server.sendmail(_CFG.sender, recipient_emails, msg_bytes)
+            if _mark_smtp_used(server) >= SMTP_MAX_MSGS_PER_CONNECTION:
+                server = None # Let the pool recycle the session before the next message
+            print(f"Email notification sent for: {subject}")
+            sent_count += 1
+        except Exception as e:
+            print(f"Failed to send email: {e}")
+            _record_failed_email(subject, e)
+            server = None
+    return sent_count
+
+def _email_worker():
+    """Pulls queued emails, coalescing whatever is waiting into one pooled-connection burst."""
+    while True:
+        batch = [_EMAIL_QUEUE.get()]
+        while True:
+            try: batch.append(_EMAIL_QUEUE.get_nowait())
+            except queue.Empty: break
+        try:
+            _dispatch(batch)
+        except Exception as e:
+            print(f"Email worker error: {e}")
+        finally:
+            for _ in batch: _EMAIL_QUEUE.task_done()
+
+def _drain_email_queue():
+    """Waits (bounded) for queued emails to be sent before the interpreter exits."""
+    deadline = time.monotonic() + EMAIL_QUEUE_DRAIN_TIMEOUT_SECONDS
+    while _EMAIL_QUEUE.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+def _ensure_email_worker():
+    global _EMAIL_WORKER
+    if _EMAIL_WORKER is None:
+        _EMAIL_WORKER = threading.Thread(target=_email_worker, name="email-sender", daemon=True)
+        _EMAIL_WORKER.start()
+        atexit.register(_drain_email_queue) # Runs before _close_smtp_pool (atexit is LIFO)
+
+def _enqueue_prepared(prepared):
+    _ensure_email_worker()
     try:
-        context = ssl.create_default_context()
-        with smtplib.SMTP(os.getenv("SMTP_HOST"), int(os.getenv("SMTP_PORT"))) as server:
-            server.starttls(context=context)
-            server.login(os.getenv("SMTP_USER"), os.getenv("SMTP_PASSWORD"))
-            server.sendmail(os.getenv("EMAIL_SENDER"), recipient_emails, message.as_string()) # Use determined recipients
-        print(f"Email notification sent for: {subject}")
+        _EMAIL_QUEUE.put_nowait(prepared)
         return True
-    except Exception as e:
-        print(f"Failed to send email: {e}")
-        FAILED_EMAIL_ATTEMPTS.append({"subject": subject, "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "error": str(e)})
+    except queue.Full:
+        print(f"Warning: Email queue is full, dropping: {prepared[0]}")
+        _record_failed_email(prepared[0], "email queue full")
         return False
 
+def _enqueue_email(subject, body, recipient_override=None):
+    """Builds an email and queues it for the background sender. Returns True if it was queued."""
+    if not _SMTP_READY: return False
+    prepared = _prepare_email(subject, body, recipient_override)
+    if not prepared: return False
+    return _enqueue_prepared(prepared)
+
+def _send_email_blocking(subject, body, recipient_override=None):
+    """Builds and sends an email on the calling thread (used for start-up/termination notices)."""
+    if not _SMTP_READY: return False
+    prepared = _prepare_email(subject, body, recipient_override)
+    if not prepared: return False
+    return _dispatch([prepared]) == 1
+
 # --- Main Alert Processing Function ---
 
+def _alert_digest(alert):
+    """Content hash identifying alerts that would produce identical notifications."""
+    content = f"{alert.severity}|{alert.subject}|{alert.body}"
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
 def process_and_send_notifications(alert_buffer, alert_action="email"):
-    if not alert_buffer: return
+    """
+    Deduplicates, groups and sends Alerts. alert_buffer may be any iterable (e.g. a
+    generator of alerts); it is always consumed fully and only once.
+    """
     if alert_action == "log_file":
-        for alert in alert_buffer:
-            log_alert_to_file(alert["subject"], alert["body"])
+        alerts = list(alert_buffer)
+        if alerts and log_alerts_to_file(alerts):
+            print(f"{len(alerts)} alert(s) logged to {ALERT_LOG_FILE_PATH}")
         return
 
+    # --- Deduplication: identical alerts collapse into one entry with a count ---
+    occurrences = Counter()
+    unique_alerts = {}
+    for alert in alert_buffer:
+        digest = _alert_digest(alert)
+        occurrences[digest] += 1
+        unique_alerts.setdefault(digest, alert)
+
     # --- Grouping Logic ---
     grouped_alerts = defaultdict(list)
-    for alert in alert_buffer:
-        grouped_alerts[alert["grouping_key"]].append(alert)
+    for digest, alert in unique_alerts.items():
+        grouped_alerts[alert.grouping_key].append((alert, occurrences[digest]))
 
-    # --- Process and Send Each Group ---
+    # --- Build Each Group's Email ---
+    emails = []
     for group_key, alerts in grouped_alerts.items():
         if len(alerts) == 1:
             # If only one alert in a group, send it as a single notification
-            alert = alerts[0]
-            subject_prefix = "ALERT: " if alert["severity"] == "ALERT" else f"{alert['severity']}: "
-            _send_email_internal(f"{subject_prefix}{alert['subject']}", alert['body'])
+            alert, count = alerts[0]
+            subject_prefix = "ALERT: " if alert.severity == "ALERT" else f"{alert.severity}: "
+            repeat_note = f" (×{count})" if count > 1 else ""
+            emails.append((f"{subject_prefix}{alert.subject}{repeat_note}", alert.body))
         else:
             # If multiple alerts, create a summarized notification
-            severity = alerts[0]['severity']
+            severity = alerts[0][0].severity
             subject_prefix = f"ALERT: " if severity == "ALERT" else f"{severity}: "
             
             # Example: "High CPU Usage:default" -> "High CPU Usage in 'default' namespace"
@@ -212,12 +504,20 @@ def process_and_send_notifications(alert_buffer, alert_action="email"):
             
             subject = f"{len(alerts)} {group_title} issues detected"
             
-            body = f"## {subject_prefix}{subject}\n\n"
-            body += "The following related issues were detected in this cycle:\n\n"
-            # Define newline_indent once outside the loop for f-string compatibility
-            newline_indent = '\n   - '
-            for i, alert in enumerate(alerts):
-                body += f"**{i+1}. {alert['subject']}**\n"
-                body += "   - " + alert['body'].replace('\n', newline_indent) + "\n\n"
-            
-            _send_email_internal(f"{subject_prefix}{subject}", body)
+            parts = [f"## {subject_prefix}{subject}\n\n",
+                     "The following related issues were detected in this cycle:\n\n"]
+            parts.extend(
+                f"**{i+1}. {alert.subject}**{f' (×{count})' if count > 1 else ''}\n"
+                f"   - {alert.body.replace(chr(10), _NEWLINE_INDENT)}\n\n"
+                for i, (alert, count) in enumerate(alerts)
+            )
+            body = "".join(parts)
+
+            emails.append((f"{subject_prefix}{subject}", body))
+
+    # --- Serialize Everything, Then Hand Off to the Background Sender ---
+    if not _SMTP_READY: return
+    for subject, body in emails:
+        prepared = _prepare_email(subject, body)
+        if prepared:
+            _enqueue_prepared(prepared)
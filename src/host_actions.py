@@ -1,13 +1,102 @@
 import os
+import re
+import stat
+import time
+import array
+import atexit
+import socket
+import threading
+import heapq
 import psutil
 import yaml
 import subprocess
-from pathlib import Path
+import tempfile
+from collections import deque, namedtuple
+from dataclasses import dataclass, field
 import docker # type: ignore
 from docker.errors import DockerException # type: ignore
 
+try:
+    # Optional: Hyperscan counts rule keyword matches over a whole log in one pass.
+    # Without it each line is matched with the combined regex.
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    from yaml import CSafeLoader as SafeLoader # libyaml-backed parser, much faster when available
+except ImportError:
+    from yaml import SafeLoader
+
 CONFIG_PATH = "config.yml"
 
+# Per-interface network counters; byte counts are raw integers, formatting is left to the renderer
+Iface = namedtuple('Iface', 'interface ip bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout')
+
+# One process as streamed by iter_processes
+ProcessRow = namedtuple('ProcessRow', 'pid name cpu mem status cmdline')
+
+# Long-lived psutil.Process handles keyed by PID. Reusing them lets cpu_percent(None)
+# report usage since the previous call instead of needing a blocking sample interval.
+_PROC_CACHE = {}
+
+# Linux fast path for the per-process counters: a single read of /proc/<pid>/stat
+# yields both CPU ticks and RSS, where psutil reads stat and statm separately
+# through its Process objects. _PROC_STAT_PREV keeps each PID's previous
+# (cpu ticks, monotonic time) sample so CPU % needs no blocking interval.
+_PROC_STAT_FAST_PATH = os.path.exists("/proc/self/stat")
+_PROC_STAT_PREV = {}
+if _PROC_STAT_FAST_PATH:
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# Shared psutil.net_connections() snapshot so the connection and listening-port views
+# don't each walk the kernel socket tables within the same refresh.
+_CONN_SNAPSHOT = {'taken_at': 0.0, 'conns': None}
+CONN_SNAPSHOT_TTL_SECONDS = 1.0
+
+# Parsed config.yml, re-read only when the file's mtime changes
+_CONFIG_CACHE = {'mtime': None, 'data': None}
+
+# Compiled keyword matcher (and Hyperscan database, if available) for the current log
+# parsing rules, rebuilt when the rules change
+_COMPILED_RULES = {'rules': None, 'matcher': None, 'database': None}
+# Hyperscan scratch space cannot be shared by concurrent scans, so each scanning
+# thread keeps its own (database, scratch) pair
+_RULE_SCAN_LOCAL = threading.local()
+
+# Docker client reused across calls, and image ID -> display tag (avoids an image lookup per container)
+_DOCKER_CLIENT = None
+_IMAGE_TAG_CACHE = {}
+
+@dataclass
+class ProcessTable:
+    """Columnar process listing. Row i is (pids[i], names[i], cpu[i], mem[i], status[i], cmdline[i])."""
+    pids: array.array = field(default_factory=lambda: array.array('i'))
+    names: list = field(default_factory=list)
+    cpu: array.array = field(default_factory=lambda: array.array('f'))
+    mem: array.array = field(default_factory=lambda: array.array('f'))
+    status: list = field(default_factory=list)
+    cmdline: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.pids)
+
+@dataclass
+class ConnectionTable:
+    """Columnar network connection listing. A pid of 0 means the owning process is unknown."""
+    fds: array.array = field(default_factory=lambda: array.array('i'))
+    families: list = field(default_factory=list)
+    types: list = field(default_factory=list)
+    laddrs: list = field(default_factory=list)
+    raddrs: list = field(default_factory=list)
+    statuses: list = field(default_factory=list)
+    pids: array.array = field(default_factory=lambda: array.array('i'))
+    process_names: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.pids)
+
 def check_path_accessibility(path: str):
     """
     Checks if a given file system path exists and is readable.
@@ -20,12 +109,27 @@ def check_path_accessibility(path: str):
                is_accessible is True if the path exists and is readable, False otherwise.
                message provides details if not accessible, None otherwise.
     """
-    if not os.path.exists(path):
+    try:
+        os.stat(path)
+    except FileNotFoundError:
         return False, f"Path '{path}' does not exist."
+    except PermissionError:
+        return False, f"Permission denied to read path '{path}'."
+    except OSError as e:
+        return False, f"Path '{path}' is not accessible: {e.strerror}."
     if not os.access(path, os.R_OK):
         return False, f"Permission denied to read path '{path}'."
     return True, None
 
+def check_paths_accessibility(paths):
+    """
+    Checks several paths, checking each distinct path only once.
+
+    Returns:
+        dict: {path: (is_accessible, message)} as returned by check_path_accessibility.
+    """
+    return {path: check_path_accessibility(path) for path in set(paths)}
+
 def get_resource_utilization():
     """
     Fetches host CPU, memory, and disk utilization using psutil.
@@ -36,59 +140,183 @@ def get_resource_utilization():
         "disk_root": psutil.disk_usage('/'),
     }
 
-def get_process_list(sort_by='cpu_percent', limit=20):
+def _read_proc_stat(pid):
+    """Returns (cpu ticks, rss pages) from /proc/<pid>/stat, or None if the process is gone."""
+    try:
+        fd = os.open(f"/proc/{pid}/stat", os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        data = os.read(fd, 1024)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    # The command name is parenthesized and may contain spaces; fields resume after it
+    fields = data[data.rfind(b')') + 2:].split()
+    try:
+        return int(fields[11]) + int(fields[12]), int(fields[21]) # utime + stime, rss
+    except (IndexError, ValueError):
+        return None
+
+def _sample_proc_stats(pids):
+    """Samples (cpu, mem) percent columns for `pids` from /proc; returns (pids, cpu, mem, count)."""
+    n = len(pids)
+    sampled_pids = [0] * n
+    cpu = array.array('f', bytes(4 * n))
+    mem = array.array('f', bytes(4 * n))
+    mem_scale = _PAGE_SIZE * 100.0 / psutil.virtual_memory().total
+    now = time.monotonic()
+    prev_samples = _PROC_STAT_PREV.copy()
+    _PROC_STAT_PREV.clear()
+    count = 0
+    for pid in pids:
+        stat = _read_proc_stat(pid)
+        if stat is None:
+            continue
+        ticks, rss_pages = stat
+        prev = prev_samples.get(pid)
+        if prev is not None and now > prev[1]:
+            cpu[count] = (ticks - prev[0]) * 100.0 / _CLK_TCK / (now - prev[1])
+        mem[count] = rss_pages * mem_scale
+        _PROC_STAT_PREV[pid] = (ticks, now)
+        sampled_pids[count] = pid
+        count += 1
+    return sampled_pids, cpu, mem, count
+
+def _sample_psutil_stats(pids):
+    """Samples (cpu, mem) percent columns through cached psutil handles; returns (pids, cpu, mem, count)."""
+    for pid in pids - _PROC_CACHE.keys():
+        try:
+            _PROC_CACHE[pid] = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+    # These two reads are not wrapped in oneshot(): on Linux they touch different
+    # /proc files (stat, statm), so the cache setup only adds overhead.
+    n = len(_PROC_CACHE)
+    sampled_pids = [0] * n
+    cpu = array.array('f', bytes(4 * n))
+    mem = array.array('f', bytes(4 * n))
+    count = 0
+    for pid, p in list(_PROC_CACHE.items()):
+        try:
+            cpu[count] = p.cpu_percent(None)
+            mem[count] = p.memory_percent()
+        except psutil.NoSuchProcess:
+            _PROC_CACHE.pop(pid, None)
+            continue
+        except psutil.AccessDenied:
+            continue
+        sampled_pids[count] = pid
+        count += 1
+    return sampled_pids, cpu, mem, count
+
+def iter_processes(sort_by='cpu_percent', limit=20):
     """
-    Fetches a list of running processes, sorted by CPU or memory usage.
+    Yields the top `limit` running processes by CPU or memory usage as ProcessRow
+    tuples, in order. Only the cheap CPU/memory counters are read for every process;
+    name, status and cmdline are read for each survivor just before it is yielded.
     """
-    processes = []
-    for p in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status', 'cmdline']):
+    # Drop cached Process handles for PIDs that are gone
+    current_pids = set(psutil.pids())
+    for pid in _PROC_CACHE.keys() - current_pids:
+        del _PROC_CACHE[pid]
+
+    # Sample the cheap counters into preallocated columns
+    if _PROC_STAT_FAST_PATH:
+        pids, cpu, mem, count = _sample_proc_stats(current_pids)
+    else:
+        pids, cpu, mem, count = _sample_psutil_stats(current_pids)
+
+    # Select the top N row indices without sorting the whole process table
+    if sort_by == 'cpu_percent':
+        top = heapq.nlargest(limit, range(count), key=cpu.__getitem__)
+    elif sort_by == 'memory_percent':
+        top = heapq.nlargest(limit, range(count), key=mem.__getitem__)
+    else:
+        top = range(min(limit, count))
+
+    for i in top:
+        pid = pids[i]
         try:
+            p = _PROC_CACHE.get(pid)
+            if p is None:
+                p = _PROC_CACHE[pid] = psutil.Process(pid)
             # Accessing attributes might raise NoSuchProcess or AccessDenied
-            processes.append({
-                'pid': p.info['pid'],
-                'name': p.info['name'],
-                'cpu_percent': p.info['cpu_percent'],
-                'memory_percent': p.info['memory_percent'],
-                'status': p.info['status'],
-                'cmdline': ' '.join(p.info['cmdline']) if p.info['cmdline'] else p.info['name'],
-            })
+            with p.oneshot():
+                name = p.name()
+                status = p.status()
+                try:
+                    cmdline = p.cmdline()
+                except psutil.AccessDenied:
+                    cmdline = None
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             # Ignore processes that disappear or are inaccessible
             continue
-    
-    # Sort processes
-    if sort_by == 'cpu_percent':
-        processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-    elif sort_by == 'memory_percent':
-        processes.sort(key=lambda x: x['memory_percent'], reverse=True)
-    
-    return processes[:limit]
+        yield ProcessRow(pid, name, cpu[i], mem[i], status, ' '.join(cmdline) if cmdline else name)
+
+def get_process_list(sort_by='cpu_percent', limit=20):
+    """Fetches the top `limit` processes by CPU or memory usage as a ProcessTable."""
+    processes = ProcessTable()
+    for row in iter_processes(sort_by, limit):
+        processes.pids.append(row.pid)
+        processes.names.append(row.name)
+        processes.cpu.append(row.cpu)
+        processes.mem.append(row.mem)
+        processes.status.append(row.status)
+        processes.cmdline.append(row.cmdline)
+    return processes
+
+def _close_docker_client():
+    global _DOCKER_CLIENT
+    if _DOCKER_CLIENT is not None:
+        try: _DOCKER_CLIENT.close()
+        except Exception: pass
+        _DOCKER_CLIENT = None
+
+def _get_docker_client():
+    """Returns the shared Docker client, rebuilding it if the daemon connection has gone stale."""
+    global _DOCKER_CLIENT
+    if _DOCKER_CLIENT is not None:
+        try:
+            _DOCKER_CLIENT.ping()
+            return _DOCKER_CLIENT
+        except Exception:
+            _close_docker_client()
+    _DOCKER_CLIENT = docker.from_env()
+    return _DOCKER_CLIENT
+
+atexit.register(_close_docker_client)
+
+def _get_image_tag(container):
+    image_id = container.attrs.get('Image')
+    if image_id not in _IMAGE_TAG_CACHE:
+        tags = container.image.tags
+        _IMAGE_TAG_CACHE[image_id] = tags[0] if tags else 'N/A'
+    return _IMAGE_TAG_CACHE[image_id]
 
 def get_docker_containers():
     """
     Fetches a list of Docker containers running on the host.
     """
     try:
-        client = docker.from_env()
+        client = _get_docker_client()
         containers = client.containers.list(all=True) # Get all containers, running or not
         
         container_data = []
         for container in containers:
-            ports = []
-            for p_key, p_val in container.ports.items():
-                if p_val:
-                    for item in p_val:
-                        if 'HostPort' in item:
-                            ports.append(f"{p_key}->{item['HostPort']}/{item['HostIp'] or '0.0.0.0'}")
-                        else:
-                            ports.append(f"{p_key}")
-                else:
-                    ports.append(f"{p_key}")
+            # Unpublished ports (no bindings or no HostPort) are listed by their key alone
+            ports = [
+                f"{p_key}->{item['HostPort']}/{item.get('HostIp') or '0.0.0.0'}" if item.get('HostPort') else p_key
+                for p_key, p_val in container.ports.items()
+                for item in (p_val or ({},))
+            ]
 
             container_data.append({
                 'id': container.short_id,
                 'name': container.name,
-                'image': container.image.tags[0] if container.image.tags else 'N/A',
+                'image': _get_image_tag(container),
                 'status': container.status,
                 'ports': ", ".join(ports) if ports else 'N/A',
             })
@@ -98,38 +326,51 @@ def get_docker_containers():
     except Exception as e:
         return [], f"An unexpected error occurred: {e}"
 
+def get_connection_snapshot():
+    """
+    Returns the list from psutil.net_connections(kind='inet'), reusing the previous
+    snapshot if it is less than CONN_SNAPSHOT_TTL_SECONDS old.
+    """
+    now = time.monotonic()
+    if _CONN_SNAPSHOT['conns'] is None or now - _CONN_SNAPSHOT['taken_at'] > CONN_SNAPSHOT_TTL_SECONDS:
+        _CONN_SNAPSHOT['conns'] = psutil.net_connections(kind='inet')
+        _CONN_SNAPSHOT['taken_at'] = now
+    return _CONN_SNAPSHOT['conns']
+
+def _process_name_lookup():
+    """Returns a function resolving PID -> process name, looking up each PID at most once."""
+    pid_to_name = {}
+    def lookup(pid):
+        if not pid:
+            return "N/A"
+        if pid not in pid_to_name:
+            try:
+                pid_to_name[pid] = psutil.Process(pid).name()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pid_to_name[pid] = "Access Denied/N/A"
+            except Exception:
+                # Catch other potential errors during process lookup
+                pid_to_name[pid] = None
+        return pid_to_name[pid]
+    return lookup
+
 def get_network_connections():
     """
     Fetches active network connections and associated process information.
     """
-    connections = []
-    for conn in psutil.net_connections(kind='inet'):
-        try:
-            p = psutil.Process(conn.pid) if conn.pid else None
-            connections.append({
-                'fd': conn.fd,
-                'family': conn.family.name,
-                'type': conn.type.name,
-                'laddr': f"{conn.laddr.ip}:{conn.laddr.port}",
-                'raddr': f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A",
-                'status': conn.status,
-                'pid': conn.pid,
-                'process_name': p.name() if p else "N/A",
-            })
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            connections.append({
-                'fd': conn.fd,
-                'family': conn.family.name,
-                'type': conn.type.name,
-                'laddr': f"{conn.laddr.ip}:{conn.laddr.port}",
-                'raddr': f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A",
-                'status': conn.status,
-                'pid': conn.pid,
-                'process_name': "Access Denied/N/A",
-            })
-        except Exception:
-            # Catch other potential errors during process lookup
-            pass
+    connections = ConnectionTable()
+    process_name = _process_name_lookup()
+    for conn in get_connection_snapshot():
+        name = process_name(conn.pid)
+        if name is None: continue
+        connections.fds.append(conn.fd)
+        connections.families.append(conn.family.name)
+        connections.types.append(conn.type.name)
+        connections.laddrs.append(f"{conn.laddr.ip}:{conn.laddr.port}")
+        connections.raddrs.append(f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A")
+        connections.statuses.append(conn.status)
+        connections.pids.append(conn.pid or 0)
+        connections.process_names.append(name)
     return connections, None
 
 def get_listening_ports():
@@ -137,71 +378,54 @@ def get_listening_ports():
     Fetches listening ports and associated process information.
     """
     listening_ports = []
-    for conn in psutil.net_connections(kind='inet'):
+    process_name = _process_name_lookup()
+    for conn in get_connection_snapshot():
         if conn.status == psutil.CONN_LISTEN:
-            try:
-                p = psutil.Process(conn.pid) if conn.pid else None
-                listening_ports.append({
-                    'laddr': f"{conn.laddr.ip}:{conn.laddr.port}",
-                    'pid': conn.pid,
-                    'process_name': p.name() if p else "N/A",
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                listening_ports.append({
-                    'laddr': f"{conn.laddr.ip}:{conn.laddr.port}",
-                    'pid': conn.pid,
-                    'process_name': "Access Denied/N/A",
-                })
-            except Exception:
-                pass
+            name = process_name(conn.pid)
+            if name is None: continue
+            listening_ports.append({
+                'laddr': f"{conn.laddr.ip}:{conn.laddr.port}",
+                'pid': conn.pid,
+                'process_name': name,
+            })
     return listening_ports, None
 
 
 def get_network_stats():
     """
     Fetches network interface statistics using psutil.
+    Returns a list of Iface records with raw byte counts.
     """
     stats = psutil.net_io_counters(pernic=True)
     addrs = psutil.net_if_addrs()
-    
-    results = []
-    for iface, iface_stats in stats.items():
-        # Safely get addresses
-        iface_addrs = addrs.get(iface, [])
-        ip_address = "N/A"
-        for addr in iface_addrs:
-            if addr.family == psutil.AF_LINK: # This is the MAC address
-                continue
-            if addr.family == 2: # AF_INET (IPv4)
-                ip_address = addr.address
-                break # Prefer IPv4 for display
-        
-        results.append({
-            "interface": iface,
-            "ip_address": ip_address,
-            "bytes_sent": f"{iface_stats.bytes_sent / 1024**2:.2f} MB",
-            "bytes_recv": f"{iface_stats.bytes_recv / 1024**2:.2f} MB",
-            "packets_sent": iface_stats.packets_sent,
-            "packets_recv": iface_stats.packets_recv,
-            "errin": iface_stats.errin,
-            "errout": iface_stats.errout,
-            "dropin": iface_stats.dropin,
-            "dropout": iface_stats.dropout,
-        })
+
+    results = [None] * len(stats)
+    for i, (iface, s) in enumerate(stats.items()):
+        # Prefer IPv4 for display
+        ip_address = next((a.address for a in addrs.get(iface, ()) if a.family == socket.AF_INET), "N/A")
+        results[i] = Iface(iface, ip_address, s.bytes_sent, s.bytes_recv, s.packets_sent, s.packets_recv,
+                           s.errin, s.errout, s.dropin, s.dropout)
     return results, None
 
 def _load_config_section(section_name, default_value):
     """Generic helper to load a section from the config file."""
-    config_file = Path(CONFIG_PATH)
-    if not config_file.is_file():
+    try:
+        st = os.stat(CONFIG_PATH)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         return None, f"Configuration file not found at '{CONFIG_PATH}'"
-    
-    with open(config_file, 'r') as f:
-        try:
-            config = yaml.safe_load(f)
-            return config.get(section_name, default_value), None
-        except yaml.YAMLError as e:
-            return None, f"Error parsing YAML file: {e}"
+
+    if _CONFIG_CACHE['mtime'] != st.st_mtime_ns:
+        with open(CONFIG_PATH, 'r') as f:
+            try:
+                config = yaml.load(f, Loader=SafeLoader)
+            except yaml.YAMLError as e:
+                return None, f"Error parsing YAML file: {e}"
+        _CONFIG_CACHE['data'] = config or {}
+        _CONFIG_CACHE['mtime'] = st.st_mtime_ns
+
+    return _CONFIG_CACHE['data'].get(section_name, default_value), None
 
 def load_log_config():
     """Loads the list of log source configurations from config.yml."""
@@ -211,62 +435,223 @@ def load_parsing_rules():
     """Loads the log parsing rules from config.yml."""
     return _load_config_section('log_parsing_rules', [])
 
+def _compile_parsing_rules(rules):
+    """
+    Builds a keyword matcher for the parsing rules. Returns (combined, per_rule), where
+    `combined` is one case-insensitive alternation with a named group per rule and
+    `per_rule` maps rule index -> that rule's own pattern. Rules without keywords are skipped.
+    """
+    per_rule = {}
+    for i, rule in enumerate(rules):
+        keywords = rule.get('keywords') or []
+        if keywords:
+            per_rule[i] = "|".join(re.escape(str(k)) for k in keywords)
+    if not per_rule:
+        return None, {}
+    combined = re.compile("|".join(f"(?P<r{i}>{alt})" for i, alt in per_rule.items()), re.IGNORECASE)
+    return combined, {i: re.compile(alt, re.IGNORECASE) for i, alt in per_rule.items()}
 
-def get_log_output(log_entry: dict, tail_lines: int = 200):
+def _compile_rule_database(per_rule):
+    """Builds a Hyperscan database of each rule's keywords (id = rule index), or None if unavailable."""
+    if hyperscan is None or not per_rule:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.pattern.encode('utf-8') for pattern in per_rule.values()],
+            ids=list(per_rule),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8] * len(per_rule),
+        )
+        return database
+    except hyperscan.error:
+        return None
+
+def _get_rule_matcher(rules):
+    if _COMPILED_RULES['rules'] is not rules:
+        _COMPILED_RULES['matcher'] = _compile_parsing_rules(rules)
+        _COMPILED_RULES['database'] = _compile_rule_database(_COMPILED_RULES['matcher'][1])
+        _COMPILED_RULES['rules'] = rules
+    return _COMPILED_RULES['matcher']
+
+def _count_rule_matches(database, raw_content, counts):
     """
-    Gets log output, parses it for keywords, and returns a styled string and summary.
+    Scans the whole log with the Hyperscan database once, adding one to counts for
+    each line's first matching rule (in config order), as _match_rule_index would.
     """
-    # 1. Get raw log content
-    raw_content, error, is_error = "", "", False
+    if getattr(_RULE_SCAN_LOCAL, 'database', None) is not database:
+        _RULE_SCAN_LOCAL.scratch = hyperscan.Scratch(database)
+        _RULE_SCAN_LOCAL.database = database
+    blob = raw_content.encode('utf-8')
+    first_rule = {} # line start offset -> lowest matching rule index
+    def on_match(rule_index, start, end, flags, context):
+        # Hyperscan reports end offsets; the line holding the last matched byte is the hit
+        line_start = blob.rfind(b'\n', 0, max(end - 1, 0)) + 1
+        if rule_index < first_rule.get(line_start, len(counts)):
+            first_rule[line_start] = rule_index
+    database.scan(blob, match_event_handler=on_match, scratch=_RULE_SCAN_LOCAL.scratch)
+    for rule_index in first_rule.values():
+        counts[rule_index] += 1
+
+def _match_rule_index(line, combined, per_rule):
+    """Returns the index of the first rule (in config order) with a keyword in `line`, or None."""
+    m = combined.search(line)
+    if not m:
+        return None
+    # The leftmost match may belong to a lower-priority rule; check the earlier rules explicitly.
+    matched = int(m.lastgroup[1:])
+    for i, pattern in per_rule.items():
+        if i >= matched:
+            break
+        if pattern.search(line):
+            return i
+    return matched
+
+
+def _open_regular_file(path):
+    """
+    Opens `path` for binary reading, raising FileNotFoundError unless it is a regular
+    file. The type check is an fstat on the open descriptor rather than a separate
+    stat of the path; O_NONBLOCK keeps the open from hanging on a FIFO.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0))
+    try:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            raise FileNotFoundError(path)
+        return open(fd, 'rb')
+    except BaseException:
+        os.close(fd)
+        raise
+
+if hasattr(os, 'pread'):
+    def _read_at(f, size, offset):
+        """Reads size bytes at offset in one positional read (no separate seek)."""
+        return os.pread(f.fileno(), size, offset)
+else:
+    def _read_at(f, size, offset):
+        f.seek(offset)
+        return f.read(size)
+
+def _tail(path, n, chunk_size=64 * 1024):
+    """Returns the last `n` lines of a file by reading backwards from its end in chunks."""
+    if n <= 0:
+        return ""
+    with _open_regular_file(path) as f:
+        end = f.seek(0, os.SEEK_END)
+        chunks, newlines = [], 0
+        # Need n+1 newlines to be sure the first of the last n lines is complete
+        while end > 0 and newlines <= n:
+            start = max(0, end - chunk_size)
+            chunk = _read_at(f, end - start, start)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+            end = start
+    data = b"".join(reversed(chunks))
+    if not data:
+        return ""
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop() # Trailing newline, not an extra empty line
+        return b"\n".join(lines[-n:]).decode('utf-8', errors='ignore') + "\n"
+    return b"\n".join(lines[-n:]).decode('utf-8', errors='ignore')
+
+def _run_command_tail(command, n):
+    """
+    Runs a shell command and returns (returncode, last `n` lines of stdout, stderr).
+    Output is streamed into a bounded deque so memory stays constant however much the
+    command prints; stdout is read to EOF so the returned tail is the real end of the output.
+    """
+    tail = deque(maxlen=max(n, 0))
+    with tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='ignore') as stderr_file:
+        with subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=stderr_file,
+                              text=True, errors='ignore') as proc:
+            tail.extend(proc.stdout)
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+    return proc.returncode, "".join(tail), stderr
+
+def _read_log_content(log_entry, tail_lines):
+    """Returns (raw_content, error) for the last tail_lines of a log entry's file or command."""
     if 'path' in log_entry:
         log_path_str = log_entry['path']
-        log_path = Path(log_path_str)
-        if not log_path.is_file():
-            return None, None, f"Error: Log file not found at '{log_path_str}'"
         try:
-            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                raw_content = "".join(lines[-tail_lines:])
+            return _tail(log_path_str, tail_lines), None
+        except FileNotFoundError:
+            return None, f"Error: Log file not found at '{log_path_str}'"
         except PermissionError:
-            return None, None, f"Error: Permission denied to read '{log_path_str}'. Try running with sudo."
+            return None, f"Error: Permission denied to read '{log_path_str}'. Try running with sudo."
         except Exception as e:
-            return None, None, f"An unexpected error occurred while reading the file: {e}"
+            return None, f"An unexpected error occurred while reading the file: {e}"
 
     elif 'command' in log_entry:
         command = log_entry['command']
         try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
-            raw_content = result.stdout
-        except subprocess.CalledProcessError as e:
-            return None, None, f"Command failed with exit code {e.returncode}:\n{e.stderr}"
+            returncode, raw_content, stderr = _run_command_tail(command, tail_lines)
+            if returncode != 0:
+                return None, f"Command failed with exit code {returncode}:\n{stderr}"
+            return raw_content, None
         except Exception as e:
-            return None, None, f"An unexpected error occurred while running the command: {e}"
-    else:
-        return None, None, "Error: Log entry must contain either a 'path' or a 'command'."
+            return None, f"An unexpected error occurred while running the command: {e}"
+    return None, "Error: Log entry must contain either a 'path' or a 'command'."
+
+def _empty_summary(rules):
+    return {rule['name']: {'count': 0, 'threshold': rule['threshold'], 'color': rule['color']} for rule in rules}
+
+def get_log_summary(log_entry: dict, tail_lines: int = 200):
+    """
+    Counts the parsing rule matches in a log's recent output without styling it,
+    for callers that only need the summary. Returns (summary, error).
+    """
+    raw_content, error = _read_log_content(log_entry, tail_lines)
+    if error:
+        return None, error
+    rules, error = load_parsing_rules()
+    if error:
+        return None, f"Could not load parsing rules: {error}"
+
+    combined, per_rule = _get_rule_matcher(rules)
+    counts = [0] * len(rules)
+    database = _COMPILED_RULES['database']
+    if database is not None:
+        _count_rule_matches(database, raw_content, counts)
+    elif combined:
+        for line in raw_content.splitlines():
+            rule_index = _match_rule_index(line, combined, per_rule)
+            if rule_index is not None:
+                counts[rule_index] += 1
+
+    summary = _empty_summary(rules)
+    for rule, count in zip(rules, counts):
+        summary[rule['name']]['count'] += count
+    return summary, None
+
+def get_log_output(log_entry: dict, tail_lines: int = 200):
+    """
+    Gets log output, parses it for keywords, and returns a styled string and summary.
+    """
+    # 1. Get raw log content
+    raw_content, error = _read_log_content(log_entry, tail_lines)
+    if error:
+        return None, None, error
 
     # 2. Parse and style the content
     rules, error = load_parsing_rules()
     if error:
         return None, None, f"Could not load parsing rules: {error}"
 
-    summary = {rule['name']: {'count': 0, 'threshold': rule['threshold'], 'color': rule['color']} for rule in rules}
+    summary = _empty_summary(rules)
     styled_lines = []
-    
+    combined, per_rule = _get_rule_matcher(rules)
+
     for line in raw_content.splitlines():
-        styled = False
-        for rule in rules:
-            for keyword in rule['keywords']:
-                if keyword.lower() in line.lower():
-                    rule_name = rule['name']
-                    summary[rule_name]['count'] += 1
-                    color = rule['color']
-                    # Use escape=False for Panel to render highlights correctly
-                    styled_lines.append(f"[{color}]{line}[/{color}]")
-                    styled = True
-                    break  # Stop after first keyword match in a rule
-            if styled:
-                break # Stop after first rule match for a line
-        if not styled:
+        rule_index = _match_rule_index(line, combined, per_rule) if combined else None
+        if rule_index is None:
             styled_lines.append(line)
+            continue
+        # Only the first matching rule counts for a line
+        rule = rules[rule_index]
+        summary[rule['name']]['count'] += 1
+        color = rule['color']
+        # Use escape=False for Panel to render highlights correctly
+        styled_lines.append(f"[{color}]{line}[/{color}]")
 
     return "\n".join(styled_lines), summary, None
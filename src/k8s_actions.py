@@ -1,246 +1,560 @@
+import os
+import array
 import base64
+import time
+import socket
+import logging
+import threading
+import functools
 import yaml
-from kubernetes import client, config # Corrected import
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from kubernetes import client, config, watch # Corrected import
 from kubernetes.stream import stream
+from urllib3.connection import HTTPConnection
 from rich.table import Table
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.console import Console
 
+try:
+    # orjson decodes raw response bodies several times faster than the stdlib
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+try:
+    # libyaml-backed parser/emitter, much faster when available
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+logger = logging.getLogger(__name__)
+
+# --- API Worker Pool ---
+# Independent list calls are issued concurrently on a small shared pool, capped
+# so a refresh cannot flood the API server with parallel requests.
+K8S_MAX_WORKERS = int(os.getenv("K8S_MAX_WORKERS", "6"))
+_K8S_EXECUTOR = ThreadPoolExecutor(max_workers=K8S_MAX_WORKERS, thread_name_prefix="k8s-io")
+
+def _submit(fn, *args, **kwargs):
+    """Runs fn on the shared Kubernetes I/O pool and returns its Future."""
+    return _K8S_EXECUTOR.submit(fn, *args, **kwargs)
+
+# --- List Cache ---
+# Pods, deployments and pod metrics are listed once per namespace and reused
+# for LIST_CACHE_TTL_SECONDS, so a dashboard refresh that shows both pods and
+# deployments only hits the API server once for each.
+LIST_CACHE_TTL_SECONDS = 2.0
+# Services, ConfigMaps and PVCs are always listed cluster-wide and filtered per
+# namespace, so switching namespaces in the UI reuses one list. Secrets are never
+# cached and are only listed for the namespace being viewed.
+NAMESPACE_LIST_CACHE_TTL_SECONDS = float(os.getenv("K8S_NAMESPACE_CACHE_TTL", "5"))
+_LIST_CACHE = {} # {(namespace, kind): (timestamp, ttl, result)}; expired entries are evicted on write
+_LIST_CACHE_LOCK = threading.Lock() # The dashboard pool and the live-view fetch threads share the cache
+# Deployment selectors are immutable, so each is compiled to sorted (key, value) tuples once.
+_SELECTOR_TUPLES_CACHE = {} # {deployment uid: ((key, value), ...)}
+
+@dataclass
+class MetricsCache:
+    """A snapshot of the pods, deployments and pod metrics of a namespace."""
+    pods: list = field(default_factory=list)
+    deployments: list = field(default_factory=list)
+    replica_sets: list = None # None when ReplicaSets could not be listed
+    pod_metrics: dict = field(default_factory=dict)
+    metrics_error: str = None
+    ts: float = 0.0
+
+# Rows for the event feed and get_pod_status; lighter than a dict per row
+Event = namedtuple("Event", "last_seen type reason object message")
+PodInfo = namedtuple("PodInfo", "name namespace status ip cpu memory container_statuses memory_bytes")
+# One container of a deployment's pod template, as shown by the deployment editor
+DeploymentContainer = namedtuple("DeploymentContainer", "name image requests limits")
+
+@dataclass
+class PodLimitsTable:
+    """Columnar pod limits. Row index[(namespace, pod)] holds cpu_m[row] millicores and mem_b[row] bytes."""
+    index: dict = field(default_factory=dict)
+    cpu_m: array.array = field(default_factory=lambda: array.array('q'))
+    mem_b: array.array = field(default_factory=lambda: array.array('q'))
+
+    def __len__(self):
+        return len(self.cpu_m)
+
 # --- Client Initialization ---
+# Config is loaded once and all API wrappers share one ApiClient, i.e. one
+# urllib3 connection pool with keep-alive sockets.
+K8S_CONNECTION_POOL_MAXSIZE = 32
+# Pooled and watch connections can sit idle for minutes; TCP keepalive stops
+# NAT/load balancer idle timeouts from silently dropping them, and surfaces a
+# dead API server connection instead of leaving a watch hanging.
+TCP_KEEPALIVE_IDLE_SECONDS = 30
+TCP_KEEPALIVE_INTERVAL_SECONDS = 10
+TCP_KEEPALIVE_PROBES = 3
+_CLIENTS = None # (core_v1, apps_v1, custom_objects) once initialized
+
+def _keepalive_socket_options():
+    """urllib3's default socket options plus TCP keepalive (with timings where the OS supports them)."""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE_SECONDS),
+                        ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL_SECONDS),
+                        ("TCP_KEEPCNT", TCP_KEEPALIVE_PROBES)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
 
 def init_clients():
-    """Initializes and returns Kubernetes API clients."""
+    """Initializes and returns Kubernetes API clients, reusing them after the first successful call."""
+    global _CLIENTS
+    if _CLIENTS is not None:
+        return _CLIENTS
     try:
         # Try loading in-cluster config first
         config.load_incluster_config()
-        print("DEBUG: In-cluster config loaded successfully.")
+        logger.debug("In-cluster config loaded successfully.")
     except config.ConfigException:
         try:
             # Fallback to kube-config file for local development
             config.load_kube_config()
-            print("DEBUG: Kube-config loaded successfully.")
+            logger.debug("Kube-config loaded successfully.")
         except config.ConfigException:
-            print("DEBUG: Failed to load any Kubernetes config.")
+            logger.debug("Failed to load any Kubernetes config.")
             print("Could not configure Kubernetes client. Please ensure you are running within a cluster or have a valid kubeconfig file.")
             return None, None, None
 
-    core_v1 = client.CoreV1Api()
-    apps_v1 = client.AppsV1Api()
-    custom_objects = client.CustomObjectsApi()
+    cfg = client.Configuration.get_default_copy()
+    cfg.connection_pool_maxsize = K8S_CONNECTION_POOL_MAXSIZE
+    cfg.socket_options = _keepalive_socket_options()
+    api_client = client.ApiClient(configuration=cfg)
+    core_v1 = client.CoreV1Api(api_client)
+    apps_v1 = client.AppsV1Api(api_client)
+    custom_objects = client.CustomObjectsApi(api_client)
     
-    print(f"DEBUG: Clients initialized: core_v1={core_v1 is not None}, apps_v1={apps_v1 is not None}, custom_objects={custom_objects is not None}")
-    return core_v1, apps_v1, custom_objects
+    logger.debug("Clients initialized: core_v1=%s, apps_v1=%s, custom_objects=%s",
+                 core_v1 is not None, apps_v1 is not None, custom_objects is not None)
+    _CLIENTS = (core_v1, apps_v1, custom_objects)
+    return _CLIENTS
+
+# --- Pagination ---
+LIST_PAGE_SIZE = 500
+
+def _paginated_list(list_fn, page_size=LIST_PAGE_SIZE, **kwargs):
+    """
+    Yields the items of a Kubernetes list call page by page, following the
+    continue token, so only one page of objects is held at a time.
+    """
+    token = None
+    while True:
+        if token:
+            resp = list_fn(limit=page_size, _continue=token, **kwargs)
+        else:
+            resp = list_fn(limit=page_size, **kwargs)
+        yield from resp.items
+        token = resp.metadata._continue if resp.metadata else None
+        if not token:
+            return
 
 # --- Value Parsing Helpers ---
 
-def parse_cpu_value(cpu_str):
-    """Parses a CPU string (e.g., '500m', '1', '2500n') into millicores."""
+# The same few limit strings ('100m', '256Mi', ...) recur for every container
+# on every refresh, so the public parsers are memoized. Metrics usage values
+# ('2513459n', '48204Ki', ...) change on every poll and would only churn those
+# caches, so they go through the uncached _parse_* functions instead.
+_CPU_SUFFIX_DIVISORS = {"n": 1000000, "m": 1} # suffix -> divisor to millicores (1m = 1,000,000n)
+_MEM_SUFFIX_MULTIPLIERS = {"Ki": 1 << 10, "Mi": 1 << 20, "Gi": 1 << 30, "Ti": 1 << 40, "Pi": 1 << 50, "Ei": 1 << 60}
+_MEM_DECIMAL_MULTIPLIERS = {"k": 10**3, "M": 10**6, "G": 10**9, "T": 10**12, "P": 10**15, "E": 10**18}
+
+def _parse_cpu_quantity(cpu_str):
     if not cpu_str:
         return 0
-    if cpu_str.endswith('n'):
-        # Convert nanocores to millicores (1m = 1,000,000n)
-        return int(cpu_str[:-1]) // 1000000
-    if cpu_str.endswith('m'):
-        return int(cpu_str[:-1])
+    divisor = _CPU_SUFFIX_DIVISORS.get(cpu_str[-1])
+    if divisor is not None:
+        return int(cpu_str[:-1]) // divisor
     try:
         return int(cpu_str) * 1000
     except (ValueError, TypeError):
         # Handle cases where the value might not be a simple integer
         return 0
 
-def parse_memory_value(mem_str):
-    """Parses a memory string (e.g., '64Mi', '1Gi') into bytes."""
+@functools.lru_cache(maxsize=4096)
+def parse_cpu_value(cpu_str):
+    """Parses a CPU string (e.g., '500m', '1', '2500n') into millicores."""
+    return _parse_cpu_quantity(cpu_str)
+
+def _parse_memory_quantity(mem_str):
     if not mem_str:
         return 0
-    units = {"Ki": 1024, "Mi": 1024**2, "Gi": 1024**3, "Ti": 1024**4}
     mem_str = mem_str.strip()
-    for unit, multiplier in units.items():
-        if mem_str.endswith(unit):
-            return int(mem_str[:-len(unit)]) * multiplier
+    multiplier = _MEM_SUFFIX_MULTIPLIERS.get(mem_str[-2:])
+    if multiplier is not None:
+        return int(mem_str[:-2]) * multiplier
+    multiplier = _MEM_DECIMAL_MULTIPLIERS.get(mem_str[-1:])
+    if multiplier is not None:
+        return int(mem_str[:-1]) * multiplier
     return int(mem_str)
 
+@functools.lru_cache(maxsize=4096)
+def parse_memory_value(mem_str):
+    """Parses a memory string (e.g., '64Mi', '1Gi', '128M') into bytes."""
+    return _parse_memory_quantity(mem_str)
+
 # --- New Helper for Resource Monitoring ---
 
-def get_all_pods_with_limits(core_v1_api):
-    """
-    Fetches all pods in all namespaces and extracts their resource limits.
-    Returns a dictionary mapping (namespace, pod_name) to its limits.
-    """
-    pod_limits = {}
-    try:
-        all_pods = core_v1_api.list_pod_for_all_namespaces(watch=False).items
-        for pod in all_pods:
-            pod_key = (pod.metadata.namespace, pod.metadata.name)
-            pod_limits[pod_key] = {"cpu": 0, "memory": 0}
-            for container in pod.spec.containers:
-                if container.resources and container.resources.limits:
-                    limits = container.resources.limits
-                    if limits.get("cpu"):
-                        pod_limits[pod_key]["cpu"] += parse_cpu_value(limits["cpu"])
-                    if limits.get("memory"):
-                        pod_limits[pod_key]["memory"] += parse_memory_value(limits["memory"])
-    except client.ApiException as e:
-        print(f"Error fetching pod limits: {e}")
+def _sum_container_limits(containers):
+    """Sums (cpu millicores, memory bytes) limits over V1Container specs."""
+    total_cpu = 0
+    total_memory = 0
+    for container in containers:
+        limits = container.resources.limits if container.resources else None
+        if limits:
+            if limits.get("cpu"):
+                total_cpu += parse_cpu_value(limits["cpu"])
+            if limits.get("memory"):
+                total_memory += parse_memory_value(limits["memory"])
+    return total_cpu, total_memory
+
+def _sum_container_usage(containers):
+    """Sums (cpu millicores, memory bytes) usage over metrics.k8s.io container entries."""
+    total_cpu = 0
+    total_memory = 0
+    for container in containers:
+        usage = container["usage"]
+        total_cpu += _parse_cpu_quantity(usage["cpu"])
+        total_memory += _parse_memory_quantity(usage["memory"])
+    return total_cpu, total_memory
+
+def get_pod_limits_from_pods(pods):
+    """Builds a PodLimitsTable from already-listed V1Pod objects, without any API call."""
+    pod_limits = PodLimitsTable()
+    index, cpu_m, mem_b = pod_limits.index, pod_limits.cpu_m, pod_limits.mem_b
+    for pod in pods:
+        total_cpu, total_memory = _sum_container_limits(pod.spec.containers)
+        index[(pod.metadata.namespace, pod.metadata.name)] = len(cpu_m)
+        cpu_m.append(total_cpu)
+        mem_b.append(total_memory)
     return pod_limits
 
 
-def get_pod_metrics(custom_objects_api, namespace="all"):
-    """Fetches CPU and Memory metrics for pods in a given namespace or all namespaces."""
+def _summarize_pod_metrics(metrics_list):
+    """Sums container usage from a metrics.k8s.io PodMetricsList into {(namespace, pod): usage}."""
     pod_metrics = {}
+    for item in metrics_list.get("items", []):
+        pod_name = item["metadata"]["name"]
+        namespace_name = item["metadata"]["namespace"]
+        total_cpu, total_memory = _sum_container_usage(item.get("containers", []))
+
+        pod_metrics[(namespace_name, pod_name)] = {
+            "cpu_usage_millicores": total_cpu,
+            "memory_usage_bytes": total_memory
+        }
+    return pod_metrics
+
+
+def _list_pod_metrics(custom_objects_api, namespace="all"):
+    """Fetches the raw metrics.k8s.io PodMetricsList. Returns (metrics_list, error)."""
     try:
         group = "metrics.k8s.io"
         version = "v1beta1"
         plural = "pods"
         
         if namespace == "all":
-            metrics_list = custom_objects_api.list_cluster_custom_object(group, version, plural)
-        else:
-            metrics_list = custom_objects_api.list_namespaced_custom_object(group, version, plural, namespace)
-
-        for item in metrics_list.get("items", []):
-            pod_name = item["metadata"]["name"]
-            namespace_name = item["metadata"]["namespace"]
-            total_cpu = 0
-            total_memory = 0
-            for container in item.get("containers", []):
-                total_cpu += parse_cpu_value(container["usage"]["cpu"])
-                total_memory += parse_memory_value(container["usage"]["memory"])
-            
-            pod_metrics[(namespace_name, pod_name)] = {
-                "cpu_usage_millicores": total_cpu,
-                "memory_usage_bytes": total_memory
-            }
+            return custom_objects_api.list_cluster_custom_object(group, version, plural), None
+        return custom_objects_api.list_namespaced_custom_object(group, version, plural, namespace), None
     except client.ApiException as e:
         if e.status == 404:
             return {}, "Metrics API (metrics.k8s.io) not found. Is the Kubernetes Metrics Server installed?"
         return {}, f"Error fetching pod metrics: {e}"
     except Exception as e:
         return {}, f"An unexpected error occurred while fetching pod metrics: {e}"
-        
-    return pod_metrics, None
+
+
+def get_pod_metrics(custom_objects_api, namespace="all"):
+    """Fetches CPU and Memory metrics for pods in a given namespace or all namespaces."""
+    metrics_list, error = _list_pod_metrics(custom_objects_api, namespace)
+    if error:
+        return {}, error
+    try:
+        return _summarize_pod_metrics(metrics_list), None
+    except Exception as e:
+        return {}, f"An unexpected error occurred while fetching pod metrics: {e}"
+
+
+def _cached_list(namespace, kind, fetch, ttl=LIST_CACHE_TTL_SECONDS):
+    """Returns fetch() for (namespace, kind), reusing a result younger than the TTL."""
+    key = (namespace, kind)
+    now = time.monotonic()
+    with _LIST_CACHE_LOCK:
+        cached = _LIST_CACHE.get(key)
+    if cached and now - cached[0] < ttl:
+        return cached[2]
+    result = fetch()
+    with _LIST_CACHE_LOCK:
+        for stale_key in [k for k, (ts, entry_ttl, _) in _LIST_CACHE.items() if now - ts >= entry_ttl]:
+            del _LIST_CACHE[stale_key]
+        _LIST_CACHE[key] = (now, ttl, result)
+    return result
+
+def _objects_in_namespace(objects, namespace):
+    return [obj for obj in objects if obj.metadata.namespace == namespace]
+
+def _pod_metrics_in_namespace(custom_objects_api, namespace):
+    """get_pod_metrics for a namespace, filtered from cached cluster-wide metrics when those can be read."""
+    pod_metrics, error = _cached_list("all", "metrics", lambda: get_pod_metrics(custom_objects_api, "all"))
+    if namespace == "all":
+        return pod_metrics, error
+    if error is None:
+        return {key: usage for key, usage in pod_metrics.items() if key[0] == namespace}, None
+    return _cached_list(namespace, "metrics", lambda: get_pod_metrics(custom_objects_api, namespace))
+
+def _list_in_namespace(kind, list_all_fn, list_namespaced_fn, namespace, ttl=NAMESPACE_LIST_CACHE_TTL_SECONDS):
+    """
+    Returns the objects of one kind in namespace ("all" for every namespace),
+    filtered from a cached cluster-wide list.
+    """
+    try:
+        items = _cached_list("all", kind, lambda: list(_paginated_list(list_all_fn, watch=False)), ttl=ttl)
+    except client.ApiException as e:
+        if e.status != 403 or namespace == "all":
+            raise
+        # Not allowed to list cluster-wide; list just the requested namespace
+        return _cached_list(namespace, kind, lambda: list(_paginated_list(list_namespaced_fn, namespace=namespace, watch=False)), ttl=ttl)
+    if namespace == "all":
+        return items
+    return _objects_in_namespace(items, namespace)
+
+# Pods, deployments and ReplicaSets are likewise listed cluster-wide once per
+# LIST_CACHE_TTL_SECONDS, however many namespaces the views ask about.
+
+def _list_pods(core_v1_api, namespace):
+    return _list_in_namespace("pods", core_v1_api.list_pod_for_all_namespaces, core_v1_api.list_namespaced_pod,
+                              namespace, ttl=LIST_CACHE_TTL_SECONDS)
+
+def _list_deployments(apps_v1_api, namespace):
+    return _list_in_namespace("deployments", apps_v1_api.list_deployment_for_all_namespaces, apps_v1_api.list_namespaced_deployment,
+                              namespace, ttl=LIST_CACHE_TTL_SECONDS)
+
+def _list_replica_sets(apps_v1_api, namespace):
+    """Lists ReplicaSets, returning None if they cannot be listed (e.g. missing RBAC)."""
+    try:
+        return _list_in_namespace("replicasets", apps_v1_api.list_replica_set_for_all_namespaces, apps_v1_api.list_namespaced_replica_set,
+                                  namespace, ttl=LIST_CACHE_TTL_SECONDS)
+    except client.ApiException as e:
+        logger.debug("Could not list ReplicaSets, falling back to selector matching: %s", e)
+        return None
+
+def _controller_uid(obj):
+    """Returns the uid of the object's controlling owner, or None."""
+    for ref in obj.metadata.owner_references or ():
+        if ref.controller:
+            return ref.uid
+    return None
+
+def _group_pods_by_owner(pods, replica_sets):
+    """Groups pods by the uid of the Deployment owning them via Pod -> ReplicaSet -> Deployment."""
+    rs_to_dep = {}
+    for rs in replica_sets:
+        dep_uid = _controller_uid(rs)
+        if dep_uid:
+            rs_to_dep[rs.metadata.uid] = dep_uid
+    pods_by_dep = defaultdict(list)
+    for pod in pods:
+        dep_uid = rs_to_dep.get(_controller_uid(pod))
+        if dep_uid:
+            pods_by_dep[dep_uid].append(pod)
+    return pods_by_dep
+
+def _group_pods_by_selector(deployments, pods):
+    """Groups pods by the uid of every Deployment whose selector matches their labels."""
+    pods_by_ns = defaultdict(list)
+    for pod in pods:
+        pods_by_ns[pod.metadata.namespace].append(pod)
+    pods_by_dep = {}
+    for dep in deployments:
+        selector = _selector_tuples(dep)
+        pods_by_dep[dep.metadata.uid] = [
+            pod for pod in pods_by_ns[dep.metadata.namespace]
+            if _labels_match(pod.metadata.labels or {}, selector)
+        ]
+    return pods_by_dep
+
+def _selector_tuples(dep):
+    """Returns the deployment's match_labels as sorted (key, value) tuples, cached by uid."""
+    uid = dep.metadata.uid
+    tuples = _SELECTOR_TUPLES_CACHE.get(uid)
+    if tuples is None:
+        tuples = tuple(sorted((dep.spec.selector.match_labels or {}).items()))
+        _SELECTOR_TUPLES_CACHE[uid] = tuples
+    return tuples
+
+def _labels_match(labels, selector_tuples):
+    """True if every (key, value) of the selector is present in labels."""
+    for k, v in selector_tuples:
+        if labels.get(k) != v:
+            return False
+    return True
+
+def get_metrics_snapshot(core_v1_api, apps_v1_api, custom_objects_api, namespace="all", with_deployments=True):
+    """
+    Returns a MetricsCache for the namespace, listing each kind at most once per TTL.
+    The kinds are fetched concurrently on the shared pool.
+    Raises client.ApiException if pods or deployments cannot be listed.
+    """
+    pods_future = _submit(_list_pods, core_v1_api, namespace)
+    deployments_future = replica_sets_future = None
+    if with_deployments:
+        deployments_future = _submit(_list_deployments, apps_v1_api, namespace)
+        replica_sets_future = _submit(_list_replica_sets, apps_v1_api, namespace)
+    metrics_future = _submit(_pod_metrics_in_namespace, custom_objects_api, namespace)
+
+    pods = pods_future.result()
+    deployments = deployments_future.result() if deployments_future else []
+    replica_sets = replica_sets_future.result() if replica_sets_future else None
+    pod_metrics, error = metrics_future.result()
+    return MetricsCache(pods=pods, deployments=deployments, replica_sets=replica_sets,
+                        pod_metrics=pod_metrics, metrics_error=error, ts=time.monotonic())
+
+
+def _build_pods_info(pods, pod_metrics):
+    """Builds the pod rows shown by the dashboard from listed pods and their metrics."""
+    pods_info = []
+    for pod in pods:
+        pod_name = pod.metadata.name
+        namespace_name = pod.metadata.namespace
+
+        # Determine pod status
+        status = pod.status.phase
+        if pod.status.container_statuses:
+            for cs in pod.status.container_statuses:
+                if cs.state.waiting:
+                    status = cs.state.waiting.reason
+                    break
+                if cs.state.terminated:
+                    status = cs.state.terminated.reason
+                    break
+
+        metrics = pod_metrics.get((namespace_name, pod_name), {})
+        cpu_usage = metrics.get("cpu_usage_millicores", 0)
+        mem_usage = metrics.get("memory_usage_bytes", 0)
+
+        pods_info.append(PodInfo(
+            name=pod_name,
+            namespace=namespace_name,
+            status=status,
+            ip=pod.status.pod_ip,
+            cpu=f"{cpu_usage}m",
+            memory=f"{mem_usage // 1024**2}Mi",
+            container_statuses=pod.status.container_statuses,
+            memory_bytes=mem_usage # Numeric copy of `memory` for sorting without re-parsing
+        ))
+    return pods_info
+
+def _build_deployments_info(deployments, pods, pod_metrics, replica_sets=None):
+    """
+    Builds the deployment rows. Pods are attributed through their ownerReferences
+    when the ReplicaSets are known, otherwise by matching selectors in-process.
+    """
+    deployments_info = []
+    if replica_sets is not None:
+        pods_by_dep = _group_pods_by_owner(pods, replica_sets)
+    else:
+        pods_by_dep = _group_pods_by_selector(deployments, pods)
+
+    for dep in deployments:
+        dep_pods = pods_by_dep.get(dep.metadata.uid, ())
+
+        total_cpu = 0
+        total_memory = 0
+        for pod in dep_pods:
+            metrics = pod_metrics.get((pod.metadata.namespace, pod.metadata.name), {})
+            total_cpu += metrics.get("cpu_usage_millicores", 0)
+            total_memory += metrics.get("memory_usage_bytes", 0)
+
+        deployments_info.append({
+            "name": dep.metadata.name,
+            "namespace": dep.metadata.namespace,
+            "replicas": dep.spec.replicas,
+            "ready_replicas": dep.status.ready_replicas,
+            "pod_count": len(dep_pods),
+            "cpu": total_cpu,
+            "memory": total_memory // 1024**2, # Convert to Mi
+            "conditions": dep.status.conditions # Include conditions for deployment health check
+        })
+    return deployments_info
 
 
 def get_pod_status(core_v1_api, custom_objects_api, namespace="all"):
     """
     Retrieves status, IP, and metrics for pods in a given namespace or all namespaces.
     """
-    pods_info = []
     try:
-        if namespace == "all":
-            pods = core_v1_api.list_pod_for_all_namespaces(watch=False).items
-        else:
-            pods = core_v1_api.list_namespaced_pod(namespace, watch=False).items
-
-        pod_metrics, error = get_pod_metrics(custom_objects_api, namespace)
-        if error:
+        snapshot = get_metrics_snapshot(core_v1_api, None, custom_objects_api, namespace, with_deployments=False)
+        if snapshot.metrics_error:
             # Non-fatal, we can still show status without metrics
-            print(f"Warning: {error}")
-
-        for pod in pods:
-            pod_name = pod.metadata.name
-            namespace_name = pod.metadata.namespace
-            
-            # Determine pod status
-            status = pod.status.phase
-            if pod.status.container_statuses:
-                for cs in pod.status.container_statuses:
-                    if cs.state.waiting:
-                        status = cs.state.waiting.reason
-                        break
-                    if cs.state.terminated:
-                        status = cs.state.terminated.reason
-                        break
-            
-            metrics = pod_metrics.get((namespace_name, pod_name), {})
-            cpu_usage = metrics.get("cpu_usage_millicores", 0)
-            mem_usage = metrics.get("memory_usage_bytes", 0)
-
-            pods_info.append({
-                "name": pod_name,
-                "namespace": namespace_name,
-                "status": status,
-                "ip": pod.status.pod_ip,
-                "cpu": f"{cpu_usage}m",
-                "memory": f"{mem_usage // 1024**2}Mi",
-                "container_statuses": pod.status.container_statuses
-            })
+            logger.warning("%s", snapshot.metrics_error)
     except client.ApiException as e:
         return [], f"Error fetching pod status: {e}"
-    
-    return pods_info, None
+
+    return _build_pods_info(snapshot.pods, snapshot.pod_metrics), None
 
 
 def get_deployment_status(core_v1_api, apps_v1_api, custom_objects_api, namespace="all"):
     """
     Retrieves status and aggregated metrics for deployments in a given namespace or all namespaces.
     """
-    deployments_info = []
     try:
-        if namespace == "all":
-            deployments = apps_v1_api.list_deployment_for_all_namespaces(watch=False).items
-        else:
-            deployments = apps_v1_api.list_namespaced_deployment(namespace, watch=False).items
-
-        pod_metrics, error = get_pod_metrics(custom_objects_api, namespace)
-        if error:
-            print(f"Warning: {error}")
-
-        for dep in deployments:
-            selector = dep.spec.selector.match_labels
-            selector_str = ",".join([f"{k}={v}" for k, v in selector.items()])
-            
-            # Find pods belonging to this deployment
-            pods = core_v1_api.list_namespaced_pod(dep.metadata.namespace, label_selector=selector_str).items
-            
-            total_cpu = 0
-            total_memory = 0
-            for pod in pods:
-                metrics = pod_metrics.get((pod.metadata.namespace, pod.metadata.name), {})
-                total_cpu += metrics.get("cpu_usage_millicores", 0)
-                total_memory += metrics.get("memory_usage_bytes", 0)
-
-            deployments_info.append({
-                "name": dep.metadata.name,
-                "namespace": dep.metadata.namespace,
-                "replicas": dep.spec.replicas,
-                "ready_replicas": dep.status.ready_replicas,
-                "pod_count": len(pods),
-                "cpu": total_cpu,
-                "memory": total_memory // 1024**2, # Convert to Mi
-                "conditions": dep.status.conditions # Include conditions for deployment health check
-            })
+        snapshot = get_metrics_snapshot(core_v1_api, apps_v1_api, custom_objects_api, namespace)
+        if snapshot.metrics_error:
+            logger.warning("%s", snapshot.metrics_error)
     except client.ApiException as e:
         return [], f"Error fetching deployment status: {e}"
-        
+
+    deployments_info = _build_deployments_info(snapshot.deployments, snapshot.pods, snapshot.pod_metrics, snapshot.replica_sets)
+
+    # Forget selectors of deployments that no longer exist
+    if namespace == "all" and len(_SELECTOR_TUPLES_CACHE) > 2 * len(snapshot.deployments):
+        live_uids = {dep.metadata.uid for dep in snapshot.deployments}
+        for uid in [uid for uid in _SELECTOR_TUPLES_CACHE if uid not in live_uids]:
+            del _SELECTOR_TUPLES_CACHE[uid]
+
     return deployments_info, None
 
 
 # --- Other K8s Actions (unchanged from previous versions) ---
 
-def get_node_info(core_v1_api):
+_ROLE_PREFIX = "node-role.kubernetes.io/"
+_ROLE_PREFIX_LEN = len(_ROLE_PREFIX)
+
+def _build_node_info(nodes):
+    """Builds the node rows from listed (or cached) V1Node objects."""
     nodes_info = []
+    for node in nodes:
+        status = "Unknown"
+        for condition in node.status.conditions:
+            if condition.type == "Ready":
+                status = "Ready" if condition.status == "True" else "NotReady"
+                break
+        
+        roles = [key[_ROLE_PREFIX_LEN:] for key in node.metadata.labels if key.startswith(_ROLE_PREFIX)]
+        addresses = node.status.addresses
+        ip = next((addr.address for addr in addresses if addr.type == "InternalIP"), addresses[0].address)
+        
+        nodes_info.append({
+            "name": node.metadata.name,
+            "status": status,
+            "roles": ", ".join(roles) or "<none>",
+            "ip": ip,
+            "version": node.status.node_info.kubelet_version
+        })
+    return nodes_info
+
+def get_node_info(core_v1_api):
     try:
-        nodes = core_v1_api.list_node().items
-        for node in nodes:
-            status = "Unknown"
-            for condition in node.status.conditions:
-                if condition.type == "Ready":
-                    status = "Ready" if condition.status == "True" else "NotReady"
-                    break
-            
-            roles = [key.split('/')[-1] for key in node.metadata.labels if key.startswith("node-role.kubernetes.io/")]
-            
-            nodes_info.append({
-                "name": node.metadata.name,
-                "status": status,
-                "roles": ", ".join(roles) or "<none>",
-                "ip": node.status.addresses[0].address,
-                "version": node.status.node_info.kubelet_version
-            })
+        return _build_node_info(_cached_list("all", "nodes", lambda: core_v1_api.list_node().items))
     except client.ApiException as e:
-        print(f"Error fetching node info: {e}")
-    return nodes_info
+        logger.error("Error fetching node info: %s", e)
+        return []
 
 def list_namespaces(core_v1_api):
     namespaces = []
@@ -252,9 +566,12 @@ def list_namespaces(core_v1_api):
                 "status": ns.status.phase
             })
     except client.ApiException as e:
-        print(f"Error fetching namespaces: {e}")
+        logger.error("Error fetching namespaces: %s", e)
     return namespaces
 
+# Prefix of the message get_pod_logs returns in place of the logs when the read fails
+LOG_FETCH_ERROR_PREFIX = "Error fetching logs for pod"
+
 def get_pod_logs(core_v1_api, namespace, pod_name, container=None, since_seconds=None, tail_lines=None):
     try:
         return core_v1_api.read_namespaced_pod_log(
@@ -263,29 +580,39 @@ def get_pod_logs(core_v1_api, namespace, pod_name, container=None, since_seconds
             container=container,
             since_seconds=since_seconds,
             tail_lines=tail_lines, # Added tail_lines
+            timestamps=False,
+            follow=False,
             _preload_content=True
         )
     except client.ApiException as e:
-        return f"Error fetching logs for pod {pod_name}: {e.reason}"
-
-def get_events(core_v1_api, limit=20):
-    events_info = []
+        return f"{LOG_FETCH_ERROR_PREFIX} {pod_name}: {e.reason}"
+
+def _event_timestamp(event):
+    return event.last_timestamp or event.event_time
+
+def _build_event(event):
+    """Builds the Event row for one V1Event object."""
+    timestamp = _event_timestamp(event)
+    involved_object = event.involved_object
+    return Event(
+        last_seen=timestamp.strftime("%H:%M:%S") if timestamp else "",
+        type=event.type,
+        reason=event.reason,
+        object=f"{involved_object.kind}/{involved_object.name}",
+        message=event.message
+    )
+
+def stream_events(core_v1_api, timeout_seconds=3600):
+    """
+    Yields cluster events as dicts as they are added or updated. Yields a single
+    {"error": ...} dict and stops if the watch fails.
+    """
     try:
-        events = core_v1_api.list_event_for_all_namespaces(limit=limit, _request_timeout=5).items
-        # Sort events by last timestamp
-        events.sort(key=lambda x: x.last_timestamp or x.event_time, reverse=True)
-        
-        for event in events:
-            events_info.append({
-                "last_seen": (event.last_timestamp or event.event_time).strftime('%H:%M:%S'),
-                "type": event.type,
-                "reason": event.reason,
-                "object": f"{event.involved_object.kind}/{event.involved_object.name}",
-                "message": event.message
-            })
+        for item in watch.Watch().stream(core_v1_api.list_event_for_all_namespaces, timeout_seconds=timeout_seconds):
+            if item["type"] in ("ADDED", "MODIFIED"):
+                yield _build_event(item["object"])._asdict()
     except client.ApiException as e:
-        return [], f"Error fetching events: {e}"
-    return events_info, None
+        yield {"error": f"Error streaming events: {e}"}
 
 def scale_deployment(apps_v1_api, namespace, deployment_name, replicas):
     try:
@@ -299,20 +626,24 @@ def scale_deployment(apps_v1_api, namespace, deployment_name, replicas):
 def describe_resource(core_v1_api, apps_v1_api, resource_type, name, namespace=None):
     try:
         if resource_type == "Pod":
-            return core_v1_api.read_namespaced_pod(name, namespace, pretty=True), None
+            return core_v1_api.read_namespaced_pod(name, namespace), None
         elif resource_type == "Deployment":
-            return apps_v1_api.read_namespaced_deployment(name, namespace, pretty=True), None
+            return apps_v1_api.read_namespaced_deployment(name, namespace), None
         elif resource_type == "Service":
-            return core_v1_api.read_namespaced_service(name, namespace, pretty=True), None
+            return core_v1_api.read_namespaced_service(name, namespace), None
         elif resource_type == "Node":
-            return core_v1_api.read_node(name, pretty=True), None
+            return core_v1_api.read_node(name), None
     except client.ApiException as e:
         return None, f"Error describing resource: {e.reason}"
 
 def _get_resource_as_yaml(read_func, **kwargs):
     try:
-        resource = read_func(**kwargs, _preload_content=False)
-        return yaml.dump(yaml.safe_load(resource.data)), None
+        # Ask the API server to render YAML itself; older servers/clients may still answer with JSON
+        resource = read_func(**kwargs, _preload_content=False, _headers={"Accept": "application/yaml"})
+        if "yaml" in (resource.headers.get("Content-Type") or ""):
+            return resource.data.decode("utf-8"), None
+        data = yaml.load(resource.data, Loader=SafeLoader)
+        return yaml.dump(data, Dumper=SafeDumper, default_flow_style=False), None
     except client.ApiException as e:
         return None, f"Error fetching resource YAML: {e.reason}"
 
@@ -328,10 +659,7 @@ def get_node_yaml(core_v1_api, name):
 def get_services(core_v1_api, namespace):
     services_info = []
     try:
-        if namespace == "all":
-            services = core_v1_api.list_service_for_all_namespaces().items
-        else:
-            services = core_v1_api.list_namespaced_service(namespace).items
+        services = _list_in_namespace("services", core_v1_api.list_service_for_all_namespaces, core_v1_api.list_namespaced_service, namespace)
         
         for svc in services:
             services_info.append({
@@ -357,37 +685,42 @@ def get_resource_quotas(core_v1_api, namespace):
                 "used": q.status.used
             })
     except client.ApiException as e:
-        print(f"Error fetching resource quotas: {e}")
+        logger.error("Error fetching resource quotas: %s", e)
     return quotas_info
 
 def get_configmaps(core_v1_api, namespace):
     cm_info = []
     try:
-        if namespace == "all":
-            cms = core_v1_api.list_config_map_for_all_namespaces().items
-        else:
-            cms = core_v1_api.list_namespaced_config_map(namespace).items
+        cms = _list_in_namespace("configmaps", core_v1_api.list_config_map_for_all_namespaces, core_v1_api.list_namespaced_config_map, namespace)
         for cm in cms:
             cm_info.append({"name": cm.metadata.name, "data": cm.data})
     except client.ApiException as e:
         return [], f"Error fetching ConfigMaps: {e.reason}"
     return cm_info, None
 
+# Secret types whose values are not worth decoding for display
+_BINARY_SECRET_TYPES = frozenset({
+    "kubernetes.io/tls",
+    "kubernetes.io/dockerconfigjson",
+    "kubernetes.io/dockercfg",
+    "bootstrap.kubernetes.io/token",
+})
+
 def get_secrets(core_v1_api, namespace):
     secrets_info = []
     try:
+        # Listed fresh for just the namespace asked for, so no other namespace's secrets are held
         if namespace == "all":
-            secrets = core_v1_api.list_secret_for_all_namespaces().items
+            secrets = _paginated_list(core_v1_api.list_secret_for_all_namespaces, watch=False)
         else:
-            secrets = core_v1_api.list_namespaced_secret(namespace).items
+            secrets = _paginated_list(core_v1_api.list_namespaced_secret, namespace=namespace, watch=False)
         for s in secrets:
-            decoded_data = {}
-            if s.data:
-                for k, v in s.data.items():
-                    try:
-                        decoded_data[k] = base64.b64decode(v).decode('utf-8')
-                    except:
-                        decoded_data[k] = "---<binary>---"
+            if not s.data:
+                decoded_data = {}
+            elif s.type in _BINARY_SECRET_TYPES:
+                decoded_data = {k: "---<binary>---" for k in s.data}
+            else:
+                decoded_data = {k: base64.b64decode(v).decode('utf-8', errors='replace') for k, v in s.data.items()}
             secrets_info.append({"name": s.metadata.name, "type": s.type, "data": decoded_data})
     except client.ApiException as e:
         return [], f"Error fetching Secrets: {e.reason}"
@@ -413,10 +746,7 @@ def get_persistent_volumes(core_v1_api):
 def get_persistent_volume_claims(core_v1_api, namespace):
     pvc_info = []
     try:
-        if namespace == "all":
-            pvcs = core_v1_api.list_persistent_volume_claim_for_all_namespaces().items
-        else:
-            pvcs = core_v1_api.list_namespaced_persistent_volume_claim(namespace).items
+        pvcs = _list_in_namespace("pvcs", core_v1_api.list_persistent_volume_claim_for_all_namespaces, core_v1_api.list_namespaced_persistent_volume_claim, namespace)
         for pvc in pvcs:
             pvc_info.append({
                 "name": pvc.metadata.name,
@@ -430,20 +760,45 @@ def get_persistent_volume_claims(core_v1_api, namespace):
         return [], f"Error fetching PVCs: {e.reason}"
     return pvc_info, None
 
+def get_deployment_containers(apps_v1_api, namespace, deployment_name):
+    """
+    Returns (containers, error) for a deployment as DeploymentContainer rows, decoding
+    the raw response and keeping only the container specs instead of building the
+    full V1Deployment model.
+    """
+    try:
+        resp = apps_v1_api.read_namespaced_deployment(deployment_name, namespace, _preload_content=False)
+    except client.ApiException as e:
+        return None, f"Error fetching deployment: {e.reason}"
+    template_spec = ((_json_loads(resp.data).get("spec") or {}).get("template") or {}).get("spec") or {}
+    containers = []
+    for container in template_spec.get("containers") or []:
+        resources = container.get("resources") or {}
+        containers.append(DeploymentContainer(
+            container["name"], container.get("image"), resources.get("requests") or {}, resources.get("limits") or {}
+        ))
+    return containers, None
+
+STRATEGIC_MERGE_PATCH = "application/strategic-merge-patch+json"
+
+def _patch_container(apps_v1_api, namespace, deployment_name, container_name, fields):
+    """
+    Sets fields on one container of a deployment with a strategic merge patch. The API
+    server matches the container by name, so no index (or prior GET) is needed.
+    """
+    body = {"spec": {"template": {"spec": {"containers": [dict(fields, name=container_name)]}}}}
+    apps_v1_api.patch_namespaced_deployment(deployment_name, namespace, body, _content_type=STRATEGIC_MERGE_PATCH)
+
 def patch_deployment_image(apps_v1_api, namespace, deployment_name, container_name, new_image):
     try:
-        patch = [{"op": "replace", "path": f"/spec/template/spec/containers/0/image", "value": new_image}]
-        # This is a simplified patch assuming the container is the first one.
-        # A more robust solution would find the container index by name.
-        apps_v1_api.patch_namespaced_deployment(deployment_name, namespace, body=patch)
+        _patch_container(apps_v1_api, namespace, deployment_name, container_name, {"image": new_image})
         return True, f"Deployment {deployment_name} image updated to {new_image}."
     except client.ApiException as e:
         return False, f"Error patching deployment: {e.reason}"
 
 def patch_deployment_resources(apps_v1_api, namespace, deployment_name, container_name, new_resources):
     try:
-        patch = [{"op": "replace", "path": f"/spec/template/spec/containers/0/resources", "value": new_resources}]
-        apps_v1_api.patch_namespaced_deployment(deployment_name, namespace, body=patch)
+        _patch_container(apps_v1_api, namespace, deployment_name, container_name, {"resources": new_resources})
         return True, f"Deployment {deployment_name} resources updated."
     except client.ApiException as e:
         return False, f"Error patching deployment resources: {e.reason}"
@@ -464,7 +819,8 @@ def exec_shell_in_pod(core_v1_api, namespace, pod_name, container_name):
         # The original implementation might have more complex handling for raw terminal modes.
         # For now, we just print the output.
         while resp.is_open():
-            resp.update(timeout=1)
+            # Block until the websocket has data instead of waking up every second
+            resp.update(timeout=None)
             if resp.peek_stdout():
                 print(f"STDOUT: {resp.read_stdout()}")
             if resp.peek_stderr():
@@ -472,4 +828,4 @@ def exec_shell_in_pod(core_v1_api, namespace, pod_name, container_name):
         resp.close()
 
     except client.ApiException as e:
-        print(f"Error executing shell in pod: {e.reason}")
\ No newline at end of file
+        logger.error("Error executing shell in pod: %s", e.reason)
\ No newline at end of file
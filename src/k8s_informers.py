@@ -0,0 +1,245 @@
+import time
+import heapq
+import logging
+import threading
+from collections import deque
+from kubernetes import client, watch
+from . import k8s_actions
+
+logger = logging.getLogger(__name__)
+
+# --- Informers ---
+# Each informer lists its resource once, then follows a WATCH from the list's
+# resourceVersion on a daemon thread, applying ADDED/MODIFIED/DELETED events to
+# an in-process {(namespace, name): object} cache. Checks read that cache instead
+# of re-listing the whole cluster every cycle.
+
+WATCH_TIMEOUT_SECONDS = 300 # Server-side timeout; the watch is resumed from the last resourceVersion
+WATCH_RETRY_DELAY_SECONDS = 5
+WATCH_SETTLE_SECONDS = 1 # Changes arriving this close together are reported as one
+HTTP_GONE = 410
+
+_CHANGED = threading.Event() # Set when a change-tracking informer records a changed key
+_CHANGED_KEYS = set() # {(kind, namespace, name)} changed since the last wait_for_change
+_CHANGED_LOCK = threading.Lock() # Guards _CHANGED_KEYS together with _CHANGED
+
+def _record_changes(keys):
+    with _CHANGED_LOCK:
+        _CHANGED_KEYS.update(keys)
+        _CHANGED.set()
+
+def wait_for_change(timeout):
+    """
+    Blocks until a change-tracking informer has recorded a change since the last
+    call, or timeout seconds pass. A burst of changes (e.g. a rollout) is coalesced
+    by waiting WATCH_SETTLE_SECONDS before returning. Returns the set of changed
+    (kind, namespace, name) keys, empty if there was none.
+    """
+    if not _CHANGED.wait(timeout):
+        return set()
+    time.sleep(WATCH_SETTLE_SECONDS)
+    with _CHANGED_LOCK:
+        changed = set(_CHANGED_KEYS)
+        _CHANGED_KEYS.clear()
+        _CHANGED.clear()
+    return changed
+
+class ResourceInformer:
+    """
+    Keeps a cache of one resource kind in sync with a list + watch loop. With
+    track_changes, the keys of changed objects are reported to wait_for_change.
+    """
+
+    def __init__(self, list_fn, kind, track_changes=False):
+        self._list_fn = list_fn
+        self.kind = kind
+        self.track_changes = track_changes
+        self._items = {}
+        self._lock = threading.RLock()
+        self._resource_version = None
+        self._thread = None
+
+    def _relist(self):
+        """Replaces the cache with a fresh list and remembers its resourceVersion."""
+        resp = self._list_fn(watch=False)
+        items = {(obj.metadata.namespace, obj.metadata.name): obj for obj in resp.items}
+        with self._lock:
+            previous, self._items = self._items, items
+            self._resource_version = resp.metadata.resource_version
+        if self.track_changes and previous:
+            # Re-listed after the watch expired: report what changed while it was down
+            changed = {key for key in items.keys() | previous.keys()
+                       if key not in items or key not in previous
+                       or items[key].metadata.resource_version != previous[key].metadata.resource_version}
+            if changed:
+                _record_changes((self.kind, *key) for key in changed)
+
+    def _apply(self, event_type, obj):
+        key = (obj.metadata.namespace, obj.metadata.name)
+        with self._lock:
+            if event_type == "DELETED":
+                self._items.pop(key, None)
+            elif event_type in ("ADDED", "MODIFIED"):
+                self._items[key] = obj
+            self._resource_version = obj.metadata.resource_version
+        if self.track_changes and event_type != "BOOKMARK":
+            _record_changes(((self.kind, *key),))
+
+    def _run(self):
+        while True:
+            try:
+                if self._resource_version is None:
+                    self._relist()
+                stream = watch.Watch().stream(
+                    self._list_fn,
+                    resource_version=self._resource_version,
+                    timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                    allow_watch_bookmarks=True,
+                )
+                for event in stream:
+                    self._apply(event["type"], event["object"])
+            except client.ApiException as e:
+                if e.status == HTTP_GONE:
+                    # Our resourceVersion is too old; re-list and watch from the new one
+                    logger.debug("%s watch expired, re-listing.", self.kind)
+                    self._resource_version = None
+                    continue
+                logger.warning("%s watch failed: %s", self.kind, e)
+                time.sleep(WATCH_RETRY_DELAY_SECONDS)
+            except Exception as e:
+                logger.warning("%s watch interrupted: %s", self.kind, e)
+                time.sleep(WATCH_RETRY_DELAY_SECONDS)
+
+    def start(self):
+        """Performs the initial list, then starts watching on a daemon thread."""
+        if self._thread is None:
+            self._relist()
+            self._thread = threading.Thread(target=self._run, name=f"{self.kind}-informer", daemon=True)
+            self._thread.start()
+        return self
+
+    def snapshot(self):
+        """Returns the cached objects as a list."""
+        with self._lock:
+            return list(self._items.values())
+
+    def get(self, namespace, name):
+        """Returns the cached object, or None if it does not exist."""
+        with self._lock:
+            return self._items.get((namespace, name))
+
+class EventFeed(ResourceInformer):
+    """
+    Follows cluster events with the same list + watch loop, but keeps only the
+    `maxlen` most recently seen events as Event rows (newest first) rather than
+    a cache of every event object.
+    """
+
+    def __init__(self, list_fn, maxlen):
+        super().__init__(list_fn, "Event")
+        self._recent = deque(maxlen=maxlen) # ((namespace, name), Event)
+
+    def _relist(self):
+        resp = self._list_fn(watch=False)
+        timed = [obj for obj in resp.items if k8s_actions._event_timestamp(obj)]
+        recent = heapq.nlargest(self._recent.maxlen, timed, key=k8s_actions._event_timestamp)
+        with self._lock:
+            self._recent.clear()
+            self._recent.extend(((obj.metadata.namespace, obj.metadata.name), k8s_actions._build_event(obj)) for obj in recent)
+            self._resource_version = resp.metadata.resource_version
+
+    def _apply(self, event_type, obj):
+        with self._lock:
+            if event_type in ("ADDED", "MODIFIED"):
+                key = (obj.metadata.namespace, obj.metadata.name)
+                # A repeated event (count bumped) moves to the front instead of appearing twice
+                for entry in self._recent:
+                    if entry[0] == key:
+                        self._recent.remove(entry)
+                        break
+                self._recent.appendleft((key, k8s_actions._build_event(obj)))
+            self._resource_version = obj.metadata.resource_version
+
+    def snapshot(self):
+        """Returns the recent Event rows, newest first."""
+        with self._lock:
+            return [event for _, event in self._recent]
+
+class PeriodicPoller:
+    """Re-runs fetch_fn every interval seconds on a daemon thread and keeps its latest result."""
+
+    def __init__(self, fetch_fn, interval, name):
+        self._fetch_fn = fetch_fn
+        self.interval = interval
+        self.name = name
+        self._result = None
+        self._thread = None
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._result = self._fetch_fn()
+            except Exception as e:
+                logger.warning("%s poll failed: %s", self.name, e)
+
+    def start(self):
+        """Fetches once, then keeps polling on a daemon thread."""
+        if self._thread is None:
+            self._result = self._fetch_fn()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def latest(self):
+        return self._result
+
+METRICS_POLL_INTERVAL_SECONDS = 10
+RECENT_EVENTS_LIMIT = 10
+
+_POD_INFORMER = None
+_DEPLOYMENT_INFORMER = None
+_NODE_INFORMER = None
+_EVENT_FEED = None
+_POD_METRICS_POLLER = None
+
+def start_pod_informer(core_v1_api):
+    """Returns the shared pod informer, starting it on first use."""
+    global _POD_INFORMER
+    if _POD_INFORMER is None:
+        _POD_INFORMER = ResourceInformer(core_v1_api.list_pod_for_all_namespaces, "Pod", track_changes=True).start()
+    return _POD_INFORMER
+
+def start_deployment_informer(apps_v1_api):
+    """Returns the shared deployment informer, starting it on first use."""
+    global _DEPLOYMENT_INFORMER
+    if _DEPLOYMENT_INFORMER is None:
+        _DEPLOYMENT_INFORMER = ResourceInformer(apps_v1_api.list_deployment_for_all_namespaces, "Deployment", track_changes=True).start()
+    return _DEPLOYMENT_INFORMER
+
+def start_node_informer(core_v1_api):
+    """Returns the shared node informer, starting it on first use."""
+    global _NODE_INFORMER
+    if _NODE_INFORMER is None:
+        _NODE_INFORMER = ResourceInformer(core_v1_api.list_node, "Node").start()
+    return _NODE_INFORMER
+
+def start_event_feed(core_v1_api):
+    """Returns the shared feed of the RECENT_EVENTS_LIMIT most recent events, starting it on first use."""
+    global _EVENT_FEED
+    if _EVENT_FEED is None:
+        _EVENT_FEED = EventFeed(core_v1_api.list_event_for_all_namespaces, RECENT_EVENTS_LIMIT).start()
+    return _EVENT_FEED
+
+def start_pod_metrics_poller(custom_objects_api):
+    """
+    Returns the shared pod metrics poller, starting it on first use. The metrics API
+    cannot be watched, so it is re-listed every METRICS_POLL_INTERVAL_SECONDS;
+    latest() returns (pod_metrics, error) as from k8s_actions.get_pod_metrics.
+    """
+    global _POD_METRICS_POLLER
+    if _POD_METRICS_POLLER is None:
+        _POD_METRICS_POLLER = PeriodicPoller(
+            lambda: k8s_actions.get_pod_metrics(custom_objects_api), METRICS_POLL_INTERVAL_SECONDS, "PodMetrics"
+        ).start()
+    return _POD_METRICS_POLLER
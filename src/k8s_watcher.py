@@ -1,9 +1,36 @@
+import io
 import time
+import math
+import threading
+import stat
+import asyncio
 import yaml
 import re
-from datetime import datetime, timedelta
+import functools
+import itertools
+from collections import Counter, defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from . import k8s_actions, alerter, host_actions
+from . import k8s_actions, k8s_informers, alerter, host_actions
+
+try:
+    # Optional: Hyperscan prefilters whole log blobs in one pass. Without it the
+    # fused-regex path below is used.
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    # Optional: an Aho-Corasick automaton matches all-literal pattern lists in one pass
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from yaml import CSafeLoader as SafeLoader # libyaml-backed parser, much faster when available
+except ImportError:
+    from yaml import SafeLoader
 
 # --- ANSI Color Codes ---
 COLOR_RED = "\033[91m"
@@ -12,166 +39,398 @@ COLOR_GREEN = "\033[92m"
 COLOR_RESET = "\033[0m"
 
 # --- State Management ---
-ACTIVE_POD_ISSUES = set()
-ACTIVE_LOG_ALERTS = set() # For configured pod log monitoring
-ACTIVE_NETWORK_PATH_ISSUES = set()
-ACTIVE_RESOURCE_ISSUES = set()
-ACTIVE_DEPLOYMENT_ISSUES = set()
-ACTIVE_METRICS_ERROR = set()
-ACTIVE_GLOBAL_POD_LOG_ALERTS = set() # New state for global pod log alerts
-ISSUE_ACTIVE_CYCLES = {} # Used for ongoing alerts
-NOTIFIED_COMPLETED_PODS = set()
-ALERT_BUFFER = []
-LOG_MONITOR_STATE = {} # For configured pod log monitoring
-DEPLOYMENT_ROLLOUT_STATE = {}
+
+@dataclass
+class WatcherState:
+    """
+    Issue and alert state carried across watcher cycles. Checks run concurrently
+    (see run_k8s_checks), so shared mutations happen under `lock`.
+    """
+    active_pod_issues: set = field(default_factory=set)
+    active_log_alerts: set = field(default_factory=set) # For configured pod log monitoring
+    active_network_path_issues: set = field(default_factory=set)
+    active_resource_issues: set = field(default_factory=set)
+    active_deployment_issues: set = field(default_factory=set)
+    active_metrics_error: set = field(default_factory=set)
+    active_global_pod_log_alerts: set = field(default_factory=set)
+    issue_active_cycles: Counter = field(default_factory=Counter) # Cycles each active issue has been seen, for ongoing alerts; dropped on resolve
+    global_log_quiet_cycles: Counter = field(default_factory=Counter) # Consecutive scanned cycles without a match, per active global pod log issue
+    notified_completed_pods: set = field(default_factory=set)
+    last_log_scan_time: dict = field(default_factory=dict) # {(namespace, pod, container): time.monotonic() of its last global log scan}
+    last_scan_rv: dict = field(default_factory=dict) # {(namespace, pod, container): pod resourceVersion when the global log scan last saw it}
+    log_monitor_state: dict = field(default_factory=dict) # For configured pod log monitoring: {target name: deque of time.monotonic() match times, oldest first}
+    deployment_rollout_state: dict = field(default_factory=dict)
+    deployment_unavailable_since: dict = field(default_factory=dict) # {IssueKey: time.monotonic() the deployment was first seen short of replicas}
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+STATE = WatcherState()
+
+Alert = alerter.Alert
+
+# Keys of the active_* sets, issue_active_cycles and deployment_rollout_state in WatcherState.
+# detail is the pod status, resource type or container name, or None.
+IssueKey = namedtuple("IssueKey", "kind namespace name detail")
+
+def unique_alerts(alerts):
+    """Passes alerts through, dropping repeats of a (grouping_key, subject) already seen in this stream."""
+    seen = set()
+    for alert in alerts:
+        key = (alert.grouping_key, alert.subject)
+        if key not in seen:
+            seen.add(key)
+            yield alert
+
+def _activate_issue(active_set, issue_key):
+    """Marks an issue as active (alerted)."""
+    with STATE.lock:
+        active_set.add(issue_key)
+
+def _resolve_issue(active_set, issue_key):
+    """Removes a resolved issue from its active set and drops its cycle count."""
+    with STATE.lock:
+        active_set.remove(issue_key)
+        STATE.issue_active_cycles.pop(issue_key, None)
+
+def _count_cycle(issue_key):
+    """Records another cycle in which issue_key is active and returns the new count."""
+    with STATE.lock:
+        STATE.issue_active_cycles[issue_key] += 1
+        return STATE.issue_active_cycles[issue_key]
+
+# --- Per-Cycle Cluster State ---
+
+@dataclass
+class CheckContext:
+    """Cluster state gathered once per watcher cycle and shared by every check."""
+    pods: list = field(default_factory=list)
+    pods_by_ns: dict = field(default_factory=dict)
+    deployments: list = field(default_factory=list)
+    pod_limits: k8s_actions.PodLimitsTable = field(default_factory=k8s_actions.PodLimitsTable)
+    pod_metrics: dict = field(default_factory=dict)
+    metrics_error: str = None
+
+def build_check_context(core_v1_api, apps_v1_api, custom_objects_api):
+    """
+    Reads pods and deployments from the informer caches and fetches pod metrics once.
+    Raises ApiException if the informers cannot do their initial list.
+    """
+    pods = k8s_informers.start_pod_informer(core_v1_api).snapshot()
+    pods_by_ns = defaultdict(list)
+    for pod in pods:
+        pods_by_ns[pod.metadata.namespace].append(pod)
+    pod_metrics, metrics_error = k8s_actions.get_pod_metrics(custom_objects_api)
+    return CheckContext(
+        pods=pods,
+        pods_by_ns=pods_by_ns,
+        deployments=k8s_informers.start_deployment_informer(apps_v1_api).snapshot(),
+        pod_limits=k8s_actions.get_pod_limits_from_pods(pods),
+        pod_metrics=pod_metrics,
+        metrics_error=metrics_error,
+    )
+
+def _parse_equality_selector(selector_str):
+    """
+    Parses an equality-based label selector ('app=web,tier=frontend') into
+    sorted (key, value) tuples. Returns None for set-based or negated selectors.
+    """
+    pairs = []
+    for term in filter(None, (t.strip() for t in selector_str.split(','))):
+        if '!' in term or '(' in term or ' ' in term:
+            return None
+        key, sep, value = term.partition('==') if '==' in term else term.partition('=')
+        if not sep:
+            return None
+        pairs.append((key.strip(), value.strip()))
+    return tuple(sorted(pairs))
 
 # --- Configuration Loading ---
 
+# Parsed (and pre-compiled) config.yml, re-read only when the file's mtime changes
+_CONFIG_CACHE = {'mtime': None, 'data': None}
+
 def _load_watcher_config():
     config_file = Path("config.yml")
-    if not config_file.is_file():
+    try:
+        st = config_file.stat()
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         return None, "Configuration file config.yml not found."
-    with open(config_file, 'r') as f:
-        try:
-            return yaml.safe_load(f), None
-        except yaml.YAMLError as e:
-            return None, f"Error parsing YAML file: {e}"
+
+    if _CONFIG_CACHE['mtime'] != st.st_mtime_ns:
+        with open(config_file, 'r') as f:
+            try:
+                config = yaml.load(f, Loader=SafeLoader)
+            except yaml.YAMLError as e:
+                return None, f"Error parsing YAML file: {e}"
+        if config:
+            _compile_log_patterns(config)
+        _CONFIG_CACHE['data'] = config
+        _CONFIG_CACHE['mtime'] = st.st_mtime_ns
+    return _CONFIG_CACHE['data'], None
+
+# --- Log Pattern Compilation ---
+# Each pattern list is compiled once (cached across config reloads) together with a
+# single case-insensitive alternation of all its patterns, so most log lines are
+# rejected with one regex pass instead of one pass per pattern. When Hyperscan is
+# installed, a database of the same patterns is built too and whole log blobs are
+# scanned at once; only the lines it flags are checked with the Python patterns.
+
+PatternSet = namedtuple("PatternSet", "combined patterns database literals automaton")
+
+# Patterns made only of these characters are plain substrings (matched case-insensitively)
+_LITERAL_PATTERN_RE = re.compile(r"[A-Za-z0-9_ \-:,'\"=/@]+")
+
+def _as_literal(pattern):
+    """Returns pattern as a lowercase substring if it is one (ignoring '.*' ends), else None."""
+    core = pattern
+    if core.startswith('.*'): core = core[2:]
+    if core.endswith('.*') and not core.endswith('\\.*'): core = core[:-2]
+    return core.lower() if _LITERAL_PATTERN_RE.fullmatch(core) else None
+
+def _build_automaton(literals):
+    """Builds an Aho-Corasick automaton over literals, or None if pyahocorasick is unavailable."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for i, literal in enumerate(literals):
+        if literal not in automaton:
+            automaton.add_word(literal, i) # Keep the first (config order) index of duplicates
+    automaton.make_automaton()
+    return automaton
+
+def _compile_hyperscan_database(patterns):
+    """Builds a Hyperscan database for patterns, or None if unavailable/unsupported."""
+    if hyperscan is None or not patterns:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[p.encode('utf-8') for p in patterns],
+            ids=list(range(len(patterns))),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_UTF8] * len(patterns),
+        )
+        return database
+    except hyperscan.error:
+        # Some Python regex syntax (lookbehinds, backreferences) is not supported
+        return None
+
+@functools.lru_cache(maxsize=64)
+def _compile_pattern_set(patterns):
+    """Compiles a tuple of patterns into a PatternSet."""
+    compiled = tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+    try:
+        combined = re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE) if patterns else None
+    except re.error:
+        # e.g. patterns with inline global flags cannot be joined; match them one by one
+        combined = None
+    # Lists of plain substrings skip the regex engine entirely
+    literals = tuple(_as_literal(p) for p in patterns)
+    if not patterns or None in literals:
+        literals, automaton = None, None
+    else:
+        automaton = _build_automaton(literals)
+    return PatternSet(combined, compiled, _compile_hyperscan_database(patterns), literals, automaton)
+
+def _first_literal_match(pattern_set, line):
+    lowered = line.lower()
+    if pattern_set.automaton is not None:
+        first = min((i for _, i in pattern_set.automaton.iter(lowered)), default=None)
+        return None if first is None else pattern_set.patterns[first]
+    for literal, pattern in zip(pattern_set.literals, pattern_set.patterns):
+        if literal in lowered:
+            return pattern
+    return None
+
+def _first_match(pattern_set, line):
+    """Returns the first pattern (in config order) matching line, or None."""
+    if pattern_set.literals is not None:
+        return _first_literal_match(pattern_set, line)
+    if pattern_set.combined is not None and not pattern_set.combined.search(line):
+        return None
+    for pattern in pattern_set.patterns:
+        if pattern.search(line):
+            return pattern
+    return None
+
+def _flagged_line_starts(pattern_set, blob, starts):
+    """Adds to starts the offset of every line in blob that Hyperscan matches."""
+    def on_match(pattern_id, start, end, flags, context):
+        # Hyperscan reports end offsets; the line holding the last matched byte is the hit
+        starts.add(blob.rfind(b'\n', 0, max(end - 1, 0)) + 1)
+    pattern_set.database.scan(blob, match_event_handler=on_match)
+
+def _scan_log(logs, error_set, warning_set):
+    """
+    Yields (line, pattern, is_error) for each log line matching an error pattern or,
+    failing that, a warning pattern.
+    """
+    sets = [s for s in (error_set, warning_set) if s.patterns]
+    if not sets: return
+    if all(s.database is not None for s in sets):
+        blob = logs.encode('utf-8')
+        starts = set()
+        for pattern_set in sets:
+            _flagged_line_starts(pattern_set, blob, starts)
+        lines = []
+        for start in sorted(starts):
+            end = blob.find(b'\n', start)
+            lines.append(blob[start:end if end != -1 else len(blob)].decode('utf-8', errors='replace'))
+    else:
+        lines = io.StringIO(logs) # Iterates lines without building a list of the whole log
+
+    for line in lines:
+        line = line.rstrip('\n')
+        if not line: continue
+        pattern = _first_match(error_set, line)
+        if pattern:
+            yield line, pattern, True
+            continue
+        pattern = _first_match(warning_set, line)
+        if pattern:
+            yield line, pattern, False
+
+def _compile_log_patterns(config):
+    """Attaches compiled PatternSets (and parsed time windows) to the log monitoring sections of the config."""
+    for target in (config.get('pod_log_monitoring') or {}).get('targets') or []:
+        target['error_pattern_set'] = _compile_pattern_set(tuple(target.get('error_patterns') or ()))
+        target['time_window_seconds'] = _parse_time_window_seconds(target.get('time_window', '10m'))
+    global_log_config = config.get('global_pod_log_scanning')
+    if global_log_config:
+        global_log_config['error_pattern_set'] = _compile_pattern_set(tuple(global_log_config.get('error_patterns') or ()))
+        global_log_config['warning_pattern_set'] = _compile_pattern_set(tuple(global_log_config.get('warning_patterns') or ()))
 
 # --- Time Window Parsing ---
 
-def _parse_time_window(time_str):
-    if not time_str or not isinstance(time_str, str): return timedelta(minutes=10)
-    unit = time_str[-1].lower()
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400}
+DEFAULT_TIME_WINDOW_SECONDS = 600
+
+def _parse_time_window_seconds(time_str):
+    """Converts a window like '10m', '2h' or '1d' to seconds (600 if invalid)."""
     try:
-        value = int(time_str[:-1])
-        if unit == 'm': return timedelta(minutes=value)
-        if unit == 'h': return timedelta(hours=value)
-        if unit == 'd': return timedelta(days=value)
-    except (ValueError, TypeError): pass
-    return timedelta(minutes=10)
+        return int(time_str[:-1]) * _UNIT_SECONDS[time_str[-1].lower()]
+    except (KeyError, ValueError, TypeError, IndexError):
+        return DEFAULT_TIME_WINDOW_SECONDS
 
 # --- Core Watcher Functions ---
 
-def check_metrics_server_status(custom_objects_api, config):
+def check_metrics_server_status(ctx, config):
     """
-    Checks if the metrics server is available by attempting to fetch pod metrics.
+    Checks if the metrics server is available, using the result of this cycle's pod metrics fetch.
     Triggers an alert if unavailable, and a resolved alert if it recovers.
     """
-    global ACTIVE_METRICS_ERROR, ALERT_BUFFER
     issue_key = "metrics_server_unavailable"
-    
-    # Attempt to fetch metrics for a single pod to check server status
-    # Use kube-system for a common pod, but check if it exists first
-    try:
-        # Try to list pods in kube-system to ensure namespace exists
-        core_v1_api = k8s_actions.init_clients()[0] # Temporarily get core_v1_api
-        if not core_v1_api: raise Exception("CoreV1Api not initialized")
-        core_v1_api.list_namespaced_pod("kube-system", limit=1)
-    except Exception:
-        # If kube-system doesn't exist or API fails, use default
-        namespace_to_check = "default"
-    else:
-        namespace_to_check = "kube-system"
-
-    _, error = k8s_actions.get_pod_metrics(custom_objects_api, namespace=namespace_to_check)
+    error = ctx.metrics_error
     
     if error:
-        if issue_key not in ACTIVE_METRICS_ERROR:
+        if issue_key not in STATE.active_metrics_error:
             subject = "Kubernetes Metrics Server Unavailable"
             body = f"The Kubernetes Metrics Server is currently unavailable or returning errors.\nError: {error}"
-            ALERT_BUFFER.append({"grouping_key": "Metrics Server Status", "subject": subject, "body": body, "severity": "ALERT"})
-            ACTIVE_METRICS_ERROR.add(issue_key)
+            yield Alert("Metrics Server Status", subject, body, "ALERT")
+            _activate_issue(STATE.active_metrics_error, issue_key)
     else:
-        if issue_key in ACTIVE_METRICS_ERROR:
+        if issue_key in STATE.active_metrics_error:
             subject = "RESOLVED: Kubernetes Metrics Server Available"
             body = "The Kubernetes Metrics Server is now available and responding to requests."
-            ALERT_BUFFER.append({"grouping_key": "Metrics Server Status", "subject": subject, "body": body, "severity": "RESOLVED"})
-            ACTIVE_METRICS_ERROR.remove(issue_key)
+            yield Alert("Metrics Server Status", subject, body, "RESOLVED")
+            _resolve_issue(STATE.active_metrics_error, issue_key)
+
 
+DEFAULT_UNAVAILABLE_GRACE_SECONDS = 300
 
-def check_deployment_health(core_v1_api, apps_v1_api, custom_objects_api, config):
+def _deployment_alerts(dep, deploy_config, now, current_issues, unavailable_grace_seconds=0):
+    """
+    Evaluates one deployment, adding the issue keys it currently has to current_issues
+    and yielding alerts for the ones not alerted yet. An unavailable-replicas issue is
+    only raised once it has lasted unavailable_grace_seconds.
+    """
+    unavailable_threshold = deploy_config.get('unavailable_replicas_threshold', 0)
+    stuck_rollout_timeout = deploy_config.get('stuck_rollout_timeout_seconds', 300)
+    namespace = dep.metadata.namespace
+    name = dep.metadata.name
+    desired_replicas = dep.spec.replicas or 0
+    ready_replicas = dep.status.ready_replicas or 0
+    unavailable_replicas = desired_replicas - ready_replicas
+
+    # --- Check for Unavailable Replicas ---
+    issue_key = IssueKey("deployment_unavailable", namespace, name, None)
+    if unavailable_replicas > unavailable_threshold:
+        since = STATE.deployment_unavailable_since.setdefault(issue_key, now)
+        if issue_key in STATE.active_deployment_issues:
+            current_issues.add(issue_key)
+        elif now - since >= unavailable_grace_seconds:
+            current_issues.add(issue_key)
+            subject = f"Deployment '{name}' has Unavailable Replicas"
+            body = (f"Deployment '{name}' in namespace '{namespace}' has {unavailable_replicas} unavailable replicas.\n"
+                    f"Desired: {desired_replicas}, Ready: {ready_replicas}")
+            yield Alert(f"Deployment Unavailable:{namespace}", subject, body, "ALERT")
+            _activate_issue(STATE.active_deployment_issues, issue_key)
+    else:
+        STATE.deployment_unavailable_since.pop(issue_key, None)
+
+    # --- Check for Stuck Rollouts ---
+    is_progressing = False
+    is_stuck_failed = False
+    for condition in dep.status.conditions or []:
+        if condition.type == 'Progressing':
+            if condition.status == 'True':
+                is_progressing = True
+            elif condition.status == 'False' and condition.reason == 'FailedDeployment':
+                is_stuck_failed = True
+
+    rollout_key = IssueKey("deployment_stuck", namespace, name, None)
+    if (ready_replicas < desired_replicas and is_progressing) or is_stuck_failed:
+        if rollout_key not in STATE.deployment_rollout_state:
+            STATE.deployment_rollout_state[rollout_key] = now
+
+        if now - STATE.deployment_rollout_state[rollout_key] >= stuck_rollout_timeout:
+            current_issues.add(rollout_key)
+            if rollout_key not in STATE.active_deployment_issues:
+                subject = f"Deployment '{name}' Rollout Stuck"
+                body = (f"Deployment '{name}' in namespace '{namespace}' has been stuck in rollout for over {stuck_rollout_timeout} seconds.\n"
+                        f"Desired: {desired_replicas}, Ready: {ready_replicas}")
+                yield Alert(f"Deployment Stuck:{namespace}", subject, body, "ALERT")
+                _activate_issue(STATE.active_deployment_issues, rollout_key)
+    else:
+        STATE.deployment_rollout_state.pop(rollout_key, None)
+
+def _resolve_deployment_issues(issue_keys):
+    """Yields RESOLVED alerts for the given deployment issues and clears them."""
+    for issue_key in issue_keys:
+        issue_type = "Unavailable Replicas" if issue_key.kind == "deployment_unavailable" else "Rollout Stuck"
+        subject = f"RESOLVED: Deployment '{issue_key.name}' Health Issue"
+        body = f"Deployment '{issue_key.name}' in '{issue_key.namespace}' has resolved its '{issue_type}' issue."
+        yield Alert("Resolved", subject, body, "RESOLVED")
+        _resolve_issue(STATE.active_deployment_issues, issue_key)
+
+def check_deployment_health(ctx, config):
     """
     Checks for deployment health issues like stuck rollouts or unavailable replicas.
     """
-    global ACTIVE_DEPLOYMENT_ISSUES, ALERT_BUFFER, DEPLOYMENT_ROLLOUT_STATE
     deploy_config = config.get('deployment_health_monitoring', {})
     if not deploy_config.get('enabled'): return
 
     print("K8s Watcher: Checking deployment health...")
-    
-    unavailable_threshold = deploy_config.get('unavailable_replicas_threshold', 0)
-    stuck_rollout_timeout = deploy_config.get('stuck_rollout_timeout_seconds', 300)
-    
-    deployments, error = k8s_actions.get_deployment_status(core_v1_api, apps_v1_api, custom_objects_api, "all")
-    if error:
-        print(f"K8s Watcher Error: Could not get deployment status: {error}")
-        return
 
     current_deploy_issues = set()
-    now = datetime.now()
-
-    for dep in deployments:
-        namespace = dep['namespace']
-        name = dep['name']
-        desired_replicas = dep['replicas'] or 0
-        ready_replicas = dep['ready_replicas'] or 0
-        unavailable_replicas = desired_replicas - ready_replicas
-
-        # --- Check for Unavailable Replicas ---
-        if unavailable_replicas > unavailable_threshold:
-            issue_key = f"deployment_unavailable/{namespace}/{name}"
-            current_deploy_issues.add(issue_key)
-            if issue_key not in ACTIVE_DEPLOYMENT_ISSUES:
-                subject = f"Deployment '{name}' has Unavailable Replicas"
-                body = (f"Deployment '{name}' in namespace '{namespace}' has {unavailable_replicas} unavailable replicas.\n"
-                        f"Desired: {desired_replicas}, Ready: {ready_replicas}")
-                ALERT_BUFFER.append({"grouping_key": f"Deployment Unavailable:{namespace}", "subject": subject, "body": body, "severity": "ALERT"})
-                ACTIVE_DEPLOYMENT_ISSUES.add(issue_key)
-        
-        # --- Check for Stuck Rollouts ---
-        is_progressing = False
-        is_stuck_failed = False
-        for condition in dep.get('conditions', []):
-            if condition.type == 'Progressing':
-                if condition.status == 'True':
-                    is_progressing = True
-                elif condition.status == 'False' and condition.reason == 'FailedDeployment':
-                    is_stuck_failed = True
-            
-        if (ready_replicas < desired_replicas and is_progressing) or is_stuck_failed:
-            rollout_key = f"deployment_stuck/{namespace}/{name}"
-            
-            if rollout_key not in DEPLOYMENT_ROLLOUT_STATE:
-                DEPLOYMENT_ROLLOUT_STATE[rollout_key] = now
-            
-            if (now - DEPLOYMENT_ROLLOUT_STATE[rollout_key]).total_seconds() >= stuck_rollout_timeout:
-                current_deploy_issues.add(rollout_key)
-                if rollout_key not in ACTIVE_DEPLOYMENT_ISSUES:
-                    subject = f"Deployment '{name}' Rollout Stuck"
-                    body = (f"Deployment '{name}' in namespace '{namespace}' has been stuck in rollout for over {stuck_rollout_timeout} seconds.\n"
-                            f"Desired: {desired_replicas}, Ready: {ready_replicas}")
-                    ALERT_BUFFER.append({"grouping_key": f"Deployment Stuck:{namespace}", "subject": subject, "body": body, "severity": "ALERT"})
-                    ACTIVE_DEPLOYMENT_ISSUES.add(rollout_key)
-        else:
-            if f"deployment_stuck/{namespace}/{name}" in DEPLOYMENT_ROLLOUT_STATE:
-                del DEPLOYMENT_ROLLOUT_STATE[f"deployment_stuck/{namespace}/{name}"]
+    now = time.monotonic() # Rollout start times are only compared against each other
+
+    for dep in ctx.deployments:
+        yield from _deployment_alerts(dep, deploy_config, now, current_deploy_issues)
+
+    # Every deployment short of replicas was just added to current_deploy_issues,
+    # so anything else in the unavailable-since times belongs to a deleted one
+    for issue_key in STATE.deployment_unavailable_since.keys() - current_deploy_issues:
+        del STATE.deployment_unavailable_since[issue_key]
 
     # Handle resolved deployment issues
-    resolved_deploy_issues = ACTIVE_DEPLOYMENT_ISSUES - current_deploy_issues
-    for issue_key in resolved_deploy_issues:
-        _, namespace, name = issue_key.split('/')[:3]
-        issue_type = "Unavailable Replicas" if "unavailable" in issue_key else "Rollout Stuck"
-        subject = f"RESOLVED: Deployment '{name}' Health Issue"
-        body = f"Deployment '{name}' in '{namespace}' has resolved its '{issue_type}' issue."
-        ALERT_BUFFER.append({"grouping_key": "Resolved", "subject": subject, "body": body, "severity": "RESOLVED"})
-        ACTIVE_DEPLOYMENT_ISSUES.remove(issue_key)
+    yield from _resolve_deployment_issues(STATE.active_deployment_issues - current_deploy_issues)
 
 
-def check_resource_usage(core_v1_api, custom_objects_api, config):
+def check_resource_usage(ctx, config):
     """
     Checks if pods are exceeding a percentage of their defined resource limits.
     """
-    global ACTIVE_RESOURCE_ISSUES, ALERT_BUFFER
     usage_config = config.get('resource_usage_monitoring', {})
     if not usage_config.get('enabled'): return
 
@@ -180,269 +439,347 @@ def check_resource_usage(core_v1_api, custom_objects_api, config):
     cpu_threshold = usage_config.get('cpu_threshold_percent', 90)
     mem_threshold = usage_config.get('memory_threshold_percent', 90)
 
-    pod_limits = k8s_actions.get_all_pods_with_limits(core_v1_api)
-    pod_metrics, error = k8s_actions.get_pod_metrics(custom_objects_api)
-
+    error = ctx.metrics_error
     if error:
         print(f"K8s Watcher Warning: Could not check resource usage: {error}")
         return
 
     current_breaches = set()
+    pod_limits = ctx.pod_limits
 
-    for (namespace, pod_name), metrics in pod_metrics.items():
-        limits = pod_limits.get((namespace, pod_name))
-        if not limits: continue
+    for (namespace, pod_name), metrics in ctx.pod_metrics.items():
+        row = pod_limits.index.get((namespace, pod_name))
+        if row is None: continue
+        cpu_usage = metrics["cpu_usage_millicores"]
+        mem_usage = metrics["memory_usage_bytes"]
+        cpu_limit = pod_limits.cpu_m[row]
+        mem_limit = pod_limits.mem_b[row]
 
         # Check CPU usage
-        if limits["cpu"] > 0:
-            cpu_usage_percent = (metrics["cpu_usage_millicores"] / limits["cpu"]) * 100
+        if cpu_limit > 0:
+            cpu_usage_percent = (cpu_usage / cpu_limit) * 100
             if cpu_usage_percent >= cpu_threshold:
-                breach_key = f"resource_usage/{namespace}/{pod_name}/cpu"
+                breach_key = IssueKey("resource_usage", namespace, pod_name, "cpu")
                 current_breaches.add(breach_key)
-                if breach_key not in ACTIVE_RESOURCE_ISSUES:
+                if breach_key not in STATE.active_resource_issues:
                     subject = f"High CPU Usage on Pod '{pod_name}'"
                     body = (f"CPU usage exceeded {cpu_threshold}% threshold.\n"
                             f"Pod: {pod_name}\nNS: {namespace}\n"
-                            f"Usage: {metrics['cpu_usage_millicores']}m ({cpu_usage_percent:.1f}%) | Limit: {limits['cpu']}m")
-                    ALERT_BUFFER.append({"grouping_key": f"High CPU Usage:{namespace}", "subject": subject, "body": body, "severity": "ALERT"})
-                    ACTIVE_RESOURCE_ISSUES.add(breach_key)
+                            f"Usage: {cpu_usage}m ({cpu_usage_percent:.1f}%) | Limit: {cpu_limit}m")
+                    yield Alert(f"High CPU Usage:{namespace}", subject, body, "ALERT")
+                    _activate_issue(STATE.active_resource_issues, breach_key)
 
         # Check Memory usage
-        if limits["memory"] > 0:
-            mem_usage_percent = (metrics["memory_usage_bytes"] / limits["memory"]) * 100
+        if mem_limit > 0:
+            mem_usage_percent = (mem_usage / mem_limit) * 100
             if mem_usage_percent >= mem_threshold:
-                breach_key = f"resource_usage/{namespace}/{pod_name}/memory"
+                breach_key = IssueKey("resource_usage", namespace, pod_name, "memory")
                 current_breaches.add(breach_key)
-                if breach_key not in ACTIVE_RESOURCE_ISSUES:
+                if breach_key not in STATE.active_resource_issues:
                     subject = f"High Memory Usage on Pod '{pod_name}'"
                     body = (f"Memory usage exceeded {mem_threshold}% threshold.\n"
                             f"Pod: {pod_name}\nNS: {namespace}\n"
-                            f"Usage: {metrics['memory_usage_bytes'] // 1024**2}Mi ({mem_usage_percent:.1f}%) | Limit: {limits['memory'] // 1024**2}Mi")
-                    ALERT_BUFFER.append({"grouping_key": f"High Memory Usage:{namespace}", "subject": subject, "body": body, "severity": "ALERT"})
-                    ACTIVE_RESOURCE_ISSUES.add(breach_key)
+                            f"Usage: {mem_usage // 1024**2}Mi ({mem_usage_percent:.1f}%) | Limit: {mem_limit // 1024**2}Mi")
+                    yield Alert(f"High Memory Usage:{namespace}", subject, body, "ALERT")
+                    _activate_issue(STATE.active_resource_issues, breach_key)
 
     # Handle resolved breaches
-    resolved_breaches = ACTIVE_RESOURCE_ISSUES - current_breaches
+    resolved_breaches = STATE.active_resource_issues - current_breaches
     for breach_key in resolved_breaches:
-        _, namespace, name, r_type = breach_key.split('/')
+        _, namespace, name, r_type = breach_key
         subject = f"RESOLVED: High {r_type.upper()} Usage on Pod '{name}'"
         body = (
             f"The high {r_type.upper()} usage issue for pod '{name}' in namespace '{namespace}' has been resolved.\n"
             f"Usage is now within the {usage_config.get(f'{r_type}_threshold_percent', 90)}% threshold."
         )
-        ALERT_BUFFER.append({"grouping_key": "Resolved", "subject": subject, "body": body, "severity": "RESOLVED"})
-        ACTIVE_RESOURCE_ISSUES.remove(breach_key)
+        yield Alert("Resolved", subject, body, "RESOLVED")
+        _resolve_issue(STATE.active_resource_issues, breach_key)
+
+
+def _pod_issue_key(pod, alert_statuses):
+    """Returns the IssueKey of a PodInfo in one of alert_statuses, or None."""
+    pod_has_issue, determined_status = False, pod.status
+    if pod.container_statuses:
+        for status in pod.container_statuses:
+            if status.state.waiting and status.state.waiting.reason in alert_statuses:
+                determined_status, pod_has_issue = status.state.waiting.reason, True
+                break
+            if status.state.terminated and status.state.terminated.reason in alert_statuses:
+                determined_status, pod_has_issue = status.state.terminated.reason, True
+                break
+    if not pod_has_issue and determined_status in alert_statuses:
+        pod_has_issue = True
+    return IssueKey("pod_status", pod.namespace, pod.name, determined_status) if pod_has_issue else None
+
+def _pod_status_transitions(new_issues, resolved_issues, pods):
+    """Yields alerts for pod issues that appeared or cleared, given the PodInfo rows they were found in."""
+    for issue_key in new_issues:
+        _, namespace, name, status = issue_key
+        subject = f"Pod '{name}' is in '{status}' state"
+        body = f"A new pod failure has been detected.\nPod: {name}\nNamespace: {namespace}\nStatus: {status}"
+        yield Alert(f"Pod Failure:{namespace}", subject, body, "ALERT")
+        _activate_issue(STATE.active_pod_issues, issue_key)
 
+    pod_status_by_key = {(p.namespace, p.name): p.status for p in pods} if resolved_issues else {}
+    for issue_key in resolved_issues:
+        _, namespace, name, old_status = issue_key
+        current_status = pod_status_by_key.get((namespace, name), "Unknown")
+        subject = f"RESOLVED: Pod '{name}' is no longer in '{old_status}'"
+        body = f"Pod '{name}' in '{namespace}' has recovered.\nPrevious Status: {old_status}\nCurrent Status: {current_status}"
+        yield Alert("Resolved", subject, body, "RESOLVED")
+        _resolve_issue(STATE.active_pod_issues, issue_key)
 
-def check_pod_statuses(core_v1_api, custom_objects_api, config):
-    global ACTIVE_POD_ISSUES, ISSUE_ACTIVE_CYCLES, ALERT_BUFFER
+def check_pod_statuses(ctx, config):
     alert_statuses = config.get('pod_alert_statuses', [])
     ongoing_alert_cycles = config.get('ongoing_alert_cycles', 20)
     if not alert_statuses: return
 
     print("K8s Watcher: Checking pod statuses...")
-    pods, error = k8s_actions.get_pod_status(core_v1_api, custom_objects_api, "all")
-    if error:
-        print(f"K8s Watcher Error: Could not get pod status: {error}")
-        return
+    # Status only; usage metrics are not needed here
+    pods = k8s_actions._build_pods_info(ctx.pods, {})
 
-    current_issues = set()
-    for pod in pods:
-        pod_has_issue, determined_status = False, pod['status']
-        if pod.get('container_statuses'):
-            for status in pod.get('container_statuses'):
-                if status.state.waiting and status.state.waiting.reason in alert_statuses:
-                    determined_status, pod_has_issue = status.state.waiting.reason, True
-                    break
-                if status.state.terminated and status.state.terminated.reason in alert_statuses:
-                    determined_status, pod_has_issue = status.state.terminated.reason, True
-                    break
-        if not pod_has_issue and determined_status in alert_statuses:
-            pod_has_issue = True
-
-        if pod_has_issue:
-            current_issues.add(f"pod_status/{pod['namespace']}/{pod['name']}/{determined_status}")
-
-    new_issues = current_issues - ACTIVE_POD_ISSUES
-    resolved_issues = ACTIVE_POD_ISSUES - current_issues
+    current_issues = {issue_key for issue_key in (_pod_issue_key(pod, alert_statuses) for pod in pods) if issue_key}
+    new_issues = current_issues - STATE.active_pod_issues
+    resolved_issues = STATE.active_pod_issues - current_issues
     
     for issue_key in current_issues:
-        ISSUE_ACTIVE_CYCLES[issue_key] = ISSUE_ACTIVE_CYCLES.get(issue_key, 0) + 1
-
-    for issue_key in current_issues:
-        if issue_key in ACTIVE_POD_ISSUES and ISSUE_ACTIVE_CYCLES[issue_key] > 0 and (ISSUE_ACTIVE_CYCLES[issue_key] % ongoing_alert_cycles == 0):
-            _, namespace, name, status = issue_key.split('/')
+        _count_cycle(issue_key)
+        if issue_key in STATE.active_pod_issues and STATE.issue_active_cycles[issue_key] % ongoing_alert_cycles == 0:
+            _, namespace, name, status = issue_key
             subject = f"ONGOING: Pod '{name}' is still in '{status}'"
-            body = f"The pod '{name}' in '{namespace}' has been in status '{status}' for {ISSUE_ACTIVE_CYCLES[issue_key]} cycles."
-            ALERT_BUFFER.append({"grouping_key": "Ongoing", "subject": subject, "body": body, "severity": "ONGOING"})
+            body = f"The pod '{name}' in '{namespace}' has been in status '{status}' for {STATE.issue_active_cycles[issue_key]} cycles."
+            yield Alert("Ongoing", subject, body, "ONGOING")
 
-    for issue_key in new_issues:
-        _, namespace, name, status = issue_key.split('/')
-        subject = f"Pod '{name}' is in '{status}' state"
-        body = f"A new pod failure has been detected.\nPod: {name}\nNamespace: {namespace}\nStatus: {status}"
-        ALERT_BUFFER.append({"grouping_key": f"Pod Failure:{namespace}", "subject": subject, "body": body, "severity": "ALERT"})
-        ACTIVE_POD_ISSUES.add(issue_key)
+    yield from _pod_status_transitions(new_issues, resolved_issues, pods)
 
-    for issue_key in resolved_issues:
-        _, namespace, name, old_status = issue_key.split('/')
-        current_status = next((p['status'] for p in pods if p['name'] == name and p['namespace'] == namespace), "Unknown")
-        subject = f"RESOLVED: Pod '{name}' is no longer in '{old_status}'"
-        body = f"Pod '{name}' in '{namespace}' has recovered.\nPrevious Status: {old_status}\nCurrent Status: {current_status}"
-        ALERT_BUFFER.append({"grouping_key": "Resolved", "subject": subject, "body": body, "severity": "RESOLVED"})
-        ACTIVE_POD_ISSUES.remove(issue_key)
-        ISSUE_ACTIVE_CYCLES.pop(issue_key, None)
+# --- Log Fetching ---
+# Each log read is an independent blocking GET, so they are issued on a shared
+# thread pool of 'log_fetch_parallelism' workers instead of one after another.
+DEFAULT_LOG_FETCH_PARALLELISM = 16
+_LOG_FETCH_POOL = None
+_LOG_FETCH_POOL_SIZE = 0
 
-def check_pod_logs(core_v1_api, config, interval_seconds):
-    global ACTIVE_LOG_ALERTS, LOG_MONITOR_STATE, ISSUE_ACTIVE_CYCLES, ALERT_BUFFER
+def _log_fetch_pool(config):
+    """
+    Returns the log fetch pool, recreating it if the configured size changed.
+    Called once per cycle before the log checks start, so a pool is never
+    replaced while a check is submitting to it.
+    """
+    global _LOG_FETCH_POOL, _LOG_FETCH_POOL_SIZE
+    size = max(1, int(config.get('log_fetch_parallelism', DEFAULT_LOG_FETCH_PARALLELISM)))
+    if _LOG_FETCH_POOL is None or size != _LOG_FETCH_POOL_SIZE:
+        if _LOG_FETCH_POOL is not None:
+            _LOG_FETCH_POOL.shutdown(wait=False)
+        _LOG_FETCH_POOL = ThreadPoolExecutor(max_workers=size, thread_name_prefix="log-fetch")
+        _LOG_FETCH_POOL_SIZE = size
+    return _LOG_FETCH_POOL
+
+def _fetch_logs(core_v1_api, pool, containers, per_container_kwargs=None, **log_kwargs):
+    """
+    Fetches the logs of (namespace, pod_name, container_name) tuples concurrently,
+    yielding ((namespace, pod_name, container_name), logs) as each one completes.
+    per_container_kwargs optionally maps a tuple to read options overriding log_kwargs.
+    """
+    per_container_kwargs = per_container_kwargs or {}
+    futures = {}
+    for key in containers:
+        namespace, pod_name, container_name = key
+        kwargs = {**log_kwargs, **per_container_kwargs[key]} if key in per_container_kwargs else log_kwargs
+        futures[pool.submit(k8s_actions.get_pod_logs, core_v1_api, namespace, pod_name, container=container_name, **kwargs)] = key
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+def check_pod_logs(core_v1_api, ctx, config, interval_seconds, pool):
     log_config = config.get('pod_log_monitoring', {})
     if not log_config.get('enabled'): return
 
     print("K8s Watcher: Checking pod logs...")
+    now = time.monotonic() # One timestamp for every match and window in this cycle
     for target in log_config.get('targets', []):
         target_name = target.get('name', 'Unnamed Target')
-        time_window = _parse_time_window(target.get('time_window', '10m'))
-        if target_name not in LOG_MONITOR_STATE: LOG_MONITOR_STATE[target_name] = []
+        window_seconds = target.get('time_window_seconds') or _parse_time_window_seconds(target.get('time_window', '10m'))
+        match_times = STATE.log_monitor_state.setdefault(target_name, deque())
+        error_set = target.get('error_pattern_set') or _compile_pattern_set(tuple(target.get('error_patterns') or ()))
 
         try:
-            pod_list = core_v1_api.list_namespaced_pod(target.get('namespace', 'default'), label_selector=target.get('label_selector', '')).items
-            for pod in pod_list:
-                if pod.status.phase != 'Running': continue
-                for container in pod.spec.containers:
-                    logs = k8s_actions.get_pod_logs(core_v1_api, pod.metadata.namespace, pod.metadata.name, container=container.name, since_seconds=interval_seconds)
-                    if logs:
-                        for line in logs.split('\n'):
-                            if line and any(re.search(p, line, re.IGNORECASE) for p in target.get('error_patterns', [])):
-                                LOG_MONITOR_STATE[target_name].append(datetime.now())
-                                break
+            target_namespace = target.get('namespace', 'default')
+            label_selector = target.get('label_selector', '')
+            selector = _parse_equality_selector(label_selector)
+            if selector is None:
+                # Set-based selectors are left to the API server
+                pod_list = core_v1_api.list_namespaced_pod(target_namespace, label_selector=label_selector).items
+            else:
+                pod_list = [pod for pod in ctx.pods_by_ns.get(target_namespace, ())
+                            if k8s_actions._labels_match(pod.metadata.labels or {}, selector)]
+            containers = [(pod.metadata.namespace, pod.metadata.name, container.name)
+                          for pod in pod_list if pod.status.phase == 'Running'
+                          for container in pod.spec.containers]
+            for _, logs in _fetch_logs(core_v1_api, pool, containers, since_seconds=interval_seconds):
+                if logs and any(line != '\n' and _first_match(error_set, line.rstrip('\n')) for line in io.StringIO(logs)):
+                    match_times.append(now)
         except Exception as e:
             print(f"K8s Watcher Warning: Could not process logs for target '{target_name}': {e}")
             continue
         
-        now = datetime.now()
-        LOG_MONITOR_STATE[target_name] = [ts for ts in LOG_MONITOR_STATE[target_name] if now - ts < time_window]
+        # Match times are appended in order, so expired ones are always at the left
+        while match_times and now - match_times[0] >= window_seconds:
+            match_times.popleft()
         
-        error_count = len(LOG_MONITOR_STATE[target_name])
+        error_count = len(match_times)
         threshold = target.get('threshold', 1)
         is_breached = error_count >= threshold
-        is_alerting = target_name in ACTIVE_LOG_ALERTS
+        is_alerting = target_name in STATE.active_log_alerts
 
         if is_breached and not is_alerting:
             subject = f"Log threshold breached for '{target_name}'"
             body = f"Error threshold breached for '{target_name}'.\nCount: {error_count} errors in the last {target.get('time_window', '10m')}."
-            ALERT_BUFFER.append({"grouping_key": f"Log Alert:{target_name}", "subject": subject, "body": body, "severity": "ALERT"})
-            ACTIVE_LOG_ALERTS.add(target_name)
+            yield Alert(f"Log Alert:{target_name}", subject, body, "ALERT")
+            _activate_issue(STATE.active_log_alerts, target_name)
         elif not is_breached and is_alerting:
             subject = f"RESOLVED: Log threshold for '{target_name}' is back to normal"
             body = f"The error rate for '{target_name}' has fallen below the threshold.\nCurrent Count: {error_count}."
-            ALERT_BUFFER.append({"grouping_key": "Resolved", "subject": subject, "body": body, "severity": "RESOLVED"})
-            ACTIVE_LOG_ALERTS.remove(target_name)
+            yield Alert("Resolved", subject, body, "RESOLVED")
+            _resolve_issue(STATE.active_log_alerts, target_name)
 
-def check_all_pod_logs(core_v1_api, config):
+def check_all_pod_logs(core_v1_api, ctx, config, pool):
     """
     Scans the latest logs of all pods for predefined error and warning patterns.
     """
-    global ACTIVE_GLOBAL_POD_LOG_ALERTS, ALERT_BUFFER, ISSUE_ACTIVE_CYCLES
     global_log_config = config.get('global_pod_log_scanning', {})
     if not global_log_config.get('enabled'): return
 
     print("K8s Watcher: Checking all pod logs for errors/warnings...")
     
     lines_to_scan = global_log_config.get('lines_to_scan', 100)
-    error_patterns = [re.compile(p, re.IGNORECASE) for p in global_log_config.get('error_patterns', [])]
-    warning_patterns = [re.compile(p, re.IGNORECASE) for p in global_log_config.get('warning_patterns', [])]
+    error_set = global_log_config.get('error_pattern_set') or _compile_pattern_set(tuple(global_log_config.get('error_patterns') or ()))
+    warning_set = global_log_config.get('warning_pattern_set') or _compile_pattern_set(tuple(global_log_config.get('warning_patterns') or ()))
     include_namespaces = global_log_config.get('include_namespaces', [])
     exclude_namespaces = global_log_config.get('exclude_namespaces', [])
     ongoing_alert_cycles = config.get('ongoing_alert_cycles', 20)
+    resolve_after_quiet_cycles = max(1, global_log_config.get('resolve_after_quiet_cycles', 3))
 
-    all_pods = core_v1_api.list_pod_for_all_namespaces().items
+    containers = []
+    scan_rvs = {}
     current_log_issues = set()
 
-    for pod in all_pods:
+    # Apply include/exclude logic per namespace, so pods of skipped namespaces are never visited
+    excluded = set(exclude_namespaces or ())
+    namespaces = include_namespaces if include_namespaces else ctx.pods_by_ns.keys()
+    pods = itertools.chain.from_iterable(
+        ctx.pods_by_ns.get(ns, ()) for ns in dict.fromkeys(namespaces) if ns not in excluded
+    )
+
+    for pod in pods:
         namespace = pod.metadata.namespace
         pod_name = pod.metadata.name
-        
-        # Apply include/exclude logic
-        if include_namespaces and namespace not in include_namespaces:
-            continue
-        if exclude_namespaces and namespace in exclude_namespaces:
-            continue
 
         if pod.status.phase != 'Running': continue # Only check running pods
 
+        rv = pod.metadata.resource_version
+        statuses = pod.status.container_statuses
+        running = None if statuses is None else {s.name for s in statuses if s.state and s.state.running}
         for container in pod.spec.containers:
-            container_name = container.name
-            logs = k8s_actions.get_pod_logs(core_v1_api, namespace, pod_name, container=container_name, tail_lines=lines_to_scan)
-            
-            if not logs: continue
-
-            for line in logs.split('\n'):
-                if not line: continue
-
-                # Check for errors
-                for pattern in error_patterns:
-                    if pattern.search(line):
-                        issue_key = f"global_pod_log_error/{namespace}/{pod_name}/{container_name}"
-                        current_log_issues.add(issue_key)
-                        
-                        # Handle new error alerts
-                        if issue_key not in ACTIVE_GLOBAL_POD_LOG_ALERTS:
-                            subject = f"ERROR in Pod Log: {pod_name}/{container_name}"
-                            body = (f"An error pattern was found in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
-                                    f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'")
-                            ALERT_BUFFER.append({"grouping_key": f"Global Pod Log Error:{namespace}", "subject": subject, "body": body, "severity": "ALERT"})
-                            ACTIVE_GLOBAL_POD_LOG_ALERTS.add(issue_key)
-                        
-                        # Handle ongoing error alerts
-                        elif ISSUE_ACTIVE_CYCLES.get(issue_key, 0) > 0 and (ISSUE_ACTIVE_CYCLES[issue_key] % ongoing_alert_cycles == 0):
-                            subject = f"ONGOING ERROR in Pod Log: {pod_name}/{container_name}"
-                            body = (f"An error pattern persists in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
-                                    f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'\n"
-                                    f"This issue has been ongoing for {ISSUE_ACTIVE_CYCLES[issue_key]} cycles.")
-                            ALERT_BUFFER.append({"grouping_key": f"Global Pod Log Ongoing Error:{namespace}", "subject": subject, "body": body, "severity": "ONGOING"})
-                        break # Found an error, move to next line/pattern
-
-                # Check for warnings (only if no error was found in this line)
-                else: # This 'else' belongs to the 'for pattern in error_patterns' loop
-                    for pattern in warning_patterns:
-                        if pattern.search(line):
-                            issue_key = f"global_pod_log_warning/{namespace}/{pod_name}/{container_name}"
-                            current_log_issues.add(issue_key)
-                            
-                            # Handle new warning alerts
-                            if issue_key not in ACTIVE_GLOBAL_POD_LOG_ALERTS:
-                                subject = f"WARNING in Pod Log: {pod_name}/{container_name}"
-                                body = (f"A warning pattern was found in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
-                                        f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'")
-                                ALERT_BUFFER.append({"grouping_key": f"Global Pod Log Warning:{namespace}", "subject": subject, "body": body, "severity": "ALERT"}) # Changed to ALERT for initial
-                                ACTIVE_GLOBAL_POD_LOG_ALERTS.add(issue_key)
-                            
-                            # Handle ongoing warning alerts
-                            elif ISSUE_ACTIVE_CYCLES.get(issue_key, 0) > 0 and (ISSUE_ACTIVE_CYCLES[issue_key] % ongoing_alert_cycles == 0):
-                                subject = f"ONGOING WARNING in Pod Log: {pod_name}/{container_name}"
-                                body = (f"A warning pattern persists in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
-                                        f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'\n"
-                                        f"This issue has been ongoing for {ISSUE_ACTIVE_CYCLES[issue_key]} cycles.")
-                                ALERT_BUFFER.append({"grouping_key": f"Global Pod Log Ongoing Warning:{namespace}", "subject": subject, "body": body, "severity": "ONGOING"})
-                            break # Found a warning, move to next line/pattern
-    
-    # Update ISSUE_ACTIVE_CYCLES for current log issues
+            key = (namespace, pod_name, container.name)
+            scan_rvs[key] = rv
+            # A container that is not running writes nothing new, and while the pod is
+            # unchanged it cannot have restarted; skip it unless an alert awaits resolution.
+            if (running is not None and container.name not in running and STATE.last_scan_rv.get(key) == rv
+                    and IssueKey("global_pod_log_error", *key) not in STATE.active_global_pod_log_alerts
+                    and IssueKey("global_pod_log_warning", *key) not in STATE.active_global_pod_log_alerts):
+                continue
+            containers.append(key)
+
+    # Containers scanned before only need the lines written since then (still capped
+    # at lines_to_scan); new ones start from the last lines_to_scan lines.
+    now = time.monotonic()
+    since = {key: {'since_seconds': max(1, math.ceil(now - STATE.last_log_scan_time[key]))}
+             for key in containers if key in STATE.last_log_scan_time}
+    # Forget containers that are gone; skipped ones keep their last scan time
+    STATE.last_log_scan_time = {key: STATE.last_log_scan_time[key] for key in scan_rvs if key in STATE.last_log_scan_time}
+    STATE.last_scan_rv = scan_rvs
+    scanned = set()
+
+    for key, logs in _fetch_logs(core_v1_api, pool, containers, since, tail_lines=lines_to_scan):
+        # A failed read leaves the scan time alone, so the next cycle reads this window again
+        if logs and logs.startswith(k8s_actions.LOG_FETCH_ERROR_PREFIX):
+            print(f"K8s Watcher: {logs}")
+            continue
+        STATE.last_log_scan_time[key] = now
+        scanned.add(key)
+        if not logs: continue
+        namespace, pod_name, container_name = key
+
+        for line, pattern, is_error in _scan_log(logs, error_set, warning_set):
+            # Check for errors
+            if is_error:
+                issue_key = IssueKey("global_pod_log_error", namespace, pod_name, container_name)
+                if issue_key not in current_log_issues:
+                    current_log_issues.add(issue_key)
+                    _count_cycle(issue_key) # Once per cycle, before the ongoing check below
+                
+                # Handle new error alerts
+                if issue_key not in STATE.active_global_pod_log_alerts:
+                    subject = f"ERROR in Pod Log: {pod_name}/{container_name}"
+                    body = (f"An error pattern was found in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
+                            f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'")
+                    yield Alert(f"Global Pod Log Error:{namespace}", subject, body, "ALERT")
+                    _activate_issue(STATE.active_global_pod_log_alerts, issue_key)
+                
+                # Handle ongoing error alerts
+                elif STATE.issue_active_cycles[issue_key] % ongoing_alert_cycles == 0:
+                    subject = f"ONGOING ERROR in Pod Log: {pod_name}/{container_name}"
+                    body = (f"An error pattern persists in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
+                            f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'\n"
+                            f"This issue has been ongoing for {STATE.issue_active_cycles[issue_key]} cycles.")
+                    yield Alert(f"Global Pod Log Ongoing Error:{namespace}", subject, body, "ONGOING")
+
+            # Check for warnings (only if no error was found in this line)
+            else:
+                issue_key = IssueKey("global_pod_log_warning", namespace, pod_name, container_name)
+                if issue_key not in current_log_issues:
+                    current_log_issues.add(issue_key)
+                    _count_cycle(issue_key) # Once per cycle, before the ongoing check below
+                
+                # Handle new warning alerts
+                if issue_key not in STATE.active_global_pod_log_alerts:
+                    subject = f"WARNING in Pod Log: {pod_name}/{container_name}"
+                    body = (f"A warning pattern was found in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
+                            f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'")
+                    yield Alert(f"Global Pod Log Warning:{namespace}", subject, body, "ALERT") # Changed to ALERT for initial
+                    _activate_issue(STATE.active_global_pod_log_alerts, issue_key)
+                
+                # Handle ongoing warning alerts
+                elif STATE.issue_active_cycles[issue_key] % ongoing_alert_cycles == 0:
+                    subject = f"ONGOING WARNING in Pod Log: {pod_name}/{container_name}"
+                    body = (f"A warning pattern persists in the logs of pod '{pod_name}' (container '{container_name}') in namespace '{namespace}'.\n"
+                            f"Pattern: '{pattern.pattern}'\nLog Line: '{line}'\n"
+                            f"This issue has been ongoing for {STATE.issue_active_cycles[issue_key]} cycles.")
+                    yield Alert(f"Global Pod Log Ongoing Warning:{namespace}", subject, body, "ONGOING")
+
+    # Handle resolved global pod log issues. Only the lines written since the last scan are
+    # read, so an issue resolves once its container has been quiet for resolve_after_quiet_cycles
+    # successful scans, or at once when the container is no longer scanned.
     for issue_key in current_log_issues:
-        ISSUE_ACTIVE_CYCLES[issue_key] = ISSUE_ACTIVE_CYCLES.get(issue_key, 0) + 1
-
-    # Handle resolved global pod log issues
-    resolved_log_issues = ACTIVE_GLOBAL_POD_LOG_ALERTS - current_log_issues
+        STATE.global_log_quiet_cycles.pop(issue_key, None)
+    resolved_log_issues = []
+    for issue_key in STATE.active_global_pod_log_alerts - current_log_issues:
+        container_key = issue_key[1:]
+        if container_key in scan_rvs:
+            if container_key not in scanned: continue # Read failed; not evidence of quiet
+            STATE.global_log_quiet_cycles[issue_key] += 1
+            if STATE.global_log_quiet_cycles[issue_key] < resolve_after_quiet_cycles: continue
+        resolved_log_issues.append(issue_key)
     for issue_key in resolved_log_issues:
-        _, namespace, pod_name, container_name = issue_key.split('/')[:4]
-        issue_type = "Error" if "error" in issue_key else "Warning"
+        STATE.global_log_quiet_cycles.pop(issue_key, None)
+        _, namespace, pod_name, container_name = issue_key
+        issue_type = "Error" if issue_key.kind == "global_pod_log_error" else "Warning"
         subject = f"RESOLVED: {issue_type} in Pod Log: {pod_name}/{container_name}"
         body = f"The {issue_type.lower()} issue in logs for pod '{pod_name}' (container '{container_name}') in namespace '{namespace}' has been resolved."
-        ALERT_BUFFER.append({"grouping_key": "Resolved", "subject": subject, "body": body, "severity": "RESOLVED"})
-        ACTIVE_GLOBAL_POD_LOG_ALERTS.remove(issue_key)
-        ISSUE_ACTIVE_CYCLES.pop(issue_key, None) # Remove from active cycles when resolved
+        yield Alert("Resolved", subject, body, "RESOLVED")
+        _resolve_issue(STATE.active_global_pod_log_alerts, issue_key)
 
 
 def check_network_paths(config):
-    global ACTIVE_NETWORK_PATH_ISSUES, ALERT_BUFFER
     network_config = config.get('network_path_monitoring', {})
     if not network_config.get('enabled'): return
 
@@ -451,23 +788,93 @@ def check_network_paths(config):
 
     print(f"K8s Watcher: Checking network path accessibility for '{path_to_monitor}'...")
     is_accessible, message = host_actions.check_path_accessibility(path_to_monitor)
-    issue_key = f"network_path/{path_to_monitor}"
+    issue_key = IssueKey("network_path", None, path_to_monitor, None)
 
     if not is_accessible:
-        if issue_key not in ACTIVE_NETWORK_PATH_ISSUES:
+        if issue_key not in STATE.active_network_path_issues:
             subject = f"Network Path Inaccessible - '{path_to_monitor}'"
             body = f"The path '{path_to_monitor}' is inaccessible.\nReason: {message}"
-            ALERT_BUFFER.append({"grouping_key": "Network Path Failure", "subject": subject, "body": body, "severity": "ALERT"})
-            ACTIVE_NETWORK_PATH_ISSUES.add(issue_key)
+            yield Alert("Network Path Failure", subject, body, "ALERT")
+            _activate_issue(STATE.active_network_path_issues, issue_key)
     else:
-        if issue_key in ACTIVE_NETWORK_PATH_ISSUES:
+        if issue_key in STATE.active_network_path_issues:
             subject = f"RESOLVED: Network Path Accessible - '{path_to_monitor}'"
             body = f"The path '{path_to_monitor}' is now accessible."
-            ALERT_BUFFER.append({"grouping_key": "Resolved", "subject": subject, "body": body, "severity": "RESOLVED"})
-            ACTIVE_NETWORK_PATH_ISSUES.remove(issue_key)
+            yield Alert("Resolved", subject, body, "RESOLVED")
+            _resolve_issue(STATE.active_network_path_issues, issue_key)
+
+def _collect_alerts(check_fn, *args):
+    return list(check_fn(*args))
+
+async def _run_io_checks(checks):
+    """
+    Runs the blocking (check_fn, args) pairs concurrently on the default executor,
+    so a cycle waits for the slowest of them rather than their sum. Returns their
+    alerts as one list per check.
+    """
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(None, functools.partial(_collect_alerts, check_fn, *args)) for check_fn, args in checks),
+        return_exceptions=True,
+    )
+    for i, ((check_fn, _), result) in enumerate(zip(checks, results)):
+        if isinstance(result, Exception):
+            print(f"K8s Watcher Warning: {check_fn.__name__} failed: {result}")
+            results[i] = []
+    return results
+
+def _changed_pod_alerts(pod_informer, pod_keys, config):
+    """Re-evaluates pod status issues for just the given (namespace, name) pods."""
+    alert_statuses = config.get('pod_alert_statuses', [])
+    if not alert_statuses or not pod_keys: return
+
+    pods = k8s_actions._build_pods_info(filter(None, (pod_informer.get(*key) for key in pod_keys)), {})
+    current_issues = {issue_key for issue_key in (_pod_issue_key(pod, alert_statuses) for pod in pods) if issue_key}
+    with STATE.lock:
+        previous_issues = {issue_key for issue_key in STATE.active_pod_issues if (issue_key.namespace, issue_key.name) in pod_keys}
+    yield from _pod_status_transitions(current_issues - previous_issues, previous_issues - current_issues, pods)
+
+def _changed_deployment_alerts(deployment_informer, deployment_keys, config):
+    """
+    Re-evaluates health issues for just the given (namespace, name) deployments.
+    Unavailable replicas must persist for 'unavailable_replicas_grace_seconds'
+    before they alert from here, so an ordinary rollout or scale-up stays quiet.
+    """
+    deploy_config = config.get('deployment_health_monitoring', {})
+    if not deploy_config.get('enabled') or not deployment_keys: return
+
+    grace_seconds = deploy_config.get('unavailable_replicas_grace_seconds', DEFAULT_UNAVAILABLE_GRACE_SECONDS)
+    current_issues = set()
+    now = time.monotonic()
+    for namespace, name in deployment_keys:
+        dep = deployment_informer.get(namespace, name)
+        if dep is not None:
+            yield from _deployment_alerts(dep, deploy_config, now, current_issues, unavailable_grace_seconds=grace_seconds)
+        else:
+            STATE.deployment_unavailable_since.pop(IssueKey("deployment_unavailable", namespace, name, None), None)
+            STATE.deployment_rollout_state.pop(IssueKey("deployment_stuck", namespace, name, None), None)
+    with STATE.lock:
+        previous_issues = {issue_key for issue_key in STATE.active_deployment_issues if (issue_key.namespace, issue_key.name) in deployment_keys}
+    yield from _resolve_deployment_issues(previous_issues - current_issues)
+
+def run_event_checks(core_v1_api, apps_v1_api, changed_keys):
+    """
+    Re-evaluates pod status and deployment health for only the objects in
+    changed_keys ((kind, namespace, name) from k8s_informers.wait_for_change),
+    for use between full cycles. Only full cycles advance ONGOING cycle counts.
+    """
+    config, error = _load_watcher_config()
+    if error or not config:
+        return
+    pod_keys = {(namespace, name) for kind, namespace, name in changed_keys if kind == "Pod"}
+    deployment_keys = {(namespace, name) for kind, namespace, name in changed_keys if kind == "Deployment"}
+    alerts = itertools.chain(
+        _changed_pod_alerts(k8s_informers.start_pod_informer(core_v1_api), pod_keys, config),
+        _changed_deployment_alerts(k8s_informers.start_deployment_informer(apps_v1_api), deployment_keys, config),
+    )
+    alerter.process_and_send_notifications(unique_alerts(alerts), alert_action=config.get('default_alert_action', 'email'))
 
 def run_k8s_checks(core_v1_api, apps_v1_api, custom_objects_api):
-    global ALERT_BUFFER
     config, error = _load_watcher_config()
     if error:
         print(f"K8s Watcher Error: {error}")
@@ -479,18 +886,29 @@ def run_k8s_checks(core_v1_api, apps_v1_api, custom_objects_api):
     interval = config.get('watcher_interval_seconds', 60)
     default_alert_action = config.get('default_alert_action', 'email')
 
-    # Clear buffer at the start of each cycle
-    ALERT_BUFFER = []
-
-    # Run all checks, which will now populate the ALERT_BUFFER
-    check_pod_statuses(core_v1_api, custom_objects_api, config)
-    check_pod_logs(core_v1_api, config, interval)
-    check_all_pod_logs(core_v1_api, config) # New global pod log monitoring
-    check_network_paths(config)
-    check_resource_usage(core_v1_api, custom_objects_api, config)
-    check_deployment_health(core_v1_api, apps_v1_api, custom_objects_api, config)
-    check_metrics_server_status(custom_objects_api, config) # Check metrics server status
-
-    # Process the buffer to group and send alerts
-    if ALERT_BUFFER:
-        alerter.process_and_send_notifications(ALERT_BUFFER, alert_action=default_alert_action)
\ No newline at end of file
+    try:
+        ctx = build_check_context(core_v1_api, apps_v1_api, custom_objects_api)
+    except k8s_actions.client.ApiException as e:
+        print(f"K8s Watcher Error: Could not read cluster state: {e}")
+        return
+
+    # These wait on pod logs or the network, so they run concurrently.
+    # Each owns its own issue keys, so they do not race on the shared state.
+    log_pool = _log_fetch_pool(config)
+    io_alerts = asyncio.run(_run_io_checks([
+        (check_pod_logs, (core_v1_api, ctx, config, interval, log_pool)),
+        (check_all_pod_logs, (core_v1_api, ctx, config, log_pool)), # New global pod log monitoring
+        (check_network_paths, (config,)),
+    ]))
+
+    # The remaining checks only read the context gathered above; their alerts are
+    # generated as the alerter consumes the stream, so a cycle's alerts are never
+    # all held in memory at once.
+    alerts = itertools.chain(
+        check_pod_statuses(ctx, config),
+        check_resource_usage(ctx, config),
+        check_deployment_health(ctx, config),
+        check_metrics_server_status(ctx, config), # Check metrics server status
+        *io_alerts,
+    )
+    alerter.process_and_send_notifications(unique_alerts(alerts), alert_action=default_alert_action)
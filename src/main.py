@@ -1,7 +1,15 @@
+import os
+import re
 import sys
+import queue
+import codecs
+import select
 import argparse
 import atexit
 import signal
+import threading
+import contextlib
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -13,8 +21,10 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm, IntPrompt
 from rich.syntax import Syntax
+from rich.text import Text
+from rich.highlighter import ReprHighlighter
 from rich.live import Live
-from . import k8s_actions, host_actions, watcher, alerter
+from . import k8s_actions, k8s_informers, host_actions, watcher, alerter
 
 def signal_handler(sig, frame):
     """Handles termination signals for graceful shutdown and logging."""
@@ -22,44 +32,132 @@ def signal_handler(sig, frame):
     alerter.log_program_termination()
     sys.exit(0)
 
+# The menu is static, so its markup is parsed and highlighted once (as console.print
+# would for a str each time) and printed with a single write
+_MENU_TEXT = ReprHighlighter()(Text.from_markup("\n" + "\n".join([
+    "[bold cyan]Unified Monitor[/bold cyan]",
+    "---[ Kubernetes ]---",
+    "1. Dashboard",
+    "2. View Node Information",
+    "3. List All Namespaces",
+    "4. View Services",
+    "5. Stream Cluster Events",
+    "6. View Resource Quotas",
+    "7. View Pod Status & Usage",
+    "8. View Deployment Status & Usage",
+    "9. View Pod Logs",
+    "10. Open Interactive Pod Shell",
+    "11. Scale a Deployment",
+    "12. Edit a Deployment",
+    "13. View Persistent Volumes",
+    "14. View Persistent Volume Claims",
+    "15. View ConfigMaps",
+    "16. View Secrets",
+    "17. View Resource YAML",
+    "18. Describe K8s Resource",
+    "---[ Host Monitoring ]---",
+    "19. View Host Resource Usage",
+    "20. View Process Explorer",
+    "21. View Docker Containers",
+    "22. View Host System Logs",
+    "23. View Network Stats",
+    "---[ System ]---",
+    "24. Exit"
+])))
+_MENU_CHOICES = tuple(str(i) for i in range(1, 25))
+_EXIT_CHOICE = "24"
+
+# Prompt texts and fixed choice sets shared by the views
+_NAMESPACE_PROMPT = "Enter namespace ('all' for all, press Enter for 'default')"
+_RESOURCE_TYPE_CHOICES = ("Pod", "Deployment", "Node", "Service")
+_PROCESS_SORT_CHOICES = ("cpu", "memory")
+_DEPLOYMENT_EDIT_CHOICES = ("Container Image", "Resource Limits/Requests")
+_CONTAINER_INDEX_PROMPT = "Choose a container number to edit"
+
 def show_menu(console):
     """Displays the main menu."""
-    console.print("\n[bold cyan]Unified Monitor[/bold cyan]")
-    console.print("---[ Kubernetes ]---")
-    console.print("1. Dashboard")
-    console.print("2. View Node Information")
-    console.print("3. List All Namespaces")
-    console.print("4. View Services")
-    console.print("5. Stream Cluster Events")
-    console.print("6. View Resource Quotas")
-    console.print("7. View Pod Status & Usage")
-    console.print("8. View Deployment Status & Usage")
-    console.print("9. View Pod Logs")
-    console.print("10. Open Interactive Pod Shell")
-    console.print("11. Scale a Deployment")
-    console.print("12. Edit a Deployment")
-    console.print("13. View Persistent Volumes")
-    console.print("14. View Persistent Volume Claims")
-    console.print("15. View ConfigMaps")
-    console.print("16. View Secrets")
-    console.print("17. View Resource YAML")
-    console.print("18. Describe K8s Resource")
-    console.print("---[ Host Monitoring ]---")
-    console.print("19. View Host Resource Usage")
-    console.print("20. View Process Explorer")
-    console.print("21. View Docker Containers")
-    console.print("22. View Host System Logs")
-    console.print("23. View Network Stats")
-    console.print("---[ System ]---")
-    console.print("24. Exit")
-    return Prompt.ask("[bold]Choose an option[/bold]", choices=[str(i) for i in range(1, 25)], default="1")
+    console.print(_MENU_TEXT)
+    return Prompt.ask("[bold]Choose an option[/bold]", choices=_MENU_CHOICES, default="1")
 
 from rich.layout import Layout
 from rich.live import Live
 import time
-
-def generate_dashboard_layout(core_v1_api, apps_v1_api, custom_objects_api):
-    """Generates the layout for the dashboard."""
+import heapq
+import operator
+import yaml
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+try:
+    import termios
+    import tty
+except ImportError: # Windows; keys are read through msvcrt instead
+    termios = None
+    import msvcrt
+
+try:
+    # libyaml-backed emitter, much faster when available
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
+DASHBOARD_FETCH_TIMEOUT_SECONDS = 1.5
+DASHBOARD_REFRESH_SECONDS = 2
+DASHBOARD_MAX_REFRESH_SECONDS = 10 # Interval ceiling while nothing shown is changing
+
+# Byte-unit reciprocals, so sizes are scaled with a multiply instead of a division.
+# Dashboard cells are also %-formatted, the cheaper path for floats than f-string specs.
+_PER_KIB = 1.0 / 1024
+_PER_MIB = 1.0 / 1024**2
+_PER_GIB = 1.0 / 1024**3
+# Host utilization, nodes, workloads and events are fetched concurrently each tick
+_DASHBOARD_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+
+def _build_table(columns, rows=(), **table_kwargs):
+    """Builds a Table from (header, add_column keyword arguments) pairs and row tuples."""
+    table = Table(**table_kwargs)
+    for header, options in columns:
+        table.add_column(header, **options)
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+@dataclass
+class TableSlot:
+    """
+    Holds a dashboard table's place in its panel or layout. Rich renders whatever
+    `table` currently is, so new rows are shown by swapping in a freshly built Table.
+    """
+    columns: tuple
+    table_kwargs: dict
+    table: Table = None
+
+    def __post_init__(self):
+        self.fill(())
+
+    def fill(self, rows):
+        self.table = _build_table(self.columns, rows, **self.table_kwargs)
+
+    def __rich__(self):
+        return self.table
+
+@dataclass
+class Dashboard:
+    """The dashboard's layout and table slots, built once; a table is rebuilt only when its rows change."""
+    layout: Layout
+    tables: dict
+    panels: dict
+    shown_rows: dict = field(default_factory=dict)
+    pending: dict = field(default_factory=dict)
+    changed: bool = False # Set when a refresh altered anything shown; cleared by the caller once drawn
+
+def _dashboard_panel(dashboard, name, content, border_style, title=None):
+    panel = Panel(content, title=title, border_style=border_style)
+    dashboard.panels[name] = (panel, content, border_style)
+    dashboard.layout[name].update(panel)
+
+def build_dashboard():
+    """Builds the dashboard layout, panels and (empty) tables."""
     layout = Layout()
 
     layout.split(
@@ -76,110 +174,197 @@ def generate_dashboard_layout(core_v1_api, apps_v1_api, custom_objects_api):
     layout["header"].update("[bold cyan]Unified Monitor Dashboard[/bold cyan]")
     layout["footer"].update("[dim]Press Ctrl+C to exit. For more details, use other menu options.[/dim]")
 
+    host_table = TableSlot((("", {}), ("", {})), dict(title="Host Status", show_header=False, box=None))
+
+    node_table = TableSlot(
+        (("Name", {}), ("Status", {}), ("Roles", {})),
+        dict(title="Cluster Nodes", box=None),
+    )
+
+    dep_table = TableSlot((
+        ("Name", dict(style="cyan")),
+        ("Replicas", dict(style="green")),
+        ("CPU (cores)", dict(style="magenta", justify="right")),
+        ("Memory (MiB)", dict(style="red", justify="right")),
+    ), dict(title="Deployments", show_header=True, box=None))
+
+    pod_table = TableSlot((
+        ("Name", dict(style="cyan", overflow="elide")),
+        ("Status", dict(style="magenta")),
+        ("CPU", dict(style="yellow", justify="right")),
+        ("Memory", dict(style="red", justify="right")),
+    ), dict(title="Top 10 Pods by Memory", show_header=True, box=None))
+
+    event_table = TableSlot((
+        ("Time", dict(style="cyan")),
+        ("Type", dict(style="magenta")),
+        ("Reason", dict(style="yellow")),
+        ("Object", dict(style="blue")),
+        ("Message", dict(style="green")),
+    ), dict(title="Recent Cluster Events", box=None))
+
+    dashboard = Dashboard(layout, {
+        "host": host_table, "nodes": node_table, "deployments": dep_table, "pods": pod_table, "events": event_table
+    }, {})
+
+    workload_layout = Layout()
+    workload_layout.split_column(Layout(dep_table), Layout(pod_table))
+    _dashboard_panel(dashboard, "host_status", host_table, "green")
+    _dashboard_panel(dashboard, "k8s_status", node_table, "blue")
+    _dashboard_panel(dashboard, "workload_summary", workload_layout, "magenta", title="Workload Summary")
+    _dashboard_panel(dashboard, "events", event_table, "yellow")
+    return dashboard
+
+_DASHBOARD = None # Kept across visits to the dashboard view, so its tables and panels are built only once
+
+def _shared_dashboard():
+    global _DASHBOARD
+    if _DASHBOARD is None:
+        _DASHBOARD = build_dashboard()
+    return _DASHBOARD
+
+def _show_panel(dashboard, name, error=None):
+    """Shows the panel's tables, or the error in their place."""
+    panel, content, border_style = dashboard.panels[name]
+    if error is not None:
+        content, border_style = f"[red]Error: {error}[/red]", "red"
+    if panel.renderable != content or panel.border_style != border_style:
+        panel.renderable = content
+        panel.border_style = border_style
+        dashboard.changed = True
+
+def _set_rows(dashboard, name, rows):
+    """Rebuilds a table with new rows, skipping the work when they are unchanged."""
+    rows = [tuple(row) for row in rows]
+    if dashboard.shown_rows.get(name) == rows:
+        return
+    dashboard.tables[name].fill(rows)
+    dashboard.shown_rows[name] = rows
+    dashboard.changed = True
+
+def _fetch_nodes(core_v1_api):
+    return k8s_actions._build_node_info(k8s_informers.start_node_informer(core_v1_api).snapshot())
+
+def _fetch_workloads(core_v1_api, apps_v1_api, custom_objects_api):
+    # Served from the shared informer caches; metrics are polled on their own slower interval
+    pod_objects = k8s_informers.start_pod_informer(core_v1_api).snapshot()
+    deployment_objects = k8s_informers.start_deployment_informer(apps_v1_api).snapshot()
+    pod_metrics, _ = k8s_informers.start_pod_metrics_poller(custom_objects_api).latest()
+    pods = k8s_actions._build_pods_info(pod_objects, pod_metrics)
+    deployments = k8s_actions._build_deployments_info(deployment_objects, pod_objects, pod_metrics)
+    return pods, deployments
+
+def _fetch_events(core_v1_api):
+    return k8s_informers.start_event_feed(core_v1_api).snapshot()
+
+def _submit_fetch(dashboard, name, fn, *args):
+    """Submits a panel's fetch to the pool, reusing one still running from an earlier tick."""
+    future = dashboard.pending.get(name)
+    if future is None or future.done():
+        future = _DASHBOARD_POOL.submit(fn, *args)
+        dashboard.pending[name] = future
+    return future
+
+def refresh_dashboard(dashboard, core_v1_api, apps_v1_api, custom_objects_api):
+    """
+    Refills the dashboard's tables with the current host and cluster state. A panel
+    whose data is not ready within DASHBOARD_FETCH_TIMEOUT_SECONDS keeps its last rows.
+    """
+    host_future = _submit_fetch(dashboard, "host_status", host_actions.get_resource_utilization)
+    nodes_future = _submit_fetch(dashboard, "k8s_status", _fetch_nodes, core_v1_api)
+    workloads_future = _submit_fetch(
+        dashboard, "workload_summary", _fetch_workloads, core_v1_api, apps_v1_api, custom_objects_api
+    )
+    events_future = _submit_fetch(dashboard, "events", _fetch_events, core_v1_api)
+    deadline = time.monotonic() + DASHBOARD_FETCH_TIMEOUT_SECONDS
+
     # Host Status
     try:
-        util = host_actions.get_resource_utilization()
+        util = host_future.result(timeout=max(0, deadline - time.monotonic()))
         mem = util['memory']
         disk = util['disk_root']
-        host_table = Table(title="Host Status", show_header=False, box=None)
-        host_table.add_row("CPU:", f"{util['cpu_percent']:.1f}%")
-        host_table.add_row("Memory:", f"{mem.percent:.1f}% ({mem.used/1024**3:.2f}GiB / {mem.total/1024**3:.2f}GiB)")
-        host_table.add_row("Disk (/):", f"{disk.percent:.1f}% ({disk.used/1024**3:.2f}GiB / {disk.total/1024**3:.2f}GiB)")
-        layout["host_status"].update(Panel(host_table, border_style="green"))
+        _set_rows(dashboard, "host", [
+            ("CPU:", "%.1f%%" % util['cpu_percent']),
+            ("Memory:", "%.1f%% (%.2fGiB / %.2fGiB)" % (mem.percent, mem.used * _PER_GIB, mem.total * _PER_GIB)),
+            ("Disk (/):", "%.1f%% (%.2fGiB / %.2fGiB)" % (disk.percent, disk.used * _PER_GIB, disk.total * _PER_GIB)),
+        ])
+        _show_panel(dashboard, "host_status")
+    except FutureTimeoutError:
+        pass
     except Exception as e:
-        layout["host_status"].update(Panel(f"[red]Error: {e}[/red]", border_style="red"))
+        _show_panel(dashboard, "host_status", e)
 
     # K8s Node Status
     try:
-        nodes = k8s_actions.get_node_info(core_v1_api)
-        node_table = Table(title="Cluster Nodes", box=None)
-        node_table.add_column("Name")
-        node_table.add_column("Status")
-        node_table.add_column("Roles")
-        for node in nodes:
-            node_table.add_row(node['name'], node['status'], node['roles'])
-        layout["k8s_status"].update(Panel(node_table, border_style="blue"))
+        nodes = nodes_future.result(timeout=max(0, deadline - time.monotonic()))
+        _set_rows(dashboard, "nodes", [(node['name'], node['status'], node['roles']) for node in nodes])
+        _show_panel(dashboard, "k8s_status")
+    except FutureTimeoutError:
+        pass
     except Exception as e:
-        layout["k8s_status"].update(Panel(f"[red]Error: {e}[/red]", border_style="red"))
+        _show_panel(dashboard, "k8s_status", e)
 
     # Workload Summary
     try:
-        pods, _ = k8s_actions.get_pod_status(core_v1_api, custom_objects_api, "all")
-        deployments, _ = k8s_actions.get_deployment_status(core_v1_api, apps_v1_api, custom_objects_api, "all")
+        pods, deployments = workloads_future.result(timeout=max(0, deadline - time.monotonic()))
 
         # --- Deployments Table ---
-        dep_table = Table(title="Deployments", show_header=True, box=None)
-        dep_table.add_column("Name", style="cyan")
-        dep_table.add_column("Replicas", style="green")
-        dep_table.add_column("CPU (cores)", style="magenta", justify="right")
-        dep_table.add_column("Memory (MiB)", style="red", justify="right")
-        
-        if deployments:
-            # Sort deployments by name and limit to 10
-            sorted_deps = sorted(deployments, key=lambda d: d['name'])
-            for dep in sorted_deps[:10]:
-                dep_table.add_row(
-                    dep['name'],
-                    f"{dep['ready_replicas'] or 0}/{dep['replicas'] or 0}",
-                    f"{dep['cpu'] / 1000:.3f}",
-                    f"{dep['memory'] / 1024:.2f}"
-                )
-            if len(deployments) > 10:
-                dep_table.add_row(f"[dim]...and {len(deployments) - 10} more[/dim]", "", "", "")
+        # First 10 deployments by name, without sorting the rest
+        first_deps = heapq.nsmallest(10, deployments, key=operator.itemgetter('name'))
+        dep_rows = [(
+            dep['name'],
+            f"{dep['ready_replicas'] or 0}/{dep['replicas'] or 0}",
+            "%.3f" % (dep['cpu'] * 0.001),
+            "%.2f" % (dep['memory'] * _PER_KIB)
+        ) for dep in first_deps]
+        if len(deployments) > 10:
+            dep_rows.append((f"[dim]...and {len(deployments) - 10} more[/dim]", "", "", ""))
+        _set_rows(dashboard, "deployments", dep_rows)
 
         # --- Pods Table (Top 10 by Memory) ---
-        pod_table = Table(title="Top 10 Pods by Memory", show_header=True, box=None)
-        pod_table.add_column("Name", style="cyan", overflow="elide")
-        pod_table.add_column("Status", style="magenta")
-        pod_table.add_column("CPU", style="yellow", justify="right")
-        pod_table.add_column("Memory", style="red", justify="right")
-
-        if pods:
-            # Sort pods by memory usage, descending
-            sorted_pods = sorted(pods, key=lambda p: k8s_actions.parse_memory_value(p.get('memory', '0')), reverse=True)
-            for pod in sorted_pods[:10]:
-                pod_table.add_row(
-                    pod['name'],
-                    pod['status'],
-                    pod['cpu'],
-                    pod['memory']
-                )
-            if len(pods) > 10:
-                pod_table.add_row(f"[dim]...and {len(pods) - 10} more[/dim]", "", "", "")
-
-        workload_layout = Layout()
-        workload_layout.split_column(Layout(dep_table), Layout(pod_table))
-        layout["workload_summary"].update(Panel(workload_layout, title="Workload Summary", border_style="magenta"))
+        # Select the top 10 by memory usage without sorting every pod
+        top_pods = heapq.nlargest(10, pods, key=operator.attrgetter("memory_bytes"))
+        pod_rows = [(pod.name, pod.status, pod.cpu, pod.memory) for pod in top_pods]
+        if len(pods) > 10:
+            pod_rows.append((f"[dim]...and {len(pods) - 10} more[/dim]", "", "", ""))
+        _set_rows(dashboard, "pods", pod_rows)
+        _show_panel(dashboard, "workload_summary")
+    except FutureTimeoutError:
+        pass
     except Exception as e:
-        layout["workload_summary"].update(Panel(f"[red]Error: {e}[/red]", border_style="red"))
+        _show_panel(dashboard, "workload_summary", e)
 
     # Recent Events
     try:
-        events, error = k8s_actions.get_events(core_v1_api, limit=10)
-        if error:
-            layout["events"].update(Panel(f"[red]Error: {error}[/red]", border_style="red"))
-        else:
-            event_table = Table(title="Recent Cluster Events", box=None)
-            event_table.add_column("Time", style="cyan")
-            event_table.add_column("Type", style="magenta")
-            event_table.add_column("Reason", style="yellow")
-            event_table.add_column("Object", style="blue")
-            event_table.add_column("Message", style="green")
-            for event in events:
-                event_table.add_row(event['last_seen'], event['type'], event['reason'], event['object'], event['message'])
-            layout["events"].update(Panel(event_table, border_style="yellow"))
+        events = events_future.result(timeout=max(0, deadline - time.monotonic()))
+        _set_rows(dashboard, "events", [
+            (event.last_seen, event.type, event.reason, event.object, event.message) for event in events
+        ])
+        _show_panel(dashboard, "events")
+    except FutureTimeoutError:
+        pass
     except Exception as e:
-        layout["events"].update(Panel(f"[red]Error: {e}[/red]", border_style="red"))
+        _show_panel(dashboard, "events", e)
 
-    return layout
+    return dashboard
 
 def display_dashboard(console, core_v1_api, apps_v1_api, custom_objects_api):
     """Displays a live-updating dashboard."""
     try:
-        with Live(generate_dashboard_layout(core_v1_api, apps_v1_api, custom_objects_api), console=console, screen=True, refresh_per_second=4) as live:
+        # The layout is built once; each tick only refills the table rows that changed
+        dashboard = refresh_dashboard(_shared_dashboard(), core_v1_api, apps_v1_api, custom_objects_api)
+        # Redraw only when a refresh changed something, and back off while nothing does
+        with Live(dashboard.layout, console=console, screen=True, auto_refresh=False) as live:
+            interval = DASHBOARD_REFRESH_SECONDS
             while True:
-                time.sleep(2)
-                live.update(generate_dashboard_layout(core_v1_api, apps_v1_api, custom_objects_api))
+                time.sleep(interval)
+                dashboard.changed = False
+                refresh_dashboard(dashboard, core_v1_api, apps_v1_api, custom_objects_api)
+                if dashboard.changed:
+                    live.refresh()
+                    interval = DASHBOARD_REFRESH_SECONDS
+                else:
+                    interval = min(interval * 2, DASHBOARD_MAX_REFRESH_SECONDS)
     except KeyboardInterrupt:
         console.print("\n[yellow]Dashboard stopped. Returning to main menu.[/yellow]")
         return
@@ -226,32 +411,36 @@ def open_pod_shell(console, core_v1_api):
 def display_event_stream(console, core_v1_api):
     """Displays a live stream of cluster events."""
     console.print("\n[bold]Starting real-time event stream... (Press Ctrl+C to stop)[/bold]")
-    
-    table = Table(title="Live Cluster Events")
-    table.add_column("LAST SEEN", style="cyan", no_wrap=True)
-    table.add_column("TYPE", style="magenta")
-    table.add_column("REASON", style="yellow")
-    table.add_column("OBJECT", style="blue")
-    table.add_column("MESSAGE", style="green")
+
+    # The stream only appends rows to a bounded deque (oldest fall off the end); the
+    # table is rebuilt from those rows by Live on each of its 4-per-second refreshes.
+    events = deque(maxlen=20)
+
+    def render_events():
+        table = Table(title="Live Cluster Events")
+        table.add_column("LAST SEEN", style="cyan", no_wrap=True)
+        table.add_column("TYPE", style="magenta")
+        table.add_column("REASON", style="yellow")
+        table.add_column("OBJECT", style="blue")
+        table.add_column("MESSAGE", style="green")
+        for row in events.copy():
+            table.add_row(*row)
+        return table
 
     try:
-        with Live(table, refresh_per_second=4, screen=True, console=console) as live:
+        with Live(get_renderable=render_events, refresh_per_second=4, screen=True, console=console) as live:
             for event in k8s_actions.stream_events(core_v1_api):
                 if "error" in event:
                     live.console.print(f"[bold red]Error in stream: {event['error']}[/bold red]")
                     break
-                
-                # Add event to table, ensuring we don't grow it indefinitely
-                if len(table.rows) > 20:
-                    table.rows.pop(0)
 
-                table.add_row(
+                events.append((
                     event['last_seen'],
                     event['type'],
                     event['reason'],
                     event['object'],
                     event['message']
-                )
+                ))
     except KeyboardInterrupt:
         # The 'with' context will handle stopping the live display
         pass
@@ -262,7 +451,7 @@ def display_event_stream(console, core_v1_api):
 def display_services(console, core_v1_api):
     """Handles the logic for displaying service information."""
     try:
-        namespace_input = Prompt.ask("Enter namespace ('all' for all, press Enter for 'default')")
+        namespace_input = Prompt.ask(_NAMESPACE_PROMPT)
         namespace = namespace_input.strip() or "default"
         
         console.print(f"\n[bold]Fetching services in namespace: {namespace}...[/bold]")
@@ -296,7 +485,7 @@ def display_resource_yaml(console, core_v1_api, apps_v1_api):
     """Handles the interactive selection and display of a resource's YAML."""
     try:
         console.print("\n---[ Select a Resource Type to View YAML ]---")
-        resource_type = Prompt.ask("Choose resource type", choices=["Pod", "Deployment", "Node", "Service"], default="Pod")
+        resource_type = Prompt.ask("Choose resource type", choices=_RESOURCE_TYPE_CHOICES, default="Pod")
 
         yaml_str, error = None, None
 
@@ -336,7 +525,7 @@ from collections import deque
 def display_configmaps(console, core_v1_api):
     """Displays a list of ConfigMaps and allows viewing their data."""
     try:
-        namespace = Prompt.ask("Enter namespace ('all' for all, press Enter for 'default')")
+        namespace = Prompt.ask(_NAMESPACE_PROMPT)
         namespace = namespace.strip() or "default"
         
         console.print(f"\n[bold]Fetching ConfigMaps in namespace: {namespace}...[/bold]")
@@ -354,19 +543,20 @@ def display_configmaps(console, core_v1_api):
         table.add_column("Name", style="cyan")
         table.add_column("Data Keys", style="blue")
 
+        configmaps_by_name = {}
         for cm in configmaps:
             table.add_row(cm['name'], ", ".join(cm['data'].keys()) if cm['data'] else "")
+            configmaps_by_name.setdefault(cm['name'], cm) # First match wins, as with 'all' names can repeat
         
         console.print(table)
 
         if Confirm.ask("\n[bold]View data from a specific ConfigMap?[/bold]"):
             cm_name = Prompt.ask("Enter ConfigMap name")
-            for cm in configmaps:
-                if cm['name'] == cm_name:
-                    console.print(Panel(yaml.dump(cm['data'], sort_keys=False), title=f"Data for ConfigMap: {cm_name}", border_style="green"))
-                    break
-            else:
+            cm = configmaps_by_name.get(cm_name)
+            if cm is None:
                 console.print(f"[red]ConfigMap '{cm_name}' not found.[/red]")
+            else:
+                console.print(Panel(yaml.dump(cm['data'], Dumper=SafeDumper, sort_keys=False, default_flow_style=False), title=f"Data for ConfigMap: {cm_name}", border_style="green"))
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
@@ -375,7 +565,7 @@ def display_configmaps(console, core_v1_api):
 def display_secrets(console, core_v1_api):
     """Displays a list of Secrets and allows viewing their decoded data."""
     try:
-        namespace = Prompt.ask("Enter namespace ('all' for all, press Enter for 'default')")
+        namespace = Prompt.ask(_NAMESPACE_PROMPT)
         namespace = namespace.strip() or "default"
         
         console.print(f"\n[bold]Fetching Secrets in namespace: {namespace}...[/bold]")
@@ -393,19 +583,20 @@ def display_secrets(console, core_v1_api):
         table.add_column("Name", style="cyan")
         table.add_column("Type", style="blue")
 
+        secrets_by_name = {}
         for s in secrets:
             table.add_row(s['name'], s['type'])
+            secrets_by_name.setdefault(s['name'], s)
         
         console.print(table)
 
         if Confirm.ask("\n[bold yellow]View data from a specific Secret? (WARNING: Data will be decoded and displayed in plain text)[/bold yellow]"):
             secret_name = Prompt.ask("Enter Secret name")
-            for s in secrets:
-                if s['name'] == secret_name:
-                    console.print(Panel(yaml.dump(s['data'], sort_keys=False), title=f"Decoded Data for Secret: {secret_name}", border_style="red"))
-                    break
-            else:
+            s = secrets_by_name.get(secret_name)
+            if s is None:
                 console.print(f"[red]Secret '{secret_name}' not found.[/red]")
+            else:
+                console.print(Panel(yaml.dump(s['data'], Dumper=SafeDumper, sort_keys=False, default_flow_style=False), title=f"Decoded Data for Secret: {secret_name}", border_style="red"))
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
@@ -442,7 +633,7 @@ def display_persistent_volumes(console, core_v1_api):
 def display_persistent_volume_claims(console, core_v1_api):
     """Displays a list of Persistent Volume Claims."""
     try:
-        namespace = Prompt.ask("Enter namespace ('all' for all, press Enter for 'default')")
+        namespace = Prompt.ask(_NAMESPACE_PROMPT)
         namespace = namespace.strip() or "default"
         
         console.print(f"\n[bold]Fetching Persistent Volume Claims in namespace: {namespace}...[/bold]")
@@ -476,7 +667,7 @@ def describe_resource(console, core_v1_api, apps_v1_api):
     """Handles the interactive selection and display of a described resource."""
     try:
         console.print("\n---[ Select a Resource Type to Describe ]---")
-        resource_type = Prompt.ask("Choose resource type", choices=["Pod", "Deployment", "Node", "Service"], default="Pod")
+        resource_type = Prompt.ask("Choose resource type", choices=_RESOURCE_TYPE_CHOICES, default="Pod")
 
         description, error = None, None
 
@@ -520,8 +711,8 @@ def display_host_utilization(console, history):
         disk = util['disk_root']
         
         table.add_row("CPU", f"{util['cpu_percent']:.1f}%", "")
-        table.add_row("Memory", f"{mem.percent:.1f}%", f"{mem.used/1024**3:.2f}GiB / {mem.total/1024**3:.2f}GiB")
-        table.add_row("Disk (/)", f"{disk.percent:.1f}%", f"{disk.used/1024**3:.2f}GiB / {disk.total/1024**3:.2f}GiB")
+        table.add_row("Memory", f"{mem.percent:.1f}%", f"{mem.used * _PER_GIB:.2f}GiB / {mem.total * _PER_GIB:.2f}GiB")
+        table.add_row("Disk (/)", f"{disk.percent:.1f}%", f"{disk.used * _PER_GIB:.2f}GiB / {disk.total * _PER_GIB:.2f}GiB")
 
         console.print(table)
 
@@ -531,11 +722,11 @@ def display_host_utilization(console, history):
         
         plt.subplot(1, 1)
         plt.title("CPU Usage History (%)")
-        plt.plot(list(history['cpu']), color="blue")
+        plt.plot(history['cpu'], color="blue") # plotext takes the deque as is, no list copy
         
         plt.subplot(1, 2)
         plt.title("Memory Usage History (%)")
-        plt.plot(list(history['mem']), color="magenta")
+        plt.plot(history['mem'], color="magenta")
         
         plt.show()
         console.print("[dim]Graphs show the last 60 data points.[/dim]")
@@ -547,15 +738,9 @@ def display_process_explorer(console):
     """Displays a list of running processes, sorted by CPU or memory."""
     try:
         console.print("\n[bold]Fetching process list...[/bold]")
-        sort_choice = Prompt.ask("Sort by", choices=["cpu", "memory"], default="cpu")
+        sort_choice = Prompt.ask("Sort by", choices=_PROCESS_SORT_CHOICES, default="cpu")
         limit = IntPrompt.ask("Limit to top N processes", default=20)
 
-        processes = host_actions.get_process_list(sort_by=f"{sort_choice}_percent", limit=limit)
-
-        if not processes:
-            console.print("[yellow]No processes found or access denied.[/yellow]")
-            return
-
         table = Table(title=f"Top {limit} Processes (Sorted by {sort_choice.upper()})")
         table.add_column("PID", style="cyan", justify="right")
         table.add_column("Name", style="magenta")
@@ -564,16 +749,23 @@ def display_process_explorer(console):
         table.add_column("MEM %", style="yellow", justify="right")
         table.add_column("Command", style="red")
 
-        for p in processes:
-            table.add_row(
-                str(p['pid']),
-                p['name'],
-                p['status'],
-                f"{p['cpu_percent']:.1f}",
-                f"{p['memory_percent']:.1f}",
-                p['cmdline']
-            )
-        console.print(table)
+        # Rows are added as each process's details are read, so the table paints
+        # immediately instead of after the whole top-N has been collected
+        found = False
+        with Live(table, console=console, refresh_per_second=10, vertical_overflow="visible"):
+            for proc in host_actions.iter_processes(sort_by=f"{sort_choice}_percent", limit=limit):
+                found = True
+                table.add_row(
+                    str(proc.pid),
+                    proc.name,
+                    proc.status,
+                    f"{proc.cpu:.1f}",
+                    f"{proc.mem:.1f}",
+                    proc.cmdline
+                )
+
+        if not found:
+            console.print("[yellow]No processes found or access denied.[/yellow]")
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
@@ -629,9 +821,10 @@ def display_host_logs(console):
 
         log_choices = {str(i+1): entry for i, entry in enumerate(log_configs)}
 
-        console.print("---[ Select a Log to View ]---")
-        for i, entry in log_choices.items():
-            console.print(f"{i}. {entry['display_name']}")
+        with console:
+            console.print("---[ Select a Log to View ]---")
+            for i, entry in log_choices.items():
+                console.print(f"{i}. {entry['display_name']}")
         
         choice = Prompt.ask("[bold]Choose a log[/bold]", choices=list(log_choices.keys()))
         selected_entry = log_choices[choice]
@@ -656,11 +849,11 @@ def display_host_logs(console):
             status = f"[bold red]BREACHED[/]" if count >= threshold else "[green]OK[/]"
             summary_table.add_row(name, str(count), str(threshold), status)
         
-        console.print(summary_table)
-
-        # Display Log Content
+        # Display Log Content, written out together with the summary
         panel_title = f"Log: {selected_entry['display_name']}"
-        console.print(Panel(styled_content, title=panel_title, border_style="green"))
+        with console:
+            console.print(summary_table)
+            console.print(Panel(styled_content, title=panel_title, border_style="green"))
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
@@ -689,9 +882,9 @@ def display_network_stats(console):
         table.add_column("Dropped (In/Out)", style="yellow", justify="right")
 
         for s in stats:
-            errors = f"{s['errin']}/{s['errout']}"
-            dropped = f"{s['dropin']}/{s['dropout']}"
-            table.add_row(s['interface'], s['ip_address'], s['bytes_sent'], s['bytes_recv'], errors, dropped)
+            errors = f"{s.errin}/{s.errout}"
+            dropped = f"{s.dropin}/{s.dropout}"
+            table.add_row(s.interface, s.ip, f"{s.bytes_sent * _PER_MIB:.2f} MB", f"{s.bytes_recv * _PER_MIB:.2f} MB", errors, dropped)
         
         console.print(table)
 
@@ -745,60 +938,184 @@ def display_resource_quotas(console, core_v1_api):
             console.print(f"[yellow]No resource quotas found in namespace '{namespace}'.[/yellow]")
             return
 
-        for quota in quotas:
-            table = Table(title=f"Resource Quota: '{quota['name']}' in Namespace: {namespace}")
-            table.add_column("Resource", style="cyan")
-            table.add_column("Hard Limit", style="magenta")
-            table.add_column("Used", style="green")
-            
-            for resource, limit in quota['hard'].items():
-                used = quota['used'].get(resource, "N/A")
-                table.add_row(resource, limit, used)
-            console.print(table)
+        # One table per quota; the console buffers them and writes them out together
+        with console:
+            for quota in quotas:
+                table = Table(title=f"Resource Quota: '{quota['name']}' in Namespace: {namespace}")
+                table.add_column("Resource", style="cyan")
+                table.add_column("Hard Limit", style="magenta")
+                table.add_column("Used", style="green")
+
+                for resource, limit in quota['hard'].items():
+                    used = quota['used'].get(resource, "N/A")
+                    table.add_row(resource, limit, used)
+                console.print(table)
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
         return
 
+# --- Live Filtered Views ---
+# The pod and deployment views fetch on a background thread and publish results
+# through a queue, while the UI loop reads keystrokes without blocking, so the
+# filter re-renders as it is typed instead of waiting on Enter and an API call.
+
+LIVE_VIEW_FETCH_INTERVAL_SECONDS = 5
+LIVE_VIEW_TICK_SECONDS = 0.1 # How often keystrokes and new results are picked up
+_ESCAPE_SEQUENCE_RE = re.compile(r"\x1b(\[[0-9;]*[A-Za-z~]|O.)?") # Arrow keys and the like
+
+@contextlib.contextmanager
+def _key_reader():
+    """Yields a function returning the text typed since its last call, without blocking."""
+    if termios is None:
+        def read_keys():
+            keys = []
+            while msvcrt.kbhit():
+                key = msvcrt.getwch()
+                if key in ("\x00", "\xe0"): # Function/arrow key prefix; drop the key code too
+                    msvcrt.getwch()
+                    continue
+                keys.append(key)
+            return "".join(keys)
+        yield read_keys
+        return
+
+    fd = sys.stdin.fileno()
+    saved_attrs = termios.tcgetattr(fd)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+    def read_keys():
+        chunks = []
+        while select.select([fd], [], [], 0)[0]:
+            data = os.read(fd, 1024)
+            if not data:
+                break
+            chunks.append(decoder.decode(data))
+        return _ESCAPE_SEQUENCE_RE.sub("", "".join(chunks))
+
+    # cbreak delivers keys one at a time but keeps Ctrl+C raising KeyboardInterrupt
+    tty.setcbreak(fd)
+    try:
+        yield read_keys
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved_attrs)
+
+def _filter_by_name(named_items, filter_lc):
+    """Returns the (item, lowercased name) pairs whose name contains filter_lc."""
+    if not filter_lc:
+        return named_items
+    return [pair for pair in named_items if filter_lc in pair[1]]
+
+def _run_live_filtered_view(console, fetch, generate_table, empty_message, name_of):
+    """
+    Shows generate_table(matching_items, filter_text) until Ctrl+C. fetch() -> (items, error)
+    runs on a background thread every LIVE_VIEW_FETCH_INTERVAL_SECONDS, or at once
+    when Enter is pressed; typing edits the filter against the last fetched items.
+    Names (name_of(item)) are lowercased once per fetch, and a filter that was only
+    extended narrows the previous matches instead of rescanning every item. Nothing
+    is redrawn when the filter and the matching items are unchanged (e.g. a refetch
+    that found no changes), so an idle view writes nothing to the terminal.
+    """
+    results = queue.Queue()
+    refresh_now = threading.Event()
+    stopped = threading.Event()
+
+    def fetch_loop():
+        while not stopped.is_set():
+            try:
+                results.put(fetch())
+            except Exception as e:
+                results.put(([], str(e)))
+            refresh_now.wait(LIVE_VIEW_FETCH_INTERVAL_SECONDS)
+            refresh_now.clear()
+
+    threading.Thread(target=fetch_loop, name="live-view-fetch", daemon=True).start()
+    items, filter_text = None, ""
+    named_items = matches = []
+    matches_filter = ""
+    shown = None # (filter_text, visible items) last drawn
+    try:
+        with _key_reader() as read_keys, Live(console=console, screen=True, auto_refresh=False) as live:
+            while True:
+                changed = False
+                # Only the newest result matters if several arrived since the last tick
+                while not results.empty():
+                    items, error = results.get_nowait()
+                    changed = True
+                    if error:
+                        live.console.print(f"[yellow]Note: {error}[/yellow]")
+                if changed and not items:
+                    live.console.print(empty_message)
+                    break
+                if changed:
+                    named_items = [(item, name_of(item).lower()) for item in items]
+                    matches_filter = None
+
+                for key in read_keys():
+                    if key in ("\r", "\n"):
+                        refresh_now.set()
+                    elif key in ("\x7f", "\b"):
+                        filter_text = filter_text[:-1]
+                        changed = True
+                    elif key.isprintable():
+                        filter_text += key
+                        changed = True
+
+                if changed and items is not None:
+                    filter_lc = filter_text.lower()
+                    if matches_filter is not None and filter_lc.startswith(matches_filter):
+                        matches = _filter_by_name(matches, filter_lc)
+                    else:
+                        matches = _filter_by_name(named_items, filter_lc)
+                    matches_filter = filter_lc
+                    visible = [item for item, _ in matches]
+                    if shown != (filter_text, visible):
+                        live.update(generate_table(visible, filter_text), refresh=True)
+                        shown = (filter_text, visible)
+                time.sleep(LIVE_VIEW_TICK_SECONDS)
+    finally:
+        stopped.set()
+        refresh_now.set()
+
+def _table_renderer(columns, title):
+    """
+    Returns a generate_table for _run_live_filtered_view that builds a table of
+    `columns` from the (already formatted) row tuples it is given, titled
+    title.format(filter_str). It is only called when the rows or filter change.
+    """
+    def generate_table(rows, filter_str):
+        return _build_table(columns, rows, title=title.format(filter_str))
+    return generate_table
+
 def display_pod_status(console, core_v1_api, custom_objects_api):
     """Handles the logic for displaying pod status and metrics with live filtering."""
     try:
-        namespace_input = Prompt.ask("Enter namespace ('all' for all, press Enter for 'default')")
+        namespace_input = Prompt.ask(_NAMESPACE_PROMPT)
         namespace = namespace_input.strip() or "default"
         
         console.print(f"\n[bold]Fetching pod status and metrics for namespace: {namespace}...[/bold]")
         console.print("[dim]Type to filter by name, press Enter to refresh, Ctrl+C to exit.[/dim]")
 
-        filter_text = ""
-
-        def generate_table(pods, filter_str):
-            table = Table(title=f"Pod Status & Usage in Namespace: {namespace} (Filter: '{filter_str}')")
-            table.add_column("Name", style="cyan")
-            table.add_column("Status", style="magenta")
-            table.add_column("IP Address", style="green")
-            table.add_column("Namespace", style="blue")
-            table.add_column("CPU", style="yellow")
-            table.add_column("Memory", style="red")
-
-            for pod in pods:
-                if filter_str.lower() in pod['name'].lower():
-                    table.add_row(pod['name'], pod['status'], pod['ip'], pod['namespace'], pod['cpu'], pod['memory'])
-            return table
-
-        with Live(console=console, screen=True, auto_refresh=False) as live:
-            while True:
-                pods, error = k8s_actions.get_pod_status(core_v1_api, custom_objects_api, namespace)
-                
-                if error:
-                    live.console.print(f"[yellow]Note: {error}[/yellow]")
-                if not pods:
-                    live.console.print(f"[yellow]No pods found in namespace '{namespace}' or access denied.[/yellow]")
-                    break
-
-                live.update(generate_table(pods, filter_text), refresh=True)
-
-                # Non-blocking key press check would be ideal, but rich doesn't support it directly.
-                # We'll use a prompt that the user can interact with.
-                filter_text = Prompt.ask(f"[bold]Filter by name (current: '{filter_text}')[/bold]", default=filter_text)
+        columns = (
+            ("Name", dict(style="cyan")),
+            ("Status", dict(style="magenta")),
+            ("IP Address", dict(style="green")),
+            ("Namespace", dict(style="blue")),
+            ("CPU", dict(style="yellow")),
+            ("Memory", dict(style="red")),
+        )
+
+        def fetch_rows():
+            # Rows are built once per fetch, on the fetch thread, not on every filter keystroke
+            pods, error = k8s_actions.get_pod_status(core_v1_api, custom_objects_api, namespace)
+            return [(pod.name, pod.status, pod.ip, pod.namespace, pod.cpu, pod.memory) for pod in pods], error
+
+        _run_live_filtered_view(
+            console,
+            fetch_rows,
+            _table_renderer(columns, f"Pod Status & Usage in Namespace: {namespace} (Filter: '{{}}')"),
+            f"[yellow]No pods found in namespace '{namespace}' or access denied.[/yellow]",
+            operator.itemgetter(0),
+        )
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
@@ -809,48 +1126,43 @@ def display_pod_status(console, core_v1_api, custom_objects_api):
 def display_deployment_status(console, core_v1_api, apps_v1_api, custom_objects_api):
     """Handles the logic for displaying deployment status and metrics with live filtering."""
     try:
-        namespace_input = Prompt.ask("Enter namespace ('all' for all, press Enter for 'default')")
+        namespace_input = Prompt.ask(_NAMESPACE_PROMPT)
         namespace = namespace_input.strip() or "default"
 
         console.print(f"\n[bold]Fetching deployment status and metrics for namespace: {namespace}...[/bold]")
         console.print("[dim]Type to filter by name, press Enter to refresh, Ctrl+C to exit.[/dim]")
-        
-        filter_text = ""
-
-        def generate_table(deployments, filter_str):
-            table = Table(title=f"Deployment Status & Usage in Namespace: {namespace} (Filter: '{filter_str}')")
-            table.add_column("Name", style="cyan")
-            table.add_column("Namespace", style="blue")
-            table.add_column("Replicas (Ready/Desired)", style="green")
-            table.add_column("Pod Count", style="yellow")
-            table.add_column("Total CPU (cores)", style="magenta")
-            table.add_column("Total Memory (MiB)", style="red")
-
-            for dep in deployments:
-                if filter_str.lower() in dep['name'].lower():
-                    table.add_row(
-                        dep['name'],
-                        dep['namespace'],
-                        f"{dep['ready_replicas']}/{dep['replicas']}",
-                        str(dep['pod_count']),
-                        f"{dep['cpu'] / 1000:.3f}",
-                        f"{dep['memory'] / 1024:.2f}"
-                    )
-            return table
-
-        with Live(console=console, screen=True, auto_refresh=False) as live:
-            while True:
-                deployments, error = k8s_actions.get_deployment_status(core_v1_api, apps_v1_api, custom_objects_api, namespace)
-                
-                if error:
-                    live.console.print(f"[yellow]Note: {error}[/yellow]")
-                if not deployments:
-                    live.console.print(f"[yellow]No deployments found in namespace '{namespace}' or access denied.[/yellow]")
-                    break
 
-                live.update(generate_table(deployments, filter_text), refresh=True)
-                
-                filter_text = Prompt.ask(f"[bold]Filter by name (current: '{filter_text}')[/bold]", default=filter_text)
+        columns = (
+            ("Name", dict(style="cyan")),
+            ("Namespace", dict(style="blue")),
+            ("Replicas (Ready/Desired)", dict(style="green")),
+            ("Pod Count", dict(style="yellow")),
+            ("Total CPU (cores)", dict(style="magenta")),
+            ("Total Memory (MiB)", dict(style="red")),
+        )
+
+        def fetch_rows():
+            # Cells are formatted once per fetch, on the fetch thread, not on every filter keystroke
+            deployments, error = k8s_actions.get_deployment_status(core_v1_api, apps_v1_api, custom_objects_api, namespace)
+            return [
+                (
+                    dep['name'],
+                    dep['namespace'],
+                    f"{dep['ready_replicas']}/{dep['replicas']}",
+                    str(dep['pod_count']),
+                    f"{dep['cpu'] / 1000:.3f}",
+                    f"{dep['memory'] * _PER_KIB:.2f}",
+                )
+                for dep in deployments
+            ], error
+
+        _run_live_filtered_view(
+            console,
+            fetch_rows,
+            _table_renderer(columns, f"Deployment Status & Usage in Namespace: {namespace} (Filter: '{{}}')"),
+            f"[yellow]No deployments found in namespace '{namespace}' or access denied.[/yellow]",
+            operator.itemgetter(0),
+        )
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
@@ -888,20 +1200,19 @@ def edit_deployment(console, apps_v1_api):
             console.print("[red]Deployment name cannot be empty.[/red]")
             return
 
-        # Fetch the deployment
-        try:
-            deployment = apps_v1_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
-        except Exception as e:
-            console.print(f"[bold red]Error fetching deployment: {e}[/bold red]")
+        # Fetch the deployment's containers
+        containers, error = k8s_actions.get_deployment_containers(apps_v1_api, namespace, deployment_name)
+        if error:
+            console.print(f"[bold red]{error}[/bold red]")
             return
 
         console.print("\n---[ What do you want to edit? ]---")
-        edit_choice = Prompt.ask("Choose an option", choices=["Container Image", "Resource Limits/Requests"], default="Container Image")
+        edit_choice = Prompt.ask("Choose an option", choices=_DEPLOYMENT_EDIT_CHOICES, default="Container Image")
 
         if edit_choice == "Container Image":
-            edit_deployment_image(console, apps_v1_api, deployment)
+            edit_deployment_image(console, apps_v1_api, namespace, deployment_name, containers)
         elif edit_choice == "Resource Limits/Requests":
-            edit_deployment_resources(console, apps_v1_api, deployment)
+            edit_deployment_resources(console, apps_v1_api, namespace, deployment_name, containers)
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled. Returning to main menu.[/yellow]")
@@ -909,17 +1220,19 @@ def edit_deployment(console, apps_v1_api):
     except Exception as e:
         console.print(f"\n[bold red]An unexpected error occurred: {e}[/bold red]")
 
-def edit_deployment_image(console, apps_v1_api, deployment):
-    """Handles editing a deployment's container image."""
-    namespace = deployment.metadata.namespace
-    deployment_name = deployment.metadata.name
+def _ask_container(containers):
+    """Asks for a container by its 1-based number in containers and returns it."""
+    choices = [str(i) for i in range(1, len(containers) + 1)]
+    return containers[IntPrompt.ask(_CONTAINER_INDEX_PROMPT, choices=choices, default="1") - 1]
 
-    console.print(f"\n[bold]Current containers in '{deployment_name}':[/bold]")
-    for i, container in enumerate(deployment.spec.template.spec.containers):
-        console.print(f"  {i+1}. {container.name} (Image: {container.image})")
+def edit_deployment_image(console, apps_v1_api, namespace, deployment_name, containers):
+    """Handles editing a deployment's container image."""
+    with console:
+        console.print(f"\n[bold]Current containers in '{deployment_name}':[/bold]")
+        for i, container in enumerate(containers):
+            console.print(f"  {i+1}. {container.name} (Image: {container.image})")
 
-    container_index = IntPrompt.ask("Choose a container number to edit", choices=[str(i+1) for i, _ in enumerate(deployment.spec.template.spec.containers)], default="1")
-    container_name = deployment.spec.template.spec.containers[container_index-1].name
+    container_name = _ask_container(containers).name
     
     new_image = Prompt.ask(f"Enter the new image for container '{container_name}'")
 
@@ -932,31 +1245,28 @@ def edit_deployment_image(console, apps_v1_api, deployment):
     else:
         console.print("[yellow]Edit cancelled.[/yellow]")
 
-def edit_deployment_resources(console, apps_v1_api, deployment):
+def edit_deployment_resources(console, apps_v1_api, namespace, deployment_name, containers):
     """Handles editing a deployment's resource limits and requests."""
-    namespace = deployment.metadata.namespace
-    deployment_name = deployment.metadata.name
-
-    console.print(f"\n[bold]Current containers in '{deployment_name}':[/bold]")
-    for i, container in enumerate(deployment.spec.template.spec.containers):
-        console.print(f"  {i+1}. {container.name}")
+    with console:
+        console.print(f"\n[bold]Current containers in '{deployment_name}':[/bold]")
+        for i, container in enumerate(containers):
+            console.print(f"  {i+1}. {container.name}")
 
-    container_index = IntPrompt.ask("Choose a container number to edit", choices=[str(i+1) for i, _ in enumerate(deployment.spec.template.spec.containers)], default="1")
-    container = deployment.spec.template.spec.containers[container_index-1]
+    container = _ask_container(containers)
     
     console.print(f"\n[bold]Current resources for '{container.name}':[/bold]")
-    console.print(f"  Requests: CPU={container.resources.requests.get('cpu', 'N/A')}, Memory={container.resources.requests.get('memory', 'N/A')}")
-    console.print(f"  Limits:   CPU={container.resources.limits.get('cpu', 'N/A')}, Memory={container.resources.limits.get('memory', 'N/A')}")
+    console.print(f"  Requests: CPU={container.requests.get('cpu', 'N/A')}, Memory={container.requests.get('memory', 'N/A')}")
+    console.print(f"  Limits:   CPU={container.limits.get('cpu', 'N/A')}, Memory={container.limits.get('memory', 'N/A')}")
 
     console.print("\nEnter new resource values (leave blank to keep current). Examples: CPU='500m', Memory='256Mi'")
     new_resources = {
         "requests": {
-            "cpu": Prompt.ask("New CPU Request", default=container.resources.requests.get('cpu')),
-            "memory": Prompt.ask("New Memory Request", default=container.resources.requests.get('memory'))
+            "cpu": Prompt.ask("New CPU Request", default=container.requests.get('cpu')),
+            "memory": Prompt.ask("New Memory Request", default=container.requests.get('memory'))
         },
         "limits": {
-            "cpu": Prompt.ask("New CPU Limit", default=container.resources.limits.get('cpu')),
-            "memory": Prompt.ask("New Memory Limit", default=container.resources.limits.get('memory'))
+            "cpu": Prompt.ask("New CPU Limit", default=container.limits.get('cpu')),
+            "memory": Prompt.ask("New Memory Limit", default=container.limits.get('memory'))
         }
     }
 
@@ -995,6 +1305,9 @@ def scale_deployment_replicas(console, apps_v1_api):
 def interactive_mode():
     """Runs the application in interactive menu mode."""
     console = Console()
+    if not console.is_terminal:
+        # Piped output carries no styling, so skip running the highlighter over every printed cell
+        console = Console(highlight=False)
     core_v1_api, apps_v1_api, custom_objects_api = k8s_actions.init_clients()
 
     # Data store for historical graphs
@@ -1007,58 +1320,42 @@ def interactive_mode():
         console.print("[bold red]Failed to initialize Kubernetes clients. Exiting.[/bold red]")
         sys.exit(1)
 
+    # Menu option -> view, bound to this session's console and clients once
+    actions = {
+        '1': functools.partial(display_dashboard, console, core_v1_api, apps_v1_api, custom_objects_api),
+        '2': functools.partial(display_node_info, console, core_v1_api),
+        '3': functools.partial(display_namespaces, console, core_v1_api),
+        '4': functools.partial(display_services, console, core_v1_api),
+        '5': functools.partial(display_event_stream, console, core_v1_api),
+        '6': functools.partial(display_resource_quotas, console, core_v1_api),
+        '7': functools.partial(display_pod_status, console, core_v1_api, custom_objects_api),
+        '8': functools.partial(display_deployment_status, console, core_v1_api, apps_v1_api, custom_objects_api),
+        '9': functools.partial(display_pod_logs, console, core_v1_api),
+        '10': functools.partial(open_pod_shell, console, core_v1_api),
+        '11': functools.partial(scale_deployment_replicas, console, apps_v1_api),
+        '12': functools.partial(edit_deployment, console, apps_v1_api),
+        '13': functools.partial(display_persistent_volumes, console, core_v1_api),
+        '14': functools.partial(display_persistent_volume_claims, console, core_v1_api),
+        '15': functools.partial(display_configmaps, console, core_v1_api),
+        '16': functools.partial(display_secrets, console, core_v1_api),
+        '17': functools.partial(display_resource_yaml, console, core_v1_api, apps_v1_api),
+        '18': functools.partial(describe_resource, console, core_v1_api, apps_v1_api),
+        '19': functools.partial(display_host_utilization, console, host_history),
+        '20': functools.partial(display_process_explorer, console),
+        '21': functools.partial(display_docker_containers, console),
+        '22': functools.partial(display_host_logs, console),
+        '23': functools.partial(display_network_stats, console),
+    }
+
     while True:
         try:
             choice = show_menu(console)
-            if choice == '1':
-                display_dashboard(console, core_v1_api, apps_v1_api, custom_objects_api)
-            elif choice == '2':
-                display_node_info(console, core_v1_api)
-            elif choice == '3':
-                display_namespaces(console, core_v1_api)
-            elif choice == '4':
-                display_services(console, core_v1_api)
-            elif choice == '5':
-                display_event_stream(console, core_v1_api)
-            elif choice == '6':
-                display_resource_quotas(console, core_v1_api)
-            elif choice == '7':
-                display_pod_status(console, core_v1_api, custom_objects_api)
-            elif choice == '8':
-                display_deployment_status(console, core_v1_api, apps_v1_api, custom_objects_api)
-            elif choice == '9':
-                display_pod_logs(console, core_v1_api)
-            elif choice == '10':
-                open_pod_shell(console, core_v1_api)
-            elif choice == '11':
-                scale_deployment_replicas(console, apps_v1_api)
-            elif choice == '12':
-                edit_deployment(console, apps_v1_api)
-            elif choice == '13':
-                display_persistent_volumes(console, core_v1_api)
-            elif choice == '14':
-                display_persistent_volume_claims(console, core_v1_api)
-            elif choice == '15':
-                display_configmaps(console, core_v1_api)
-            elif choice == '16':
-                display_secrets(console, core_v1_api)
-            elif choice == '17':
-                display_resource_yaml(console, core_v1_api, apps_v1_api)
-            elif choice == '18':
-                describe_resource(console, core_v1_api, apps_v1_api)
-            elif choice == '19':
-                display_host_utilization(console, host_history)
-            elif choice == '20':
-                display_process_explorer(console)
-            elif choice == '21':
-                display_docker_containers(console)
-            elif choice == '22':
-                display_host_logs(console)
-            elif choice == '23':
-                display_network_stats(console)
-            elif choice == '24':
+            if choice == _EXIT_CHOICE:
                 console.print("[bold]Exiting. Goodbye![/bold]")
                 break
+            action = actions.get(choice)
+            if action:
+                action()
             else:
                 console.print("[bold red]Invalid option. Please try again.[/bold red]")
         except KeyboardInterrupt:
@@ -1,31 +1,42 @@
 import time
-import yaml
-from pathlib import Path
-from . import k8s_actions, host_actions, alerter, k8s_watcher
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from . import k8s_actions, k8s_informers, host_actions, alerter, k8s_watcher
 
 # In-memory state to track sent alerts and avoid spam
-# Format: {'alert_key': timestamp_of_last_alert}
+# Format: {'alert_key': timestamp_of_last_alert}, oldest alert first
 # Example key: 'log/syslog/Errors'
-ALERT_STATE = {}
+ALERT_STATE = OrderedDict()
 # Cooldown in seconds before re-alerting for the same issue if it resolves and reappears
 ALERT_COOLDOWN = 3600  # 1 hour
 
+# Log sources are read concurrently, and the host log checks run alongside the
+# Kubernetes checks, so a cycle waits for the slowest source rather than their sum.
+LOG_SCAN_PARALLELISM = 8
+_LOG_SCAN_POOL = ThreadPoolExecutor(max_workers=LOG_SCAN_PARALLELISM, thread_name_prefix="log-scan")
+_HOST_CHECK_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="host-checks")
+
 def _load_watcher_config():
-    """Loads watcher-specific configurations from config.yml."""
-    config_file = Path("config.yml")
-    if not config_file.is_file():
-        return None, "Configuration file not found."
-    
-    with open(config_file, 'r') as f:
-        try:
-            config = yaml.safe_load(f)
-            interval = config.get('watcher_interval_seconds', 60)
-            return interval, None
-        except yaml.YAMLError as e:
-            return None, f"Error parsing YAML file: {e}"
+    """
+    Loads the watcher interval from config.yml. The parsed file is shared with
+    k8s_watcher, which only re-parses it when its mtime changes.
+    """
+    config, error = k8s_watcher._load_watcher_config()
+    if error:
+        return None, error
+    return (config or {}).get('watcher_interval_seconds', 60), None
+
+def _prune_alert_state(now):
+    """Drops keys whose cooldown has expired; only the expired (oldest) entries are visited."""
+    while ALERT_STATE:
+        key, last_alert_time = next(iter(ALERT_STATE.items()))
+        if now - last_alert_time < ALERT_COOLDOWN:
+            break
+        ALERT_STATE.popitem(last=False)
 
 def _can_send_alert(key):
     """Checks if an alert for a given key is allowed based on state and cooldown."""
+    _prune_alert_state(time.time())
     last_alert_time = ALERT_STATE.get(key)
     if last_alert_time:
         if time.time() - last_alert_time < ALERT_COOLDOWN: 
@@ -35,17 +46,18 @@ def _can_send_alert(key):
 def _update_alert_state(key):
     """Updates the state for a given alert key with the current timestamp."""
     ALERT_STATE[key] = time.time()
+    ALERT_STATE.move_to_end(key)
 
 def check_log_thresholds(config):
-    """Checks all configured logs and appends alerts to the buffer if thresholds are breached."""
+    """Checks all configured logs and yields an Alert for each breached threshold."""
     print("Watcher: Checking host log thresholds...")
     log_configs, error = host_actions.load_log_config()
     if error:
         print(f"Watcher Error: Could not load log config: {error}")
         return
 
-    for log_entry in log_configs:
-        _, summary, err = host_actions.get_log_output(log_entry)
+    summaries = _LOG_SCAN_POOL.map(host_actions.get_log_summary, log_configs)
+    for log_entry, (summary, err) in zip(log_configs, summaries):
         if err:
             print(f"Watcher Error: Could not process log '{log_entry['display_name']}': {err}")
             continue
@@ -62,7 +74,7 @@ def check_log_thresholds(config):
                         f"Count: {data['count']}\n"
                         f"Threshold: {data['threshold']}\n"
                     )
-                    k8s_watcher.ALERT_BUFFER.append({"type": "host_log", "severity": "ALERT", "subject": subject, "body": body})
+                    yield alerter.Alert("Host Log Threshold", subject, body, "ALERT")
                     _update_alert_state(alert_key)
 
 def start_watcher():
@@ -88,17 +100,31 @@ def start_watcher():
         print(f"Fatal Error: Could not load main watcher config: {config_error}. Exiting watcher.")
         return
 
+    next_cycle = time.monotonic()
     while True:
         try:
-            # Run Kubernetes checks
-            # All clients are passed here
-            k8s_watcher.run_k8s_checks(core_v1_api, apps_v1_api, custom_objects_api)
+            if time.monotonic() >= next_cycle:
+                # Host-level checks scan their logs in the background meanwhile; their
+                # alerts are sent afterwards so notifications stay on this thread
+                host_alerts = _HOST_CHECK_POOL.submit(k8s_watcher._collect_alerts, check_log_thresholds, main_config)
+                try:
+                    # Run Kubernetes checks
+                    # All clients are passed here
+                    k8s_watcher.run_k8s_checks(core_v1_api, apps_v1_api, custom_objects_api)
+                finally:
+                    alerter.process_and_send_notifications(
+                        host_alerts.result(),
+                        alert_action=main_config.get('default_alert_action', 'email'),
+                    )
+
+                next_cycle = time.monotonic() + interval
+                print(f"Watcher: Cycle complete. Next full cycle in {interval} seconds...")
 
-            # Run host-level checks
-            check_log_thresholds(main_config)
-            
-            print(f"Watcher: Cycle complete. Sleeping for {interval} seconds...")
-            time.sleep(interval)
+            # Between full cycles, the pods and deployments the informers' watches
+            # report as changed have their status and health re-checked right away
+            changed_keys = k8s_informers.wait_for_change(max(0, next_cycle - time.monotonic()))
+            if changed_keys:
+                k8s_watcher.run_event_checks(core_v1_api, apps_v1_api, changed_keys)
         except KeyboardInterrupt:
             print("\nWatcher stopped by user. Exiting.")
             break